@@ -3,123 +3,258 @@ from japaneseverbconjugator.src.constants.EnumeratedTypes import (
     Polarity,
 )
 
+from memo import LRUCache, memoize
+
+# Shared by every function below. Check adjective_form_cache.stats()
+# for hits/misses, or .clear() it.
+adjective_form_cache = LRUCache(maxsize=4096)
+
+# --------------------------------------------------------------------
+# Suffix tables
+#
+# Every form here is "chop some characters off the end of the
+# dictionary form, then stick a suffix on". So instead of branching on
+# tense and polarity, each table maps
+#
+#   (class, tense, polarity) -> (characters to chop, suffix)
+#
+# where class is one of "noun", "na-adj", "i-adj" or "irr-adj" (いい
+# and friends). The te forms don't care about tense or polarity so
+# that table is just keyed on the class.
+PAST, NONPAST = Tense.PAST, Tense.NONPAST
+POS, NEG = Polarity.POSITIVE, Polarity.NEGATIVE
+
+adjective_classes = ("noun", "na-adj", "i-adj", "irr-adj")
+
+short_forms = {
+    ("noun", PAST, NEG): (0, "じゃなかった"),
+    ("noun", PAST, POS): (0, "だった"),
+    ("noun", NONPAST, NEG): (0, "じゃない"),
+    ("noun", NONPAST, POS): (0, "だ"),
+    # Get rid of the いい and use よ- instead
+    ("irr-adj", PAST, NEG): (2, "よくなかった"),
+    ("irr-adj", PAST, POS): (2, "よかった"),
+    ("irr-adj", NONPAST, NEG): (2, "よくない"),
+    ("irr-adj", NONPAST, POS): (2, "いい"),
+    ("i-adj", PAST, NEG): (1, "くなかった"),
+    ("i-adj", PAST, POS): (1, "かった"),
+    ("i-adj", NONPAST, NEG): (1, "くない"),
+    ("i-adj", NONPAST, POS): (0, ""),
+}
+# Na conjugates the same way as noun
+for (tense, polarity) in [(PAST, NEG), (PAST, POS), (NONPAST, NEG), (NONPAST, POS)]:
+    short_forms[("na-adj", tense, polarity)] = short_forms[("noun", tense, polarity)]
+
+long_forms = {
+    ("noun", PAST, NEG): (0, "じゃありませんでした"),
+    ("noun", PAST, POS): (0, "でした"),
+    ("noun", NONPAST, NEG): (0, "じゃありませんです"),
+    ("noun", NONPAST, POS): (0, "です"),
+    ("i-adj", PAST, NEG): (1, "くありませんでした"),
+    ("i-adj", PAST, POS): (1, "かったです"),
+    ("i-adj", NONPAST, NEG): (1, "くありません"),
+    ("i-adj", NONPAST, POS): (0, "です"),
+}
+for (tense, polarity) in [(PAST, NEG), (PAST, POS), (NONPAST, NEG), (NONPAST, POS)]:
+    # irregular adjectives are just the short form + です
+    (chop, suffix) = short_forms[("irr-adj", tense, polarity)]
+    long_forms[("irr-adj", tense, polarity)] = (chop, suffix + "です")
+    # and na adjectives are the same as nouns
+    long_forms[("na-adj", tense, polarity)] = long_forms[("noun", tense, polarity)]
+
+# The colloquial negatives are the short form + です. Nouns and
+# irregular adjectives don't have a separate colloquial version.
+colloquial_long_forms = dict(long_forms)
+for adj_class in ["i-adj", "na-adj"]:
+    for tense in [PAST, NONPAST]:
+        (chop, suffix) = short_forms[(adj_class, tense, NEG)]
+        colloquial_long_forms[(adj_class, tense, NEG)] = (chop, suffix + "です")
+
+te_forms = {
+    "noun": (0, "で"),
+    "na-adj": (0, "で"),
+    "irr-adj": (2, "よくて"),
+    "i-adj": (1, "くて"),
+}
+
+
+def _apply(rule, dict_form):
+    (chop, suffix) = rule
+    return (dict_form[:-chop] if chop else dict_form) + suffix
+
+
 # --------------------------------------------------------------------
 # Short forms
+@memoize(adjective_form_cache)
 def noun_short_form(dict_form, tense, polarity):
-    if tense == Tense.PAST:
-        if polarity == Polarity.NEGATIVE:
-            return dict_form + "じゃなかった"
-        else:
-            return dict_form + "だった"
-    else:
-        if polarity == Polarity.NEGATIVE:
-            return dict_form + "じゃない"
-        else:
-            return dict_form + "だ"
+    return _apply(short_forms[("noun", tense, polarity)], dict_form)
 
 
 # irregular adjective
+@memoize(adjective_form_cache)
 def irr_adj_short_form(dict_form, tense, polarity):
-    # Get the part that comes before the いい
-    stem = dict_form[:-2]
-    if tense == Tense.PAST:
-        if polarity == Polarity.NEGATIVE:
-            return stem + "よくなかった"
-        else:
-            return stem + "よかった"
-    else:
-        if polarity == Polarity.NEGATIVE:
-            return stem + "よくない"
-        else:
-            return stem + "いい"
+    return _apply(short_forms[("irr-adj", tense, polarity)], dict_form)
 
 
+@memoize(adjective_form_cache)
 def i_adj_short_form(dict_form, tense, polarity):
-    if tense == Tense.PAST:
-        if polarity == Polarity.NEGATIVE:
-            return dict_form[:-1] + "くなかった"
-        else:
-            return dict_form[:-1] + "かった"
-    else:
-        if polarity == Polarity.NEGATIVE:
-            return dict_form[:-1] + "くない"
-        else:
-            return dict_form
+    return _apply(short_forms[("i-adj", tense, polarity)], dict_form)
 
 
 # Na conjugates the same way as noun
+@memoize(adjective_form_cache)
 def na_adj_short_form(dict_form, tense, polarity):
-    return noun_short_form(dict_form, tense, polarity)
+    return _apply(short_forms[("na-adj", tense, polarity)], dict_form)
 
 
 # --------------------------------------------------------------------
 # Long forms
+@memoize(adjective_form_cache)
 def noun_long_form(dict_form, tense, polarity):
-    if tense == Tense.PAST:
-        if polarity == Polarity.NEGATIVE:
-            return dict_form + "じゃありませんでした"
-        else:
-            return dict_form + "でした"
-    else:
-        if polarity == Polarity.NEGATIVE:
-            return dict_form + "じゃありませんです"
-        else:
-            return dict_form + "です"
+    return _apply(long_forms[("noun", tense, polarity)], dict_form)
 
 
 # irregular adjective
+@memoize(adjective_form_cache)
 def irr_adj_long_form(dict_form, tense, polarity):
-    return irr_adj_short_form(dict_form, tense, polarity) + "です"
+    return _apply(long_forms[("irr-adj", tense, polarity)], dict_form)
 
 
+@memoize(adjective_form_cache)
 def i_adj_long_form(dict_form, tense, polarity, colloquial=False):
-    if polarity == Polarity.POSITIVE:
-        if tense == Tense.PAST:
-            return dict_form[:-1] + "かったです"
-        else:
-            return dict_form + "です"
-    else:
-        if colloquial:
-            return i_adj_short_form(dict_form, tense, polarity) + "です"
-        else:
-            if tense == Tense.PAST:
-                return dict_form[:-1] + "くありませんでした"
-            else:
-                return dict_form[:-1] + "くありません"
+    table = colloquial_long_forms if colloquial else long_forms
+    return _apply(table[("i-adj", tense, polarity)], dict_form)
 
 
 # Na conjugates the same way as noun
 # TODO: make colloquial vs conservative consistent with politeness
 # levels defined in the verb conjugation module
+@memoize(adjective_form_cache)
 def na_adj_long_form(dict_form, tense, polarity, colloquial=False):
-    if polarity == Polarity.POSITIVE:
-        if tense == Tense.PAST:
-            return dict_form + "でした"
-        else:
-            return dict_form + "です"
-    else:
-        if colloquial:
-            return na_adj_short_form(dict_form, tense, polarity) + "です"
-        else:
-            return noun_long_form(dict_form, tense, polarity)
+    table = colloquial_long_forms if colloquial else long_forms
+    return _apply(table[("na-adj", tense, polarity)], dict_form)
 
 
 # --------------------------------------------------------------------
 # Te form
+@memoize(adjective_form_cache)
 def noun_te_form(dict_form):
-    return dict_form + "で"
+    return _apply(te_forms["noun"], dict_form)
 
 
+@memoize(adjective_form_cache)
 def irr_adj_te_form(dict_form):
-    return dict_form[:-2] + "よくて"
+    return _apply(te_forms["irr-adj"], dict_form)
 
 
+@memoize(adjective_form_cache)
 def i_adj_te_form(dict_form):
-    return dict_form[:-1] + "くて"
+    return _apply(te_forms["i-adj"], dict_form)
 
 
+@memoize(adjective_form_cache)
 def na_adj_te_form(dict_form):
-    return noun_te_form(dict_form)
+    return _apply(te_forms["na-adj"], dict_form)
+
+
+# --------------------------------------------------------------------
+# Whole columns at once
+
+# いい conjugates off of よい, and so does anything built on it (かっこ
+# いい, あたまがいい, からだにいい, ...). Plenty of regular adjectives
+# also end in いい though (かわいい), so only count it when the いい is
+# on its own or comes after a particle or かっこ.
+irregular_ii_endings = ("がいい", "にいい", "はいい", "のいい", "っこいい")
+
+
+def adjective_class(dict_form, pos):
+    """
+    Which suffix table row a word uses, given its part of speech (the
+    cleaned up labels from vocab.parts_of_speech). None if it's not a
+    noun or an adjective.
+
+    Example:
+        >>> adjective_class("かっこいい", "i-adj")
+        'irr-adj'
+    """
+    pos = pos.strip() if isinstance(pos, str) else pos
+    if pos in ("noun", "na-adj"):
+        return pos
+    if pos == "i-adj":
+        if dict_form == "いい" or dict_form.endswith(irregular_ii_endings):
+            return "irr-adj"
+        return "i-adj"
+    return None
+
+
+def form_columns():
+    """
+    Column names conjugate_all() produces, in order.
+    """
+    columns = []
+    for kind in ["short", "long", "colloquial"]:
+        for tense in [NONPAST, PAST]:
+            for polarity in [POS, NEG]:
+                columns += [f"{kind}_{tense.name.lower()}_{polarity.name.lower()}"]
+    return columns + ["te"]
+
+
+def conjugate_all(dict_forms, pos):
+    """
+    Conjugate a whole column of dictionary forms at once.
+
+    dict_forms: dictionary forms, e.g. df["word"]
+    pos: their parts of speech, e.g. df["pos"]
+
+    Returns a dataframe (same index as `dict_forms` if it's a Series)
+    with the dictionary form, the detected class and one column per
+    form: short/long/colloquial × nonpast/past × positive/negative,
+    plus te. Rows that aren't nouns or adjectives get None.
+
+    Example:
+        >>> import pandas as pd
+        >>> adjs = pd.Series(["たかい", "しずか", "かっこいい"])
+        >>> forms = conjugate_all(adjs, ["i-adj", "na-adj", "i-adj"])
+        >>> list(forms["long_past_negative"])
+        ['たかくありませんでした', 'しずかじゃありませんでした', 'かっこよくなかったです']
+    """
+    import numpy as np
+    import pandas as pd
+
+    index = getattr(dict_forms, "index", None)
+    words = np.array(list(dict_forms), dtype=object)
+    classes = np.array(
+        [adjective_class(word, p) for (word, p) in zip(words, pos)], dtype=object
+    )
+
+    # Every rule chops 0, 1 or 2 characters, so cut each stem once
+    stems = {
+        0: words,
+        1: np.array([word[:-1] for word in words], dtype=object),
+        2: np.array([word[:-2] for word in words], dtype=object),
+    }
+    masks = {adj_class: classes == adj_class for adj_class in adjective_classes}
+
+    def build(rule_for_class):
+        out = np.full(len(words), None, dtype=object)
+        for adj_class in adjective_classes:
+            mask = masks[adj_class]
+            if mask.any():
+                (chop, suffix) = rule_for_class(adj_class)
+                out[mask] = stems[chop][mask] + suffix
+        return out
+
+    tables = {"short": short_forms, "long": long_forms, "colloquial": colloquial_long_forms}
+    columns = {"dict_form": words, "class": classes}
+    for kind in ["short", "long", "colloquial"]:
+        for tense in [NONPAST, PAST]:
+            for polarity in [POS, NEG]:
+                name = f"{kind}_{tense.name.lower()}_{polarity.name.lower()}"
+                table = tables[kind]
+                columns[name] = build(lambda c: table[(c, tense, polarity)])
+    columns["te"] = build(lambda c: te_forms[c])
+
+    return pd.DataFrame(columns, index=index)
 
 
 ######################################################################
@@ -0,0 +1,212 @@
+# Accepted answers for a drill prompt.
+#
+# Most answers are a handful of pieces stuck together, where some of
+# the pieces can be said more than one way: わたしは or nothing, 宿題
+# or しゅくだい, なければ or なきゃ or なくちゃ, and so on. Writing out
+# every full sentence gets out of hand quickly (every choice multiplies
+# the count), so instead an answer is kept as a list of segments, each
+# with its alternatives:
+#
+#   AnswerLattice([("わたしは", ""), ("しゅくだい", "宿題"), "を", ...])
+#
+# The first alternative of each segment is the preferred one, and ""
+# makes a segment optional.
+#
+# Grading walks the segments a character at a time, keeping track of
+# every place in the lattice the input so far could have got us to.
+# Those state sets get cached as we go, so a lattice turns into a DFA
+# over the answers people actually type, and checking an answer is
+# linear in its length.
+#
+# The examples in the docstrings run: python -m doctest answers.py
+from collections import namedtuple
+from itertools import product
+
+# accepted: whether the whole input is an accepted answer
+# prefix:   how many characters at the start of the input could still
+#           have been the start of an accepted answer
+Match = namedtuple("Match", ["accepted", "prefix"])
+
+
+class AnswerLattice:
+    """
+    Every accepted answer to one prompt.
+
+    Example:
+        >>> answers = AnswerLattice([("わたしは", ""), "あした", ("いきます", "行きます")])
+        >>> "あした行きます" in answers
+        True
+        >>> answers.match("わたしはあさって")
+        Match(accepted=False, prefix=5)
+        >>> answers.preferred
+        'わたしはあしたいきます'
+    """
+
+    def __init__(self, segments):
+        self.segments = tuple(
+            (segment,) if isinstance(segment, str) else tuple(segment)
+            for segment in segments
+        )
+        # Built the first time we grade something, since plenty of
+        # items (bulk dumps, due queues) never get graded at all
+        self._start = None
+
+    def _compile(self):
+        # One trie per segment, all in one flat list of nodes. Each
+        # node is a dict of char -> node, and `ends` holds the nodes
+        # where one of the segment's alternatives finishes, which then
+        # carry on into the next segment's root.
+        self._edges = []
+        self._roots = []
+        self._ends = set()
+        for segment in self.segments:
+            root = self._new_node()
+            self._roots += [root]
+            for alternative in segment:
+                node = root
+                for char in alternative:
+                    if char not in self._edges[node]:
+                        self._edges[node][char] = self._new_node()
+                    node = self._edges[node][char]
+                self._ends.add(node)
+
+        # Past the last segment
+        self._final = self._new_node()
+        self._roots += [self._final]
+
+        self._node_segment = dict()
+        for (i, root) in enumerate(self._roots):
+            self._node_segment[root] = i
+        for (node, edges) in enumerate(self._edges):
+            for child in edges.values():
+                self._node_segment[child] = self._node_segment[node]
+
+        # (state set, char) -> state set, filled in as we grade
+        self._transitions = dict()
+        self._start = self._closure({self._roots[0]})
+
+    def _new_node(self):
+        self._edges += [dict()]
+        return len(self._edges) - 1
+
+    def _closure(self, nodes):
+        """
+        `nodes` plus wherever they get us without reading anything,
+        i.e. on into the next segment(s) from the end of an
+        alternative.
+        """
+        todo = list(nodes)
+        closed = set(nodes)
+        while todo:
+            node = todo.pop()
+            if node in self._ends:
+                following = self._roots[self._node_segment[node] + 1]
+                if following not in closed:
+                    closed.add(following)
+                    todo += [following]
+        return frozenset(closed)
+
+    def _step(self, state, char):
+        key = (state, char)
+        following = self._transitions.get(key)
+        if following is None:
+            moved = set()
+            for node in state:
+                child = self._edges[node].get(char)
+                if child is not None:
+                    moved.add(child)
+            following = self._closure(moved)
+            self._transitions[key] = following
+        return following
+
+    def match(self, text):
+        """
+        Grade `text`. Returns a Match with whether it was accepted and
+        how much of it was right before it went off the rails.
+
+        Example:
+            >>> answers = AnswerLattice(
+            ...     [
+            ...         ("わたしは", ""),
+            ...         ("しゅくだい", "宿題"),
+            ...         "を",
+            ...         ("しなければ", "しなきゃ"),
+            ...     ]
+            ... )
+            >>> answers.match("宿題をしなきゃ")
+            Match(accepted=True, prefix=7)
+            >>> answers.match("わたしはしゅくだいをしなければ")
+            Match(accepted=True, prefix=15)
+            >>> answers.match("しゅくだいをしな")  # right so far, but not done
+            Match(accepted=False, prefix=8)
+            >>> answers.match("しゅくだいがしなきゃ")
+            Match(accepted=False, prefix=5)
+            >>> answers.match("")
+            Match(accepted=False, prefix=0)
+            >>> answers.match(None)
+            Match(accepted=False, prefix=0)
+        """
+        if text is None:
+            return Match(False, 0)
+        if self._start is None:
+            self._compile()
+
+        state = self._start
+        for (i, char) in enumerate(text):
+            state = self._step(state, char)
+            if not state:
+                return Match(False, i)
+        return Match(self._final in state, len(text))
+
+    def __contains__(self, text):
+        return self.match(text).accepted
+
+    @property
+    def preferred(self):
+        return "".join(segment[0] for segment in self.segments)
+
+    def __iter__(self):
+        """
+        Every accepted answer written out in full, the preferred one
+        first. There can be a lot of these.
+
+        Example:
+            >>> list(AnswerLattice([("わたしは", ""), ("あした", "明日")]))
+            ['わたしはあした', 'わたしは明日', 'あした', '明日']
+        """
+        seen = set()
+        for pieces in product(*self.segments):
+            answer = "".join(pieces)
+            if answer not in seen:
+                seen.add(answer)
+                yield answer
+
+    def __len__(self):
+        """
+        How many ways there are to put the segments together (an upper
+        bound on the number of distinct answers).
+        """
+        count = 1
+        for segment in self.segments:
+            count *= len(segment)
+        return count
+
+    def __str__(self):
+        """
+        The lattice written compactly, e.g. "[わたしは]あした(いきます|行きます)"
+        """
+        out = ""
+        for segment in self.segments:
+            alternatives = [alternative for alternative in segment if alternative]
+            if not alternatives:
+                continue
+            elif len(alternatives) < len(segment):
+                out += "[" + "|".join(alternatives) + "]"
+            elif len(alternatives) > 1:
+                out += "(" + "|".join(alternatives) + ")"
+            else:
+                out += alternatives[0]
+        return out
+
+    def __repr__(self):
+        return f"AnswerLattice({list(self.segments)!r})"
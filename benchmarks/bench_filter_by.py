@@ -0,0 +1,74 @@
+"""
+Microbenchmark for vocab.filter_by against the old row-by-row version.
+
+Checks that both give the same rows for a handful of queries (on the
+plain object columns and on the categorical ones), then times them.
+
+Usage:
+    python benchmarks/bench_filter_by.py [--repeat N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab import filter_by, load_vocab
+
+
+def legacy_filter_by(df, col, val):
+    """
+    filter_by as it used to be written, for comparison.
+    """
+    if type(val) == list:
+        return df[
+            [any([val_entry in df_entry for val_entry in val]) for df_entry in df[col]]
+        ]
+    return df[[val in entry for entry in df[col]]]
+
+
+queries = [
+    ("pos", "verb"),
+    ("pos", ["noun", "adj"]),
+    ("lesson", "L15"),
+    ("lesson", [f"L{i}" for i in range(3, 13)]),
+    ("english", "to "),
+    ("english", ["eat", "drink", "see", "read"]),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    df = load_vocab()
+
+    # Plain object columns, like before the snapshot made pos/lesson
+    # categorical
+    plain_df = df.astype({"pos": object, "lesson": object})
+
+    print(f"{len(df)} rows, {args.repeat} repeats per query\n")
+    print(f"{'query':<48} {'legacy':>10} {'new':>10} {'new (obj)':>10} {'speedup':>8}")
+    for (col, val) in queries:
+        expected = legacy_filter_by(plain_df, col, val).index
+        assert filter_by(df, col, val).index.equals(expected), (col, val)
+        assert filter_by(plain_df, col, val).index.equals(expected), (col, val)
+
+        t_old = timeit.timeit(lambda: legacy_filter_by(plain_df, col, val), number=args.repeat)
+        t_new = timeit.timeit(lambda: filter_by(df, col, val), number=args.repeat)
+        t_obj = timeit.timeit(lambda: filter_by(plain_df, col, val), number=args.repeat)
+
+        label = f"{col} ~ {val!r}"
+        if len(label) > 46:
+            label = label[:43] + "..."
+        us = 1e6 / args.repeat
+        print(
+            f"{label:<48} {t_old * us:>8.0f}us {t_new * us:>8.0f}us "
+            f"{t_obj * us:>8.0f}us {t_old / t_new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
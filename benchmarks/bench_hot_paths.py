@@ -0,0 +1,259 @@
+"""
+Benchmarks for the practice hot paths.
+
+Covers the whole pipeline: loading the workbook (cold, from the
+snapshot, and from the in-process memo), filter_by, the japanese()/verb_class() lookups, verb
+conjugation (straight through the generator and through the
+precomputed table), Counter.quantity, and generating a prompt end to
+end for each drill with input() stubbed out.
+
+Each benchmark times every call on its own and reports ops/sec plus
+p50/p99 latency. Results can be saved as JSON and compared against an
+earlier run.
+
+Usage:
+    python benchmarks/bench_hot_paths.py [--only SUBSTR] [--scale X]
+        [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repo)
+
+import warnings
+
+# pandas likes to complain about things we don't care about here
+warnings.simplefilter("ignore")
+
+
+def percentile(sorted_samples, q):
+    if not sorted_samples:
+        return 0.0
+    i = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+    return sorted_samples[i]
+
+
+def run_benchmark(func, iterations, warmup):
+    """
+    Time `iterations` calls of `func`, one at a time. Returns the
+    per-call latencies in nanoseconds, sorted.
+    """
+    for _ in range(warmup):
+        func()
+
+    clock = time.perf_counter_ns
+    samples = []
+    for _ in range(iterations):
+        start = clock()
+        func()
+        samples += [clock() - start]
+    samples.sort()
+    return samples
+
+
+def summarize(name, samples):
+    total_s = sum(samples) / 1e9
+    return {
+        "name": name,
+        "iterations": len(samples),
+        "ops_per_sec": len(samples) / total_s if total_s else float("inf"),
+        "p50_us": percentile(samples, 0.50) / 1e3,
+        "p99_us": percentile(samples, 0.99) / 1e3,
+        "mean_us": sum(samples) / len(samples) / 1e3,
+    }
+
+
+@contextlib.contextmanager
+def headless():
+    """
+    Stub out input() and swallow everything the drills print.
+    """
+    real_input = builtins.input
+    builtins.input = lambda prompt="": ""
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = real_input
+
+
+def benchmarks():
+    """
+    (name, function, iterations, warmup) for everything we measure.
+    Imports happen in here so loading them isn't part of any timing.
+    """
+    import counters
+    import genki_practice as gp
+    import nouns
+    import vocab
+
+    from japaneseverbconjugator.src.constants.EnumeratedTypes import (
+        Polarity,
+        Tense,
+    )
+
+    df = vocab.load_vocab()
+    practice_df = gp.df
+    index = gp.index
+    jvfg = gp.jvfg
+    rng = random.Random(0)
+
+    english_nouns = [noun for noun in nouns.do_able + nouns.eat_able if noun in index.by_english]
+    verbs = [(gp.japanese(verb), gp.verb_class(verb)) for verb in gp.verb_list]
+    # Skip the ones the generator chokes on, e.g. "かける（めがねを）"
+    verbs = [(verb, vclass) for (verb, vclass) in verbs if verb[-1] in "うくぐすつぬぶむる"]
+
+    def random_verb_form(conjugate):
+        def run():
+            (verb, vclass) = rng.choice(verbs)
+            conjugate(verb, vclass, rng.choice(list(Tense)), rng.choice(list(Polarity)))
+
+        return run
+
+    counter_objs = [
+        obj for obj in vars(counters).values() if isinstance(obj, counters.Counter)
+    ]
+
+    def quantity():
+        counter = rng.choice(counter_objs)
+        counter.quantity(rng.randrange(1, 100_000))
+
+    # A drill that raises fails the run, rather than getting counted
+    # and benching as "fast"
+    def drill(func):
+        def run():
+            with headless():
+                func()
+
+        return run
+
+    def generate(make_items):
+        items = make_items()
+
+        def run():
+            next(items)
+
+        return run
+
+    def load_snapshot_unmemoized():
+        # Forget the in-process copy, so this is the pickle load
+        vocab._loaded_snapshots.clear()
+        vocab.load_snapshot()
+
+    yield ("load: read_workbook (cold xlsx)", lambda: vocab.read_workbook(), 3, 0)
+    yield ("load: load_snapshot (warm)", load_snapshot_unmemoized, 20, 1)
+    yield ("load: load_snapshot (memo)", lambda: vocab.load_snapshot(), 20000, 100)
+
+    yield ("filter_by: pos ~ 'verb'", lambda: vocab.filter_by(df, "pos", "verb"), 200, 5)
+    yield (
+        "filter_by: lesson ~ L3..L12",
+        lambda: vocab.filter_by(df, "lesson", [f"L{i}" for i in range(3, 13)]),
+        200,
+        5,
+    )
+    yield (
+        "filter_by: english ~ 'to '",
+        lambda: vocab.filter_by(practice_df, "english", "to "),
+        200,
+        5,
+    )
+
+    yield ("lookup: japanese()", lambda: gp.japanese(rng.choice(english_nouns)), 20000, 100)
+    yield ("lookup: verb_class()", lambda: gp.verb_class(rng.choice(gp.verb_list)), 20000, 100)
+    yield ("lookup: j_verb_class()", lambda: gp.j_verb_class(rng.choice(verbs)[0]), 20000, 100)
+
+    yield ("conjugate: jvfg.generate_plain_form", random_verb_form(jvfg.generate_plain_form), 5000, 50)
+    yield ("conjugate: jvfg.generate_polite_form", random_verb_form(jvfg.generate_polite_form), 5000, 50)
+    yield ("conjugate: plain_form (table)", random_verb_form(gp.plain_form), 20000, 100)
+    yield ("conjugate: polite_form (table)", random_verb_form(gp.polite_form), 20000, 100)
+    yield (
+        "conjugate: te_form (table)",
+        lambda: gp.te_form(*rng.choice(verbs)),
+        20000,
+        100,
+    )
+
+    yield ("counters: Counter.quantity", quantity, 20000, 100)
+
+    drills = [
+        gp.qualify_noun,
+        gp.random_short_form,
+        gp.single_ongoing_negative,
+        gp.plan_practice,
+        gp.tai_practice,
+        gp.obligation_practice,
+    ]
+    for func in drills:
+        yield (f"drill: {func.__name__}", drill(func), 2000, 20)
+
+    # Same thing without any terminal I/O, straight off the generators
+    for (name, make_items) in gp.drill_generators.items():
+        yield (f"generate: {name}", generate(make_items), 20000, 100)
+
+
+def print_results(results, baseline=None):
+    base = {r["name"]: r for r in baseline["results"]} if baseline else {}
+    header = f"{'benchmark':<42} {'ops/sec':>12} {'p50':>10} {'p99':>10}"
+    if base:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        line = (
+            f"{r['name']:<42} {r['ops_per_sec']:>12,.0f} "
+            f"{r['p50_us']:>8.1f}us {r['p99_us']:>8.1f}us"
+        )
+        if r["name"] in base:
+            line += f" {r['ops_per_sec'] / base[r['name']]['ops_per_sec']:>7.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", help="only run benchmarks whose name contains this")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply iteration counts")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    # The drills draw from the global random module
+    random.seed(0)
+
+    results = []
+    for (name, func, iterations, warmup) in benchmarks():
+        if args.only and args.only not in name:
+            continue
+        iterations = max(1, int(iterations * args.scale))
+        results += [summarize(name, run_benchmark(func, iterations, warmup))]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Startup benchmark for genki_practice.
+
+Importing genki_practice is supposed to be basically free: the vocab
+snapshot, pandas and the verb conjugator all get loaded on first use.
+This checks that, and fails (exit code 1) if the import gets slow
+again or starts dragging in the heavy stuff.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--budget-ms MS]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# None of these should get imported just from `import genki_practice`
+heavy_modules = (
+    "pandas",
+    "openpyxl",
+    "vocab",
+    "japaneseverbconjugator.src.JapaneseVerbFormGenerator",
+)
+
+
+def run_python(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_time_us(module="genki_practice"):
+    """
+    Cumulative import time for `module` in microseconds, according to
+    `python -X importtime`.
+    """
+    out = run_python(f"import {module}", "-X", "importtime").stderr
+    for line in out.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+
+def leaked_modules():
+    code = (
+        "import sys, genki_practice\n"
+        f"print('\\n'.join(m for m in {heavy_modules!r} if m in sys.modules))"
+    )
+    return [line for line in run_python(code).stdout.splitlines() if line]
+
+
+def first_use_ms():
+    """
+    How long the first real lookup takes (loads the vocab snapshot, so
+    this assumes it's already been built once).
+    """
+    code = (
+        "import time, genki_practice\n"
+        "t = time.perf_counter()\n"
+        "genki_practice.japanese('to eat')\n"
+        "print((time.perf_counter() - t) * 1000)"
+    )
+    return float(run_python(code, "-W", "ignore").stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    times = [import_time_us() / 1000 for _ in range(args.runs)]
+    median = statistics.median(times)
+    print(f"import genki_practice: median {median:.1f} ms over {args.runs} runs")
+    print(f"  min {min(times):.1f} ms, max {max(times):.1f} ms")
+
+    # Prime the snapshot before timing the first lookup
+    first_use_ms()
+    print(f"first lookup (warm snapshot): {first_use_ms():.1f} ms")
+
+    failed = False
+    leaked = leaked_modules()
+    if leaked:
+        print(f"FAIL: import pulled in {', '.join(leaked)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: import took {median:.1f} ms, budget is {args.budget_ms} ms")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
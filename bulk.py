@@ -0,0 +1,159 @@
+# Bulk drill generation, for pre-generating big drill banks.
+#
+# The work is cut into fixed-size chunks and farmed out to a process
+# pool. Every chunk gets its own child seed spawned off of the master
+# seed, so the merged output only depends on the master seed (and the
+# chunk size), not on how many workers there were or which worker
+# happened to pick up which chunk.
+#
+# Example:
+#     python bulk.py plan_practice 100000 --seed 7 --workers 8 -o bank.jsonl
+#
+# or, for every prompt the drill can make (see drill_space.py):
+#     python bulk.py plan_practice --all -o everything.jsonl
+import argparse
+import os
+import random
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import genki_practice
+import instrument
+
+from drill_items import item_to_json
+
+default_chunk_size = 2000
+
+# How many times in a row a drill's generator can raise, without making
+# an item in between, before generate_chunk gives up and lets it through
+max_retries = 10
+
+
+def chunk_rngs(master_seed, n_chunks):
+    """
+    One independent random.Random per chunk, from child seeds spawned
+    off of `master_seed`.
+    """
+    from numpy.random import SeedSequence
+
+    rngs = []
+    for child in SeedSequence(master_seed).spawn(n_chunks):
+        seed = int.from_bytes(child.generate_state(4).tobytes(), "little")
+        rngs += [random.Random(seed)]
+    return rngs
+
+
+def generate_chunk(drill, rng, count):
+    """
+    `count` items from `drill` (a key of genki_practice.drill_generators)
+    drawn from `rng`.
+    """
+    make_items = genki_practice.drill_generators[drill]
+    items = []
+    failures = 0
+    while len(items) < count:
+        made = len(items)
+        try:
+            items.extend(islice(make_items(rng), count - len(items)))
+        except Exception:
+            # A generator that raised is done, so start another one off
+            # of the same rng. That draw is skipped, but the same way
+            # every run. Raising over and over without making anything
+            # is a bug, though, not bad luck.
+            failures = failures + 1 if len(items) == made else 1
+            if failures > max_retries:
+                raise
+    return items
+
+
+def _run_chunk(task):
+    # Hands back this chunk's stats along with it (see instrument.py),
+    # since a worker's own never make it back to the parent otherwise
+    (drill, rng, count) = task
+    items = generate_chunk(drill, rng, count)
+    return (items, instrument.drain() if instrument.enabled else None)
+
+
+def _warm_up(stats):
+    if stats:
+        # Don't count whatever got forked off of the parent twice
+        instrument.reset()
+        instrument.enable(report_at_exit=False)
+    # Load the vocab snapshot once per worker instead of on the first
+    # chunk it gets
+    genki_practice.japanese("to eat")
+
+
+def generate_bank(drill, n, master_seed=0, workers=None, chunk_size=default_chunk_size):
+    """
+    Generate `n` items of `drill`, reproducibly.
+
+    The same (drill, n, master_seed, chunk_size) always gives the same
+    list, for any number of workers. workers=1 runs everything in this
+    process.
+    """
+    n_chunks = (n + chunk_size - 1) // chunk_size
+    counts = [min(chunk_size, n - i * chunk_size) for i in range(n_chunks)]
+    rngs = chunk_rngs(master_seed, n_chunks)
+    tasks = [(drill, rng, count) for (rng, count) in zip(rngs, counts)]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, n_chunks))
+
+    items = []
+    if workers == 1:
+        for task in tasks:
+            items += generate_chunk(*task)
+        return items
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers, initializer=_warm_up, initargs=(instrument.enabled,)
+    )
+    with pool:
+        # map() hands the results back in task order no matter which
+        # worker finishes first
+        for (chunk, stats) in pool.map(_run_chunk, tasks):
+            items += chunk
+            if stats is not None:
+                instrument.merge(stats)
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate a drill bank.")
+    parser.add_argument("drill", choices=sorted(genki_practice.drill_generators))
+    parser.add_argument("n", type=int, nargs="?", help="how many items")
+    parser.add_argument(
+        "--all", action="store_true", help="every possible item once, in order, instead"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=default_chunk_size)
+    parser.add_argument("-o", "--output", default="-", help="JSON lines file, - for stdout")
+    parser.add_argument(
+        "--stats", action="store_true", help="print timings and counts when done"
+    )
+    args = parser.parse_args()
+    if args.stats:
+        instrument.enable()
+    if args.n is None and not args.all:
+        parser.error("need n (or --all)")
+
+    if args.all:
+        items = iter(genki_practice.drill_space(args.drill))
+    else:
+        items = generate_bank(args.drill, args.n, args.seed, args.workers, args.chunk_size)
+    lines = (item_to_json(item) + "\n" for item in items)
+
+    if args.output == "-":
+        for line in lines:
+            print(line, end="")
+    else:
+        with open(args.output, "w") as f:
+            f.writelines(lines)
+
+
+if __name__ == "__main__":
+    main()
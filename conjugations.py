@@ -0,0 +1,123 @@
+# Precomputed verb conjugations.
+#
+# The set of verbs in the workbook is small and fixed, so rather than
+# running every verb through the JapaneseVerbFormGenerator each time a
+# drill wants a form, we build every form once when the vocab snapshot
+# is built (see vocab.build_snapshot) and just look them up after that.
+#
+# The table is a flat dict:
+#
+#   (verb, VerbClass, form, Tense, Polarity) -> conjugated string
+#
+# where form is "plain" or "polite". The te form doesn't have a tense
+# or polarity, so those are None for it:
+#
+#   (verb, VerbClass, "te", None, None) -> conjugated string
+#
+# `verb` is both the kana and the kanji spelling of each entry, since
+# the drills use both.
+import sys
+
+from japaneseverbconjugator.src.constants.EnumeratedTypes import (
+    Tense,
+    Polarity,
+)
+
+forms = ("plain", "polite")
+
+
+def verb_spellings(entry):
+    """
+    All the ways a verb entry gets written: the kana, plus each kanji
+    spelling (a few entries list more than one, separated by "/").
+    """
+    spellings = [entry.word]
+    if entry.kanji is not None:
+        spellings += entry.kanji.split("/")
+    return spellings
+
+
+def build_conjugation_table(store, jvfg=None):
+    """
+    Conjugate every verb in `store` (a vocab.VocabStore) into every
+    plain/polite tense and polarity, plus the te form.
+
+    Verbs the generator can't handle (e.g. "かける（めがねを）", which
+    has the object tacked on the end) are just left out, and lookups
+    for them will fall through to the generator like before.
+    """
+    from vocab import verb_classes
+
+    if jvfg is None:
+        from japaneseverbconjugator.src import JapaneseVerbFormGenerator
+
+        jvfg = JapaneseVerbFormGenerator.JapaneseVerbFormGenerator()
+
+    generators = {
+        "plain": jvfg.generate_plain_form,
+        "polite": jvfg.generate_polite_form,
+    }
+
+    table = dict()
+    for entry in store:
+        if entry.pos not in verb_classes:
+            continue
+        vclass = verb_classes[entry.pos]
+        for verb in verb_spellings(entry):
+            try:
+                forms_for_verb = {
+                    (verb, vclass, form, tense, polarity): generators[form](
+                        verb, vclass, tense, polarity
+                    )
+                    for form in forms
+                    for tense in Tense
+                    for polarity in Polarity
+                }
+                te = jvfg.generate_te_form(verb, vclass)
+                forms_for_verb[(verb, vclass, "te", None, None)] = te
+            except Exception as e:
+                # The generator raises a plain Exception for verbs it
+                # can't handle (non-japanese characters, endings like
+                # "）"). Anything more specific is a real bug, and
+                # shouldn't quietly take the verb out of the drills.
+                if type(e) is not Exception:
+                    raise
+                continue
+            if None in forms_for_verb.values():
+                # And gives back None for some forms of a few (e.g. the
+                # kanji 来る), so leave those out too
+                continue
+            table.update(
+                {key: sys.intern(form) for (key, form) in forms_for_verb.items()}
+            )
+    return table
+
+
+def golden_lines(table):
+    """
+    The table as sorted, tab separated lines, for diffing the output
+    across upgrades of the conjugation library.
+    """
+    lines = []
+    for ((verb, vclass, form, tense, polarity), conjugated) in table.items():
+        tense = tense.name if tense is not None else "-"
+        polarity = polarity.name if polarity is not None else "-"
+        lines += [f"{verb}\t{vclass.name}\t{form}\t{tense}\t{polarity}\t{conjugated}"]
+    return sorted(lines)
+
+
+def write_golden(table, path):
+    with open(path, "w") as f:
+        f.write("\n".join(golden_lines(table)) + "\n")
+
+
+if __name__ == "__main__":
+    # python conjugations.py golden.tsv
+    #
+    # Dump the table for the current workbook, e.g. to diff before and
+    # after bumping japaneseverbconjugator. Built fresh rather than
+    # taken from the snapshot, so it's always the installed version's.
+    from vocab import load_store
+
+    table = build_conjugation_table(load_store())
+    write_golden(table, sys.argv[1] if len(sys.argv) > 1 else "conjugations.tsv")
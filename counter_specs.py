@@ -0,0 +1,178 @@
+# The counters on page 380 of Genki, written down as plain data.
+#
+# Nothing reads this at import time. `python counters.py` compiles it
+# into counter_table.py (every counter's reading after なん and 1-10,
+# plus the tables for reading whole numbers), and that's what counters
+# loads. So after changing anything here, run that again.
+#
+# Each counter is
+#
+#   name: (counter word, prefixes, morph rules, exceptions)
+#
+#   prefixes:    number -> how the number sounds in front of this
+#                counter, wherever that isn't standard_prefixes
+#                (e.g. 8: "はっ"). A tuple means they're all fine,
+#                the first one preferred (e.g. 8: ("はっ", "はち")).
+#   morph rules: number -> the row of the mora grid (see counters.py)
+#                that the counter's first mora moves to after that
+#                number (e.g. 3: "b" for さんぼん). This only happens
+#                right after っ or ん, so はち + ふん stays はちふん.
+#   exceptions:  number -> every reading, preferred first, for numbers
+#                that are just said differently (ひとり), and only when
+#                it's exactly that number (21 is still にじゅういちにん)
+
+# Define the standard counter word numeral rule things
+standard_prefixes = {
+    1: "いち",
+    2: "に",
+    3: "さん",
+    4: "よん",
+    5: "ご",
+    6: "ろく",
+    7: "なな",
+    8: "はち",
+    9: "きゅう",
+    10: "じゅう",
+    "question": "なん",
+}
+
+#
+# Standard euphonic change involving glottal stops
+#
+glottal_prefixes = {
+    1: "いっ",
+    6: "ろっ",  # Not used with [s], [ɕ], [z], [ʑ], [t], [tɕ],
+    8: "はっ",
+    10: ("じゅっ", "じっ"),  # じっ is also standard
+}
+
+# Months
+month_prefixes = {4: "し", 7: "しち", 9: "く"}
+
+# Hours
+hours_prefixes = {4: "よ", 7: "しち", 9: "く"}
+
+# Years, people, yen
+year_and_people_prefixes = {4: "よ"}
+
+# Minutes
+minute_prefixes = {**glottal_prefixes, 8: ("はっ", "はち")}
+minute_morph_rules = {i: "p" for i in [1, 3, 4, 6, 8, 10, "question"]}
+
+# Sticks, cups, animals, hundreds
+stick_morph_rules = {1: "p", 3: "b", 6: "p", 8: "p", 10: "p", "question": "b"}
+
+# Pages, pounds. The glottal stop is optional
+page_prefixes = {
+    **glottal_prefixes,
+    **{i: (glottal_prefixes[i], standard_prefixes[i]) for i in [1, 6, 8]},
+}
+
+# Floors, houses
+floor_morph_rules = {3: "g", "question": "g"}
+
+# Cents, weeks, books, ages. No glottal stop on 6 for some reason
+cent_prefixes = {i: prefix for (i, prefix) in glottal_prefixes.items() if i != 6}
+
+# Twenty years old
+age_exceptions = {20: ("はたち", "にじゅっさい", "にじっさい")}
+
+# Shoes, thousands
+shoes_morph_rules = {3: "z", "question": "z"}
+
+counter_specs = {
+    # Regular counters (no special rules)
+    "dollar_counter": ("ドル", {}, {}, {}),
+    "yen_counter": ("えん", year_and_people_prefixes, {}, {}),
+    "sheet_counter": ("まい", {}, {}, {}),
+    "degree_counter": ("ど", {}, {}, {}),
+    "ten_counter": ("じゅう", {}, {}, {}),
+    "ten_thousand_counter": ("まん", {}, {}, {}),
+    # Months
+    "month_counter": ("がつ", month_prefixes, {}, {}),
+    # Hours
+    "oclock_counter": ("じ", hours_prefixes, {}, {}),
+    "hours_counter": ("じかん", hours_prefixes, {}, {}),
+    # For saying stuff like "it was the year 2003"
+    "year_counter": ("ねん", year_and_people_prefixes, {}, {}),
+    # For saying stuff like "that was 2003 years ago"
+    "years_counter": ("ねんかん", year_and_people_prefixes, {}, {}),
+    # Counting people has some special casework.
+    "naive_people_counter": ("にん", year_and_people_prefixes, {}, {}),
+    "people_counter": (
+        "にん",
+        year_and_people_prefixes,
+        {},
+        {1: ("ひとり",), 2: ("ふたり",)},
+    ),
+    # For things like "it's 10:23"
+    "minute_counter": ("ふん", minute_prefixes, minute_morph_rules, {}),
+    # For things like "That took 10 hours and 23 minuts"
+    "minutes_counter": ("ふんかん", minute_prefixes, minute_morph_rules, {}),
+    # Sticks, cups, animals, hundreds
+    "stick_counter": ("ほん", glottal_prefixes, stick_morph_rules, {}),
+    "cup_counter": ("はい", glottal_prefixes, stick_morph_rules, {}),
+    "animal_counter": ("ひき", glottal_prefixes, stick_morph_rules, {}),
+    "hundered_counter": ("ひゃく", glottal_prefixes, stick_morph_rules, {}),
+    # Pages, pounds
+    "page_counter": ("ページ", page_prefixes, {}, {}),
+    "pound_counter": ("ポンド", page_prefixes, {}, {}),
+    # Months, lesson, times, small items
+    "months_counter": ("かげつ", glottal_prefixes, {}, {}),
+    "lesson_counter": ("か", glottal_prefixes, {}, {}),
+    "times_counter": ("かい", glottal_prefixes, {}, {}),
+    "small_items_counter": ("こ", glottal_prefixes, {}, {}),
+    # Floors, houses
+    "floor_counter": ("かい", glottal_prefixes, floor_morph_rules, {}),
+    "houses_counter": ("けん", glottal_prefixes, floor_morph_rules, {}),
+    # Cents, weeks, books
+    "cents_counter": ("セント", cent_prefixes, {}, {}),
+    "weeks_counter": ("しゅうかん", cent_prefixes, {}, {}),
+    "books_counter": ("さつ", cent_prefixes, {}, {}),
+    "years_of_age_counter": ("さい", cent_prefixes, {}, age_exceptions),
+    # Shoes, thousands
+    "shoes_counter": ("そく", cent_prefixes, shoes_morph_rules, {}),
+    "thousands_counter": ("せん", cent_prefixes, shoes_morph_rules, {}),
+    # Letters, street addresses
+    "letters_counter": ("つう", cent_prefixes, {}, {}),
+    "street_address_counter": ("ちょうめ", cent_prefixes, {}, {}),
+}
+
+# How each counter is written after a kanji number (二枚, 三本, ...)
+counter_kanji = {
+    "dollar_counter": "ドル",
+    "yen_counter": "円",
+    "sheet_counter": "枚",
+    "degree_counter": "度",
+    "ten_counter": "十",
+    "ten_thousand_counter": "万",
+    "month_counter": "月",
+    "oclock_counter": "時",
+    "hours_counter": "時間",
+    "year_counter": "年",
+    "years_counter": "年間",
+    "naive_people_counter": "人",
+    "people_counter": "人",
+    "minute_counter": "分",
+    "minutes_counter": "分間",
+    "stick_counter": "本",
+    "cup_counter": "杯",
+    "animal_counter": "匹",
+    "hundered_counter": "百",
+    "page_counter": "ページ",
+    "pound_counter": "ポンド",
+    "months_counter": "か月",
+    "lesson_counter": "課",
+    "times_counter": "回",
+    "small_items_counter": "個",
+    "floor_counter": "階",
+    "houses_counter": "軒",
+    "cents_counter": "セント",
+    "weeks_counter": "週間",
+    "books_counter": "冊",
+    "years_of_age_counter": "歳",
+    "shoes_counter": "足",
+    "thousands_counter": "千",
+    "letters_counter": "通",
+    "street_address_counter": "丁目",
+}
@@ -0,0 +1,231 @@
+# Generated by `python counters.py` from counter_specs.py. Don't edit
+# this by hand: change the specs and run that again.
+#
+# counters: name -> (counter word, kanji, readings, exceptions), where
+#           readings[i] is every reading (preferred first) of the
+#           counter after the number i (1-10), and readings[0] after
+#           なん
+# digits, tens, hundreds, thousands: the reading of that digit in that
+#           place, "" for 0
+#
+# Everything in here is immutable.
+# fmt: off
+from types import MappingProxyType
+
+counters = MappingProxyType({
+    "dollar_counter": (
+        "ドル",
+        "ドル",
+        (("なんドル",), ("いちドル",), ("にドル",), ("さんドル",), ("よんドル",), ("ごドル",), ("ろくドル",), ("ななドル",), ("はちドル",), ("きゅうドル",), ("じゅうドル",)),
+        MappingProxyType({}),
+    ),
+    "yen_counter": (
+        "えん",
+        "円",
+        (("なんえん",), ("いちえん",), ("にえん",), ("さんえん",), ("よえん",), ("ごえん",), ("ろくえん",), ("ななえん",), ("はちえん",), ("きゅうえん",), ("じゅうえん",)),
+        MappingProxyType({}),
+    ),
+    "sheet_counter": (
+        "まい",
+        "枚",
+        (("なんまい",), ("いちまい",), ("にまい",), ("さんまい",), ("よんまい",), ("ごまい",), ("ろくまい",), ("ななまい",), ("はちまい",), ("きゅうまい",), ("じゅうまい",)),
+        MappingProxyType({}),
+    ),
+    "degree_counter": (
+        "ど",
+        "度",
+        (("なんど",), ("いちど",), ("にど",), ("さんど",), ("よんど",), ("ごど",), ("ろくど",), ("ななど",), ("はちど",), ("きゅうど",), ("じゅうど",)),
+        MappingProxyType({}),
+    ),
+    "ten_counter": (
+        "じゅう",
+        "十",
+        (("なんじゅう",), ("いちじゅう",), ("にじゅう",), ("さんじゅう",), ("よんじゅう",), ("ごじゅう",), ("ろくじゅう",), ("ななじゅう",), ("はちじゅう",), ("きゅうじゅう",), ("じゅうじゅう",)),
+        MappingProxyType({}),
+    ),
+    "ten_thousand_counter": (
+        "まん",
+        "万",
+        (("なんまん",), ("いちまん",), ("にまん",), ("さんまん",), ("よんまん",), ("ごまん",), ("ろくまん",), ("ななまん",), ("はちまん",), ("きゅうまん",), ("じゅうまん",)),
+        MappingProxyType({}),
+    ),
+    "month_counter": (
+        "がつ",
+        "月",
+        (("なんがつ",), ("いちがつ",), ("にがつ",), ("さんがつ",), ("しがつ",), ("ごがつ",), ("ろくがつ",), ("しちがつ",), ("はちがつ",), ("くがつ",), ("じゅうがつ",)),
+        MappingProxyType({}),
+    ),
+    "oclock_counter": (
+        "じ",
+        "時",
+        (("なんじ",), ("いちじ",), ("にじ",), ("さんじ",), ("よじ",), ("ごじ",), ("ろくじ",), ("しちじ",), ("はちじ",), ("くじ",), ("じゅうじ",)),
+        MappingProxyType({}),
+    ),
+    "hours_counter": (
+        "じかん",
+        "時間",
+        (("なんじかん",), ("いちじかん",), ("にじかん",), ("さんじかん",), ("よじかん",), ("ごじかん",), ("ろくじかん",), ("しちじかん",), ("はちじかん",), ("くじかん",), ("じゅうじかん",)),
+        MappingProxyType({}),
+    ),
+    "year_counter": (
+        "ねん",
+        "年",
+        (("なんねん",), ("いちねん",), ("にねん",), ("さんねん",), ("よねん",), ("ごねん",), ("ろくねん",), ("ななねん",), ("はちねん",), ("きゅうねん",), ("じゅうねん",)),
+        MappingProxyType({}),
+    ),
+    "years_counter": (
+        "ねんかん",
+        "年間",
+        (("なんねんかん",), ("いちねんかん",), ("にねんかん",), ("さんねんかん",), ("よねんかん",), ("ごねんかん",), ("ろくねんかん",), ("ななねんかん",), ("はちねんかん",), ("きゅうねんかん",), ("じゅうねんかん",)),
+        MappingProxyType({}),
+    ),
+    "naive_people_counter": (
+        "にん",
+        "人",
+        (("なんにん",), ("いちにん",), ("ににん",), ("さんにん",), ("よにん",), ("ごにん",), ("ろくにん",), ("ななにん",), ("はちにん",), ("きゅうにん",), ("じゅうにん",)),
+        MappingProxyType({}),
+    ),
+    "people_counter": (
+        "にん",
+        "人",
+        (("なんにん",), ("いちにん",), ("ににん",), ("さんにん",), ("よにん",), ("ごにん",), ("ろくにん",), ("ななにん",), ("はちにん",), ("きゅうにん",), ("じゅうにん",)),
+        MappingProxyType({1: ("ひとり",), 2: ("ふたり",)}),
+    ),
+    "minute_counter": (
+        "ふん",
+        "分",
+        (("なんぷん",), ("いっぷん",), ("にふん",), ("さんぷん",), ("よんぷん",), ("ごふん",), ("ろっぷん",), ("ななふん",), ("はっぷん", "はちふん"), ("きゅうふん",), ("じゅっぷん", "じっぷん")),
+        MappingProxyType({}),
+    ),
+    "minutes_counter": (
+        "ふんかん",
+        "分間",
+        (("なんぷんかん",), ("いっぷんかん",), ("にふんかん",), ("さんぷんかん",), ("よんぷんかん",), ("ごふんかん",), ("ろっぷんかん",), ("ななふんかん",), ("はっぷんかん", "はちふんかん"), ("きゅうふんかん",), ("じゅっぷんかん", "じっぷんかん")),
+        MappingProxyType({}),
+    ),
+    "stick_counter": (
+        "ほん",
+        "本",
+        (("なんぼん",), ("いっぽん",), ("にほん",), ("さんぼん",), ("よんほん",), ("ごほん",), ("ろっぽん",), ("ななほん",), ("はっぽん",), ("きゅうほん",), ("じゅっぽん", "じっぽん")),
+        MappingProxyType({}),
+    ),
+    "cup_counter": (
+        "はい",
+        "杯",
+        (("なんばい",), ("いっぱい",), ("にはい",), ("さんばい",), ("よんはい",), ("ごはい",), ("ろっぱい",), ("ななはい",), ("はっぱい",), ("きゅうはい",), ("じゅっぱい", "じっぱい")),
+        MappingProxyType({}),
+    ),
+    "animal_counter": (
+        "ひき",
+        "匹",
+        (("なんびき",), ("いっぴき",), ("にひき",), ("さんびき",), ("よんひき",), ("ごひき",), ("ろっぴき",), ("ななひき",), ("はっぴき",), ("きゅうひき",), ("じゅっぴき", "じっぴき")),
+        MappingProxyType({}),
+    ),
+    "hundered_counter": (
+        "ひゃく",
+        "百",
+        (("なんびゃく",), ("いっぴゃく",), ("にひゃく",), ("さんびゃく",), ("よんひゃく",), ("ごひゃく",), ("ろっぴゃく",), ("ななひゃく",), ("はっぴゃく",), ("きゅうひゃく",), ("じゅっぴゃく", "じっぴゃく")),
+        MappingProxyType({}),
+    ),
+    "page_counter": (
+        "ページ",
+        "ページ",
+        (("なんページ",), ("いっページ", "いちページ"), ("にページ",), ("さんページ",), ("よんページ",), ("ごページ",), ("ろっページ", "ろくページ"), ("ななページ",), ("はっページ", "はちページ"), ("きゅうページ",), ("じゅっページ", "じっページ")),
+        MappingProxyType({}),
+    ),
+    "pound_counter": (
+        "ポンド",
+        "ポンド",
+        (("なんポンド",), ("いっポンド", "いちポンド"), ("にポンド",), ("さんポンド",), ("よんポンド",), ("ごポンド",), ("ろっポンド", "ろくポンド"), ("ななポンド",), ("はっポンド", "はちポンド"), ("きゅうポンド",), ("じゅっポンド", "じっポンド")),
+        MappingProxyType({}),
+    ),
+    "months_counter": (
+        "かげつ",
+        "か月",
+        (("なんかげつ",), ("いっかげつ",), ("にかげつ",), ("さんかげつ",), ("よんかげつ",), ("ごかげつ",), ("ろっかげつ",), ("ななかげつ",), ("はっかげつ",), ("きゅうかげつ",), ("じゅっかげつ", "じっかげつ")),
+        MappingProxyType({}),
+    ),
+    "lesson_counter": (
+        "か",
+        "課",
+        (("なんか",), ("いっか",), ("にか",), ("さんか",), ("よんか",), ("ごか",), ("ろっか",), ("ななか",), ("はっか",), ("きゅうか",), ("じゅっか", "じっか")),
+        MappingProxyType({}),
+    ),
+    "times_counter": (
+        "かい",
+        "回",
+        (("なんかい",), ("いっかい",), ("にかい",), ("さんかい",), ("よんかい",), ("ごかい",), ("ろっかい",), ("ななかい",), ("はっかい",), ("きゅうかい",), ("じゅっかい", "じっかい")),
+        MappingProxyType({}),
+    ),
+    "small_items_counter": (
+        "こ",
+        "個",
+        (("なんこ",), ("いっこ",), ("にこ",), ("さんこ",), ("よんこ",), ("ごこ",), ("ろっこ",), ("ななこ",), ("はっこ",), ("きゅうこ",), ("じゅっこ", "じっこ")),
+        MappingProxyType({}),
+    ),
+    "floor_counter": (
+        "かい",
+        "階",
+        (("なんがい",), ("いっかい",), ("にかい",), ("さんがい",), ("よんかい",), ("ごかい",), ("ろっかい",), ("ななかい",), ("はっかい",), ("きゅうかい",), ("じゅっかい", "じっかい")),
+        MappingProxyType({}),
+    ),
+    "houses_counter": (
+        "けん",
+        "軒",
+        (("なんげん",), ("いっけん",), ("にけん",), ("さんげん",), ("よんけん",), ("ごけん",), ("ろっけん",), ("ななけん",), ("はっけん",), ("きゅうけん",), ("じゅっけん", "じっけん")),
+        MappingProxyType({}),
+    ),
+    "cents_counter": (
+        "セント",
+        "セント",
+        (("なんセント",), ("いっセント",), ("にセント",), ("さんセント",), ("よんセント",), ("ごセント",), ("ろくセント",), ("ななセント",), ("はっセント",), ("きゅうセント",), ("じゅっセント", "じっセント")),
+        MappingProxyType({}),
+    ),
+    "weeks_counter": (
+        "しゅうかん",
+        "週間",
+        (("なんしゅうかん",), ("いっしゅうかん",), ("にしゅうかん",), ("さんしゅうかん",), ("よんしゅうかん",), ("ごしゅうかん",), ("ろくしゅうかん",), ("ななしゅうかん",), ("はっしゅうかん",), ("きゅうしゅうかん",), ("じゅっしゅうかん", "じっしゅうかん")),
+        MappingProxyType({}),
+    ),
+    "books_counter": (
+        "さつ",
+        "冊",
+        (("なんさつ",), ("いっさつ",), ("にさつ",), ("さんさつ",), ("よんさつ",), ("ごさつ",), ("ろくさつ",), ("ななさつ",), ("はっさつ",), ("きゅうさつ",), ("じゅっさつ", "じっさつ")),
+        MappingProxyType({}),
+    ),
+    "years_of_age_counter": (
+        "さい",
+        "歳",
+        (("なんさい",), ("いっさい",), ("にさい",), ("さんさい",), ("よんさい",), ("ごさい",), ("ろくさい",), ("ななさい",), ("はっさい",), ("きゅうさい",), ("じゅっさい", "じっさい")),
+        MappingProxyType({20: ("はたち", "にじゅっさい", "にじっさい")}),
+    ),
+    "shoes_counter": (
+        "そく",
+        "足",
+        (("なんぞく",), ("いっそく",), ("にそく",), ("さんぞく",), ("よんそく",), ("ごそく",), ("ろくそく",), ("ななそく",), ("はっそく",), ("きゅうそく",), ("じゅっそく", "じっそく")),
+        MappingProxyType({}),
+    ),
+    "thousands_counter": (
+        "せん",
+        "千",
+        (("なんぜん",), ("いっせん",), ("にせん",), ("さんぜん",), ("よんせん",), ("ごせん",), ("ろくせん",), ("ななせん",), ("はっせん",), ("きゅうせん",), ("じゅっせん", "じっせん")),
+        MappingProxyType({}),
+    ),
+    "letters_counter": (
+        "つう",
+        "通",
+        (("なんつう",), ("いっつう",), ("につう",), ("さんつう",), ("よんつう",), ("ごつう",), ("ろくつう",), ("ななつう",), ("はっつう",), ("きゅうつう",), ("じゅっつう", "じっつう")),
+        MappingProxyType({}),
+    ),
+    "street_address_counter": (
+        "ちょうめ",
+        "丁目",
+        (("なんちょうめ",), ("いっちょうめ",), ("にちょうめ",), ("さんちょうめ",), ("よんちょうめ",), ("ごちょうめ",), ("ろくちょうめ",), ("ななちょうめ",), ("はっちょうめ",), ("きゅうちょうめ",), ("じゅっちょうめ", "じっちょうめ")),
+        MappingProxyType({}),
+    ),
+})
+
+digits = ("", "いち", "に", "さん", "よん", "ご", "ろく", "なな", "はち", "きゅう")
+tens = ("", "じゅう", "にじゅう", "さんじゅう", "よんじゅう", "ごじゅう", "ろくじゅう", "ななじゅう", "はちじゅう", "きゅうじゅう")
+hundreds = ("", "ひゃく", "にひゃく", "さんびゃく", "よんひゃく", "ごひゃく", "ろっぴゃく", "ななひゃく", "はっぴゃく", "きゅうひゃく")
+thousands = ("", "せん", "にせん", "さんぜん", "よんせん", "ごせん", "ろくせん", "ななせん", "はっせん", "きゅうせん")
@@ -1,4 +1,7 @@
-import copy  # For making deepcopies of dicts and stuff
+from collections import namedtuple
+from types import MappingProxyType
+
+from memo import LRUCache, memoize
 
 ######################################################################
 # Define some constants
@@ -40,6 +43,70 @@ voiced = {
 }
 
 
+#
+# The mora grid: every kana, by consonant row and vowel column. Built
+# once here so that working out a mora's row and column, or swapping
+# one of them out (e.g. ほ -> ぽ), is just a dict lookup.
+#
+# Katakana sit exactly 0x60 above their hiragana, so they go in the
+# same grid and morph the same way (ポ -> ボ), staying katakana.
+#
+vowel_order = ("a", "i", "u", "e", "o")
+
+hiragana_rows = {
+    "a": ("あ", "い", "う", "え", "お"),
+    "k": ("か", "き", "く", "け", "こ"),
+    "g": ("が", "ぎ", "ぐ", "げ", "ご"),
+    "s": ("さ", "し", "す", "せ", "そ"),
+    "z": ("ざ", "じ", "ず", "ぜ", "ぞ"),
+    "t": ("た", "ち", "つ", "て", "と"),
+    "d": ("だ", "ぢ", "づ", "で", "ど"),
+    "n": ("な", "に", "ぬ", "ね", "の"),
+    "h": ("は", "ひ", "ふ", "へ", "ほ"),
+    "b": ("ば", "び", "ぶ", "べ", "ぼ"),
+    "p": ("ぱ", "ぴ", "ぷ", "ぺ", "ぽ"),
+    "m": ("ま", "み", "む", "め", "も"),
+    "y": ("や", None, "ゆ", None, "よ"),
+    "r": ("ら", "り", "る", "れ", "ろ"),
+    "w": ("わ", None, None, None, "を"),
+}
+
+katakana_offset = ord("ア") - ord("あ")
+
+
+def to_katakana(kana):
+    return chr(ord(kana) + katakana_offset)
+
+
+# Where a mora is in the grid
+Mora = namedtuple("Mora", ["row", "column", "katakana"])
+
+# kana -> Mora, and back
+mora_grid = dict()
+_grid_kana = dict()
+for (row, moras) in hiragana_rows.items():
+    for (column, hiragana) in enumerate(moras):
+        if hiragana is None:
+            continue
+        for (katakana, kana) in ((False, hiragana), (True, to_katakana(hiragana))):
+            mora_grid[kana] = Mora(row, column, katakana)
+            _grid_kana[(row, column, katakana)] = kana
+
+# row -> {kana: that kana moved to `row`}, and the same for columns,
+# for every kana that has somewhere to go
+_row_morphs = {row: dict() for row in hiragana_rows}
+_column_morphs = {column: dict() for column in range(len(vowel_order))}
+for (kana, (row, column, katakana)) in mora_grid.items():
+    for new_row in hiragana_rows:
+        new_kana = _grid_kana.get((new_row, column, katakana))
+        if new_kana is not None:
+            _row_morphs[new_row][kana] = new_kana
+    for new_column in _column_morphs:
+        new_kana = _grid_kana.get((row, new_column, katakana))
+        if new_kana is not None:
+            _column_morphs[new_column][kana] = new_kana
+
+
 #
 # Sets of all of the phonemes by leading consonant
 #
@@ -81,50 +148,44 @@ _o = frozenset(
 )
 vowels = {_a, _i, _u, _e, _o}
 
-#
-# Standard euphonic change involving glottal stops
-#
-glottal_prefixes = {
-    1: "いっ",
-    6: "ろっ",  # Not used with [s], [ɕ], [z], [ʑ], [t], [tɕ],
-    8: "はっ",
-    10: "じゅっ",  # じっ is also standard but I just picked one
-}
+# The sets above, by grid row / column
+row_sets = dict(
+    zip(hiragana_rows, (a_, k_, g_, s_, z_, t_, d_, n_, h_, b_, p_, m_, y_, r_, w_))
+)
+column_sets = dict(enumerate((_a, _i, _u, _e, _o)))
+_set_rows = {cset: row for (row, cset) in row_sets.items()}
+_set_columns = {vset: column for (column, vset) in column_sets.items()}
 
 
 def get_vowel(mora):
     """
-    mora: a single hiragana character, like は
+    mora: a single kana, like は (or ハ)
 
     example call:
-        >>> get_cons_vowel_pair("は")
-        _a
+        >>> get_vowel("は") is _a
+        True
     """
-    # Unpack the list comprehension because it's just a 1-element list
-    (vset,) = [vset for vset in vowels if mora in vset]
-    return vset
+    return column_sets[mora_grid[mora].column]
 
 
 def get_cons(mora):
     """
-    mora: a single hiragana character, like は
+    mora: a single kana, like は (or ハ)
 
     example call:
-        >>> get_cons_vowel_pair("は")
-        h_
+        >>> get_cons("は") is h_
+        True
     """
-    # Unpack the list comprehension because it's just a 1-element list
-    (cset,) = [cset for cset in consonants if mora in cset]
-    return cset
+    return row_sets[mora_grid[mora].row]
 
 
 def get_cons_vowel_pair(mora):
     """
-    mora: a single hiragana character, like は
+    mora: a single kana, like は (or ハ)
 
     example call:
-        >>> get_cons_vowel_pair("は")
-        (h_, _a)
+        >>> get_cons_vowel_pair("は") == (h_, _a)
+        True
 
 
     Now, the actual input character can be obtaind by taking the
@@ -133,17 +194,38 @@ def get_cons_vowel_pair(mora):
     return (get_cons(mora), get_vowel(mora))
 
 
+def morph_row(mora, row):
+    """
+    `mora` moved to consonant row `row` (a key of hiragana_rows),
+    keeping its vowel and its script.
+
+    E.g.,
+    >>> morph_row("ほ", "p")
+    'ぽ'
+    >>> morph_row("ペ", "b")
+    'ベ'
+    """
+    return _row_morphs[row][mora]
+
+
+def morph_column(mora, column):
+    """
+    `mora` moved to vowel column `column` (0-4, for a i u e o),
+    keeping its consonant and its script.
+    """
+    return _column_morphs[column][mora]
+
+
 def morph_cons(mora, new_cons):
     """
     handles phonological morphing rules for swapping consonants out.
     This function will be defined
 
     E.g.,
-    >>> morph("ほ", p_)
-    "ぽ"
+    >>> morph_cons("ほ", p_)
+    'ぽ'
     """
-    (new_mora,) = new_cons & get_vowel(mora)
-    return new_mora
+    return _row_morphs[_set_rows[new_cons]][mora]
 
 
 def morph_vowel(mora, new_vowel):
@@ -153,52 +235,151 @@ def morph_vowel(mora, new_vowel):
     easy to write.
 
     E.g.,
-    >>> morph("ほ", _u)
-    "ふ"
+    >>> morph_vowel("ほ", _u)
+    'ふ'
     """
-    (new_mora,) = get_cons(mora) & new_vowel
-    return new_mora
+    return _column_morphs[_set_columns[new_vowel]][mora]
 
 
 ######################################################################
 # Common morphings
+_to_p = _row_morphs["p"]
+_to_b = _row_morphs["b"]
+_to_g = _row_morphs["g"]
+_to_z = _row_morphs["z"]
+
+
 def to_p(mora):
-    return morph_cons(mora, p_)
+    return _to_p[mora]
 
 
 def to_b(mora):
-    return morph_cons(mora, b_)
+    return _to_b[mora]
 
 
 def to_g(mora):
-    return morph_cons(mora, g_)
+    return _to_g[mora]
 
 
 def to_z(mora):
-    return morph_cons(mora, z_)
+    return _to_z[mora]
 
 
 ######################################################################
 # Ok now actually for the counter words
 #
-# Define the standard counter word numeral rule things
-standard_prefixes = {
-    1: "いち",
-    2: "に",
-    3: "さん",
-    4: "よん",
-    5: "ご",
-    6: "ろく",
-    7: "なな",
-    8: "はち",
-    9: "きゅう",
-    10: "じゅう",
-    "question": "なん",
-}
+# The counters themselves are written down in counter_specs.py, and
+# compiled ahead of time (`python counters.py`) into counter_table.py:
+# every counter's reading after なん and after 1-10, and the tables for
+# reading whole numbers. Importing this module just loads that, so
+# it's cheap, and worker processes forked off of one that has it share
+# the same (read-only) table.
+import counter_table
+
+from counter_table import digits, tens, hundreds, thousands
+
+# Readings of numbers and of counted quantities, keyed by (number) or
+# (counter, number). Shared, see reading_cache.stats().
+reading_cache = LRUCache(maxsize=65536)
+
+
+class Readings:
+    """
+    Every accepted reading of something, the preferred one first.
+    Acts like that one reading when printed, and like a set of all of
+    them for `in`.
+
+    Example:
+        >>> minutes = Readings(["はっぷん", "はちふん"])
+        >>> str(minutes)
+        'はっぷん'
+        >>> "はちふん" in minutes
+        True
+    """
+
+    __slots__ = ("readings", "_accepted")
+
+    def __init__(self, readings):
+        # Drop repeats, keeping the order
+        self.readings = tuple(dict.fromkeys(readings))
+        self._accepted = frozenset(self.readings)
+
+    @property
+    def preferred(self):
+        return self.readings[0]
+
+    def __contains__(self, reading):
+        return reading in self._accepted
+
+    def __iter__(self):
+        return iter(self.readings)
+
+    def __len__(self):
+        return len(self.readings)
+
+    def __getitem__(self, i):
+        return self.readings[i]
+
+    def __eq__(self, other):
+        if isinstance(other, Readings):
+            return self.readings == other.readings
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.readings)
+
+    def __str__(self):
+        return self.readings[0]
+
+    def __repr__(self):
+        return f"Readings({list(self.readings)!r})"
+
+
+def _morph(mora, rule):
+    # rule: a grid row like "p", or a function like to_p, or None
+    if rule is None:
+        return mora
+    if callable(rule):
+        return rule(mora)
+    return _row_morphs[rule][mora]
+
+
+def compile_readings(counter_word, prefixes=None, morph_rules=None):
+    """
+    Every reading of the counter after なん and after each of 1-10
+    (preferred first), as a tuple indexed by the number (なん at 0).
+    See counter_specs.py for what `prefixes` and `morph_rules` look
+    like; neither gets modified.
+
+    example call:
+        >>> compile_readings("ふん", {8: ("はっ", "はち")}, {8: "p"})[8]
+        ('はっぷん', 'はちふん')
+    """
+    from counter_specs import standard_prefixes
+
+    prefixes = {**standard_prefixes, **(prefixes or {})}
+    morph_rules = morph_rules or {}
+    (first_mora, rest_of_cw) = (counter_word[0], counter_word[1:])
+
+    def readings(i):
+        alternatives = prefixes[i]
+        if isinstance(alternatives, str):
+            alternatives = (alternatives,)
+        for prefix in alternatives:
+            # The counter only changes right after a っ or ん
+            mora = first_mora
+            if prefix[-1:] in ("っ", "ん"):
+                mora = _morph(first_mora, morph_rules.get(i))
+            yield prefix + mora + rest_of_cw
+
+    return tuple(tuple(readings(i)) for i in ["question", *range(1, 11)])
+
 
 # Class for each
 class Counter:
-    def __init__(self, counter_word, prefixes=dict(), morph_rules=dict()):
+    def __init__(
+        self, counter_word, prefixes=None, morph_rules=None, exceptions=None, kanji=None
+    ):
         """
         counter_word: The base counter word string.
             E.g., 「本」(sticks / pens / pencils / etc.)
@@ -215,203 +396,464 @@ class Counter:
             }
 
         morph_rules: a dictionary that gives any phonological morphing
-                 rules that might occur.
+                 rules that might occur, as rows of the mora grid (or
+                 functions like to_p).
             E.g., morph_rules = { # The rules for 「本」
-                1 : p_,
-                3 : b_,
-                6 : p_,
-                8 : p_,
-                10 : p_,
-                "question : b_,
+                1 : "p",
+                3 : "b",
+                6 : "p",
+                8 : "p",
+                10 : "p",
+                "question" : "b",
             }
+
+        exceptions: every reading (preferred first) of numbers that
+                 are just said differently, e.g. {1: ("ひとり",)}
+
+        kanji: how it's written after a kanji number, e.g. 「本」
+                 (default: same as counter_word)
+
+        The counters from the book are already compiled; see load().
         """
-        # Fill in all the empty entries and things
-        for i in range(1, 11):
-            if i not in prefixes.keys():
-                prefixes[i] = standard_prefixes[i]
-            if i not in morph_rules.keys():
-                morph_rules[i] = lambda x: x  # Give it the identity map
-
-        first_mora = counter_word[0]
-        rest_of_cw = counter_word[1:]
-        new_map = dict()
-
-        # Union all of the things we might possibly need to include as
-        # special cases in our map
-        nums = (
-            {i for i in range(1, 11)}
-            | {"question"}
-            | set(morph_rules.keys())
-            | set(prefixes.keys())
+        self.counter_word = counter_word
+        self.kanji = kanji if kanji is not None else counter_word
+        self.readings = compile_readings(counter_word, prefixes, morph_rules)
+        self.exceptions = MappingProxyType(
+            {n: tuple(readings) for (n, readings) in (exceptions or {}).items()}
         )
 
-        for i in range(1, 11):
-            # print(morph_rules[i](first_mora))
-            new_map[i] = prefixes[i] + morph_rules[i](first_mora) + rest_of_cw
-            # print(new_map[i])
-        self.counter_word = counter_word
-        self.qdict = new_map
-        return
+    @classmethod
+    def load(cls, name):
+        """
+        The counter called `name` in counter_specs.py, from the
+        compiled table.
+        """
+        counter = cls.__new__(cls)
+        (counter.counter_word, counter.kanji, counter.readings, counter.exceptions) = (
+            counter_table.counters[name]
+        )
+        return counter
+
+    @property
+    def qdict(self):
+        # What this used to be called: number -> Readings, for 1-10
+        return {i: self.quantity(i) for i in range(1, 11)}
+
+    def _after(self, like, stem):
+        # The counter as it comes out after `stem`, judging by how it
+        # comes out after the number `like` (whose readings start with
+        # `stem`), e.g. for 本 like=6, stem="ろ" gives ("っぽん",)
+        return tuple(reading[len(stem) :] for reading in self.readings[like])
 
+    @memoize(reading_cache)
     def quantity(self, n):
         """
         This is the function for getting the appropriate pronunciation
-        of a counter word. Does _not_ treat exceptional cases, such as
-        years of age, small items, and dates of the month. For those,
-        one should override the method manually.
+        of a counter word, as Readings: every accepted one, preferred
+        first. Numbers that are said differently with this counter
+        (ひとり) come from `exceptions`; other exceptional cases (dates
+        of the month, say) aren't handled.
+
+        Works for any n up to 9999兆. The counter sounds change based on
+        whatever comes right before it: the last digit if there is one
+        (にじゅう + さんぼん), otherwise the last word of the number,
+        which changes the counter the same way the digit with the same
+        ending does (ひゃく like ろく: ひゃっぽん, せん and まん like さん:
+        せんぼん). おく and ちょう leave it alone, like ご.
         """
         if n <= 0:
-            assert False  # Just threw this in beacuse I doubt
-            # we'll ever want to practice counting nonpositive
-            # quantities unless we're talking about my bank
-            # balance
+            # Just threw this in beacuse I doubt we'll ever want to
+            # practice counting nonpositive quantities unless we're
+            # talking about my bank balance
+            raise ValueError(f"can't count {n} of something")
+        exception = self.exceptions.get(n)
+        if exception is not None:
+            return Readings(exception)
+        if n <= 10:
+            return Readings(self.readings[n])
+
+        m = n % 10  # Trailing digit
+        if m:
+            (head, tails) = (number_reading(n - m), self.readings[m])
         else:
-            if n == 10:
-                # print(self.qdict[n])
-                return self.qdict[n]
+            head = number_reading(n)
+            if head.endswith("じゅう"):
+                # にじゅう + じゅっぽん -> にじゅっぽん
+                (head, tails) = (head[:-3], self.readings[10])
+            elif head.endswith("ゃく"):
+                # ひゃく, びゃく, ぴゃく
+                (head, tails) = (head[:-1], self._after(6, "ろ"))
+            elif head.endswith("ん"):
+                tails = self._after(3, "さん")
             else:
-                m = n % 10  # Only want trailing digit
-                # print(self.qdict[m])
-                return self.qdict[m]
+                tails = self._after(5, "ご")
+
+        return Readings(head + tail for tail in tails)
+
+    def written(self, n):
+        """
+        `n` of this counter in kanji, e.g. 二十三本
+        """
+        return kanji_number(n) + self.kanji
 
 
 ######################################################################
 # Below: all of the columns from page 380 of Genki.
 
 # Regular counters (no special rules)
-dollar_counter = Counter("ドル")
-yen_counter = Counter("えん")
-sheet_counter = Counter("まい")
-degree_counter = Counter("ど")
-ten_counter = Counter("じゅう")
-ten_thousand_counter = Counter("まん")
-
+dollar_counter = Counter.load("dollar_counter")
+yen_counter = Counter.load("yen_counter")
+sheet_counter = Counter.load("sheet_counter")
+degree_counter = Counter.load("degree_counter")
+ten_counter = Counter.load("ten_counter")
+ten_thousand_counter = Counter.load("ten_thousand_counter")
 
 # Months
-# --------------------------------------------------------------------
-month_prefixes = {
-    4: "し",
-    7: "しち",
-    9: "く",
-}
-month_counter = Counter("がつ", prefixes=month_prefixes)
-
+month_counter = Counter.load("month_counter")
 
 # Hours
-# --------------------------------------------------------------------
-hours_prefixes = {4: "よ", 7: "しち", 9: "く"}
-oclock_counter = Counter("じ", prefixes=hours_prefixes)
-hours_counter = Counter("じかん", prefixes=hours_prefixes)
+oclock_counter = Counter.load("oclock_counter")
+hours_counter = Counter.load("hours_counter")
 
 # Years, people
-# --------------------------------------------------------------------
-year_and_people_prefixes = {4: "よ"}
+year_counter = Counter.load("year_counter")
+years_counter = Counter.load("years_counter")
+naive_people_counter = Counter.load("naive_people_counter")
+people_counter = Counter.load("people_counter")  # ひとり, ふたり
 
-# For saying stuff like "it was the year 2003"
-year_counter = Counter("ねん", prefixes=year_and_people_prefixes)
 
-# For saying stuff like "that was 2003 years ago"
-years_counter = Counter("ねんかん", prefixes=year_and_people_prefixes)
+def people_quantifier(n):
+    return people_counter.quantity(n)
 
-# Counting people has some special casework.
-naive_people_counter = Counter("にん", prefixes=year_and_people_prefixes)
 
+# Minutes
+minute_counter = Counter.load("minute_counter")
+minutes_counter = Counter.load("minutes_counter")
 
-def people_quantifier(n):
-    if n == 1:
-        return "ひとり"
-    elif n == 2:
-        return "ふたり"
-    else:
-        return naive_people_counter.quantity(n)
+# Sticks, cups, animals, hundreds
+stick_counter = Counter.load("stick_counter")
+cup_counter = Counter.load("cup_counter")
+animal_counter = Counter.load("animal_counter")
+hundered_counter = Counter.load("hundered_counter")
 
+# Pages, pounds
+page_counter = Counter.load("page_counter")
+pound_counter = Counter.load("pound_counter")
 
-people_counter = Counter("にん", prefixes=year_and_people_prefixes)
-people_counter.quantity = people_quantifier
+# Months, lesson, times, small items
+months_counter = Counter.load("months_counter")
+lesson_counter = Counter.load("lesson_counter")
+times_counter = Counter.load("times_counter")
+small_items_counter = Counter.load("small_items_counter")
 
+# Floors, houses
+floor_counter = Counter.load("floor_counter")
+houses_counter = Counter.load("houses_counter")
 
-# Minutes
-# --------------------------------------------------------------------
-minute_prefixes = copy.deepcopy(glottal_prefixes)
-minute_prefixes[8] = "*" + minute_prefixes[8]  # * == optional
+# Cents, weeks, books
+cents_counter = Counter.load("cents_counter")
+weeks_counter = Counter.load("weeks_counter")
+books_counter = Counter.load("books_counter")
+years_of_age_counter = Counter.load("years_of_age_counter")
 
-# Construct dict for phonological morphing
-minute_morph_rules = dict()
-for i in [1, 3, 4, 6, 8, 10, "question"]:
-    minute_morph_rules[i] = to_p  # All of em change to p
+# Shoes, thousands
+shoes_counter = Counter.load("shoes_counter")
+thousands_counter = Counter.load("thousands_counter")
 
-# For things like "it's 10:23"
-minute_counter = Counter("ふん", prefixes=minute_prefixes, morph_rules=minute_morph_rules)
+# Letters, street addresses
+letters_counter = Counter.load("letters_counter")
+street_address_counter = Counter.load("street_address_counter")
 
-# For things like "That took 10 hours and 23 minuts"
-minutes_counter = Counter(
-    "ふんかん", prefixes=minute_prefixes, morph_rules=minute_morph_rules
-)
 
+######################################################################
+# Reading whole numbers
+#
+# Numbers are read in groups of four digits, each group followed by
+# its unit (万, 億, 兆), and each group read as thousands, hundreds,
+# tens and ones. Each of those is a tuple in counter_table indexed by
+# the digit ("" for 0). The sound changes for the thousands and
+# hundreds are the ones the せん and ひゃく counters make (さんびゃく,
+# はっせん, ...), except that a lone 1 isn't said (ひゃく, not
+# いっぴゃく).
 
-# Sticks, cups, animals, hundreds
-# --------------------------------------------------------------------
-stick_prefixes = glottal_prefixes
-stick_morph_rules = {1: to_p, 3: to_b, 6: to_p, 8: to_p, 10: to_p, "question": to_b}
-
-stick_counter = Counter("ほん", prefixes=stick_prefixes, morph_rules=stick_morph_rules)
-cup_counter = Counter("はい", prefixes=stick_prefixes, morph_rules=stick_morph_rules)
-animal_counter = Counter("ひき", prefixes=stick_prefixes, morph_rules=stick_morph_rules)
-hundered_counter = Counter(
-    "ひゃく", prefixes=stick_prefixes, morph_rules=stick_morph_rules
-)
+# Largest first
+group_units = ((10 ** 12, "ちょう"), (10 ** 8, "おく"), (10 ** 4, "まん"), (1, ""))
 
+# Endings that turn into a glottal stop before ちょう: いっちょう,
+# はっちょう, じゅっちょう (but ろくちょう)
+glottal_endings = {"いち": "いっ", "はち": "はっ", "じゅう": "じゅっ"}
 
-# Pages, pounds
-# --------------------------------------------------------------------
-page_prefixes = copy.deepcopy(glottal_prefixes)
-for i in [1, 6, 8]:
-    page_prefixes[i] = "*" + page_prefixes[i]
 
-page_counter = Counter("ページ", page_prefixes)
-pound_counter = Counter("ポンド", page_prefixes)  # same prefixes
+def group_reading(group):
+    """
+    Reading of a number from 1 to 9999.
 
+    example call:
+        >>> group_reading(3806)
+        'さんぜんはっぴゃくろく'
+    """
+    (thousand, rest) = divmod(group, 1000)
+    (hundred, rest) = divmod(rest, 100)
+    (ten, one) = divmod(rest, 10)
+    return thousands[thousand] + hundreds[hundred] + tens[ten] + digits[one]
 
-# Months, lesson, times, small items
-# --------------------------------------------------------------------
-month_prefixes = glottal_prefixes
-months_counter = Counter("かげつ", prefixes=month_prefixes)
-lesson_counter = Counter("か", prefixes=month_prefixes)
-times_counter = Counter("かい", prefixes=month_prefixes)
-small_items_counter = Counter("こ", prefixes=month_prefixes)
 
+@memoize(reading_cache)
+def number_reading(n):
+    """
+    Reading of a whole number, 1 <= n < 10**16.
 
-# Floors, houses
-# --------------------------------------------------------------------
-floor_prefixes = glottal_prefixes
-floor_morph_rules = {1: to_g, "question": to_g}
+    example call:
+        >>> number_reading(12_000_300)
+        'せんにひゃくまんさんびゃく'
+    """
+    if not 0 < n < 10 ** 16:
+        raise ValueError(f"can't read {n}")
+
+    reading = ""
+    for (size, unit) in group_units:
+        (group, n) = divmod(n, size)
+        if not group:
+            continue
+        word = group_reading(group)
+        if unit and group == 1000:
+            word = "いっせん"  # 1000万 is いっせんまん
+        if unit == "ちょう":
+            for (ending, glottal) in glottal_endings.items():
+                if word.endswith(ending):
+                    word = word[: -len(ending)] + glottal
+                    break
+        reading += word + unit
+    return reading
+
+
+# Written the same way, in kanji. A lone 1 isn't written before 十, 百
+# or 千 either, except for 一千 right before a unit (一千万).
+kanji_digits = ("", "一", "二", "三", "四", "五", "六", "七", "八", "九")
+kanji_places = ((1000, "千"), (100, "百"), (10, "十"))
+kanji_units = {"ちょう": "兆", "おく": "億", "まん": "万", "": ""}
+
+
+@memoize(reading_cache)
+def kanji_number(n):
+    """
+    A whole number written in kanji, 1 <= n < 10**16.
 
-floor_counter = Counter("かい", prefixes=floor_prefixes, morph_rules=floor_morph_rules)
-houses_counter = Counter("けん", prefixes=floor_prefixes, morph_rules=floor_morph_rules)
+    example call:
+        >>> kanji_number(12_000_300)
+        '千二百万三百'
+    """
+    if not 0 < n < 10 ** 16:
+        raise ValueError(f"can't write {n}")
+
+    written = ""
+    for (size, unit) in group_units:
+        (group, n) = divmod(n, size)
+        if not group:
+            continue
+        if unit and group == 1000:
+            written += "一"
+        for (place, place_kanji) in kanji_places:
+            (digit, group) = divmod(group, place)
+            if digit:
+                written += (kanji_digits[digit] if digit > 1 else "") + place_kanji
+        written += kanji_digits[group] + kanji_units[unit]
+    return written
 
-# Cents, weks, books
-# --------------------------------------------------------------------
-cent_prefixes = copy.deepcopy(glottal_prefixes)
-del cent_prefixes[6]  # No glottal stop on 6 for some reason
 
-cents_counter = Counter("セント", prefixes=cent_prefixes)
-weeks_counter = Counter("しゅうかん", prefixes=cent_prefixes)
-books_counter = Counter("さつ", prefixes=cent_prefixes)
-years_of_age_counter = Counter("さい", prefixes=cent_prefixes)
+######################################################################
+# Spot checks
+#
+# Readings worked out by hand (page 380, plus the irregular ones that
+# are easy to get wrong), not by anything above. counter_table.py only
+# ever agrees with the code that generated it, so these are what catch
+# the code itself going wrong. `python counters.py --check` goes
+# through them.
+
+known_numbers = {
+    11: "じゅういち",
+    300: "さんびゃく",
+    600: "ろっぴゃく",
+    800: "はっぴゃく",
+    3000: "さんぜん",
+    8000: "はっせん",
+    3806: "さんぜんはっぴゃくろく",
+    10_000_000: "いっせんまん",
+    12_000_300: "せんにひゃくまんさんびゃく",
+    10 ** 12: "いっちょう",
+    6 * 10 ** 12: "ろくちょう",
+    8 * 10 ** 12: "はっちょう",
+    10 ** 13: "じゅっちょう",
+}
 
+# (counter, n) -> every accepted reading, preferred first
+known_readings = {
+    ("stick_counter", 1): ("いっぽん",),
+    ("stick_counter", 3): ("さんぼん",),
+    ("stick_counter", 10): ("じゅっぽん", "じっぽん"),
+    ("stick_counter", 100): ("ひゃっぽん",),
+    ("stick_counter", 300): ("さんびゃっぽん",),
+    ("stick_counter", 1000): ("せんぼん",),
+    ("stick_counter", 10_000_000): ("いっせんまんぼん",),
+    ("stick_counter", 10 ** 12): ("いっちょうほん",),
+    ("cup_counter", 3): ("さんばい",),
+    ("animal_counter", 6): ("ろっぴき",),
+    ("minute_counter", 4): ("よんぷん",),
+    ("minute_counter", 8): ("はっぷん", "はちふん"),
+    ("minute_counter", 20): ("にじゅっぷん", "にじっぷん"),
+    ("minute_counter", 600): ("ろっぴゃっぷん",),
+    ("page_counter", 6): ("ろっページ", "ろくページ"),
+    ("small_items_counter", 100): ("ひゃっこ",),
+    ("floor_counter", 3): ("さんがい",),
+    ("houses_counter", 3): ("さんげん",),
+    ("books_counter", 1): ("いっさつ",),
+    ("books_counter", 6): ("ろくさつ",),
+    ("shoes_counter", 3): ("さんぞく",),
+    ("month_counter", 4): ("しがつ",),
+    ("month_counter", 9): ("くがつ",),
+    ("oclock_counter", 4): ("よじ",),
+    ("yen_counter", 4): ("よえん",),
+    ("people_counter", 1): ("ひとり",),
+    ("people_counter", 2): ("ふたり",),
+    ("people_counter", 4): ("よにん",),
+    ("people_counter", 21): ("にじゅういちにん",),
+    ("years_of_age_counter", 8): ("はっさい",),
+    ("years_of_age_counter", 20): ("はたち", "にじゅっさい", "にじっさい"),
+    ("years_of_age_counter", 21): ("にじゅういっさい",),
+}
 
-# Shoes, thousands
-# --------------------------------------------------------------------
-shoes_prefixes = cent_prefixes
-shoes_morph_rules = {3: to_z, "question": to_z}
 
-shoes_counter = Counter("そく", prefixes=shoes_prefixes, morph_rules=shoes_morph_rules)
-thousands_counter = Counter(
-    "せん", prefixes=shoes_prefixes, morph_rules=shoes_morph_rules
-)
+def check_known_readings():
+    """
+    Every spot check that comes out wrong, as (what, expected, got).
+    """
+    wrong = []
+    for (n, expected) in known_numbers.items():
+        got = number_reading(n)
+        if got != expected:
+            wrong += [(n, expected, got)]
+    for ((name, n), expected) in known_readings.items():
+        got = tuple(Counter.load(name).quantity(n))
+        if got != expected:
+            wrong += [(f"{name} {n}", expected, got)]
+    return wrong
 
-# Letters, street addresses
-# --------------------------------------------------------------------
-letters_prefixes = cent_prefixes
-letters_counter = Counter("つう", prefixes=letters_prefixes)
-street_address_counter = Counter("ちょうめ", prefixes=letters_prefixes)
+
+######################################################################
+# Building counter_table.py
+
+
+def compile_counter_table():
+    """
+    Everything counter_table.py holds, from counter_specs.py:
+    (counters, digits, tens, hundreds, thousands).
+    """
+    from counter_specs import counter_kanji, counter_specs, standard_prefixes
+
+    counters = {
+        name: (
+            word,
+            counter_kanji[name],
+            compile_readings(word, prefixes, morph_rules),
+            dict(exceptions),
+        )
+        for (name, (word, prefixes, morph_rules, exceptions)) in counter_specs.items()
+    }
+
+    def by_digit(name, one):
+        # The preferred reading of each
+        readings = counters[name][2]
+        return ("", one, *(readings[i][0] for i in range(2, 10)))
+
+    digit_readings = ("", *(standard_prefixes[i] for i in range(1, 10)))
+    return (
+        counters,
+        digit_readings,
+        by_digit("ten_counter", "じゅう"),
+        by_digit("hundered_counter", "ひゃく"),
+        by_digit("thousands_counter", "せん"),
+    )
+
+
+counter_table_header = """\
+# Generated by `python counters.py` from counter_specs.py. Don't edit
+# this by hand: change the specs and run that again.
+#
+# counters: name -> (counter word, kanji, readings, exceptions), where
+#           readings[i] is every reading (preferred first) of the
+#           counter after the number i (1-10), and readings[0] after
+#           なん
+# digits, tens, hundreds, thousands: the reading of that digit in that
+#           place, "" for 0
+#
+# Everything in here is immutable.
+# fmt: off
+from types import MappingProxyType
+
+"""
+
+
+def _literal(val):
+    # repr(), but with double quotes like the rest of the code
+    import json
+
+    if isinstance(val, str):
+        return json.dumps(val, ensure_ascii=False)
+    if isinstance(val, tuple):
+        trailing = "," if len(val) == 1 else ""
+        return "(" + ", ".join(_literal(v) for v in val) + trailing + ")"
+    if isinstance(val, dict):
+        items = (f"{_literal(k)}: {_literal(v)}" for (k, v) in val.items())
+        return "{" + ", ".join(items) + "}"
+    return repr(val)
+
+
+def render_counter_table():
+    (counters, *places) = compile_counter_table()
+    lines = ["counters = MappingProxyType({"]
+    for (name, (word, kanji, readings, exceptions)) in counters.items():
+        lines += [
+            f"    {_literal(name)}: (",
+            f"        {_literal(word)},",
+            f"        {_literal(kanji)},",
+            f"        {_literal(readings)},",
+            f"        MappingProxyType({_literal(exceptions)}),",
+            "    ),",
+        ]
+    lines += ["})", ""]
+    for (name, readings) in zip(("digits", "tens", "hundreds", "thousands"), places):
+        lines += [f"{name} = {_literal(readings)}"]
+    return counter_table_header + "\n".join(lines) + "\n"
+
+
+def write_counter_table(path=None):
+    if path is None:
+        path = counter_table.__file__
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_counter_table())
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(
+        description="Compile counter_specs.py into counter_table.py."
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="just check that it's up to date, and the spot checks",
+    )
+    args = parser.parse_args()
+    if args.check:
+        with open(counter_table.__file__, encoding="utf-8") as f:
+            if f.read() != render_counter_table():
+                sys.exit("counter_table.py is out of date, run python counters.py")
+        wrong = check_known_readings()
+        for (what, expected, got) in wrong:
+            print(f"{what}: expected {expected}, got {got}", file=sys.stderr)
+        if wrong:
+            sys.exit(f"{len(wrong)} spot checks failed")
+    else:
+        write_counter_table()
@@ -0,0 +1,90 @@
+# What every drill hands out, and how it gets written down.
+#
+# Each prompt is a DrillItem:
+#   drill:   which drill it came from, e.g. "plan_practice"
+#   prompt:  the text to show
+#   answers: every accepted response, as an AnswerLattice (see
+#            answers.py), the preferred one first
+#   meta:    what went into it (verb, tense, polarity, lesson, ...)
+#
+# Items are saved as JSON in one format, for both bulk.py's banks and
+# the cards in progress.db, so either can be read back with the same
+# code:
+#
+#   {"drill": ..., "prompt": ..., "answer": the preferred answer,
+#    "answers": [[alternatives], ...] (one list per segment),
+#    "meta": {...}}
+#
+# Enums in meta are written as {"enum": "Tense.PAST"} so they come
+# back as enums. JSON only has lists, so the tuples in meta (e.g.
+# short_form's "review") are written as lists, and every list in meta
+# comes back as a tuple; the drills never put lists in there.
+import json
+
+from collections import namedtuple
+from enum import Enum
+
+from japaneseverbconjugator.src.constants.EnumeratedTypes import (
+    VerbClass,
+    Tense,
+    Polarity,
+)
+
+from answers import AnswerLattice
+
+DrillItem = namedtuple("DrillItem", ["drill", "prompt", "answers", "meta"])
+
+# Enums that show up in DrillItem meta, by name
+enums = {cls.__name__: cls for cls in (VerbClass, Tense, Polarity)}
+
+
+def item_to_json(item):
+    """
+    A DrillItem as a JSON string.
+    """
+
+    def default(val):
+        if isinstance(val, Enum):
+            return {"enum": f"{type(val).__name__}.{val.name}"}
+        raise TypeError(f"can't store {val!r}")
+
+    return json.dumps(
+        {
+            "drill": item.drill,
+            "prompt": item.prompt,
+            "answer": item.answers.preferred,
+            "answers": [list(segment) for segment in item.answers.segments],
+            "meta": item.meta,
+        },
+        default=default,
+        ensure_ascii=False,
+    )
+
+
+def _tuples(val):
+    if isinstance(val, list):
+        return tuple(_tuples(v) for v in val)
+    return val
+
+
+def item_from_json(text):
+    """
+    The DrillItem that item_to_json() wrote.
+
+    Example:
+        >>> meta = {"tense": Tense.PAST, "review": ("みる", VerbClass.ICHIDAN)}
+        >>> item = DrillItem("short_form", "見る", AnswerLattice(["みない"]), meta)
+        >>> item_from_json(item_to_json(item)).meta == item.meta
+        True
+    """
+
+    def object_hook(obj):
+        if len(obj) == 1 and "enum" in obj:
+            (cls, name) = obj["enum"].split(".")
+            return enums[cls][name]
+        return obj
+
+    data = json.loads(text, object_hook=object_hook)
+    meta = {key: _tuples(val) for (key, val) in data["meta"].items()}
+    answers = AnswerLattice(data["answers"])
+    return DrillItem(data["drill"], data["prompt"], answers, meta)
@@ -0,0 +1,173 @@
+# Every prompt a drill can make, as a numbered list.
+#
+# Picking each part of a prompt at random (a slot, then a noun for it,
+# then a tense, ...) makes some combinations much more likely than
+# others: a slot with 3 nouns gets picked as often as one with 40, so
+# each of its nouns comes up 13 times as often. It also repeats itself
+# a lot within a session.
+#
+# So instead each drill describes its whole space of prompts as a sum
+# of products: a list of blocks, each one a few lists of choices where
+# any combination of one from each is a valid prompt. Numbering every
+# prompt is then just mixed-radix arithmetic, with one digit per list,
+# and we can:
+#
+#   - count the prompts (len(space))
+#   - make prompt number i without making any of the others (space[i])
+#   - go through all of them lazily, e.g. for exports (iter(space))
+#   - go through them in a random order without repeats, in O(1)
+#     memory, by shuffling the numbers with a keyed Feistel permutation
+#     instead of a list (space.shuffled(rng))
+#
+# The examples in the docstrings run: python -m doctest drill_space.py
+from bisect import bisect_right
+from collections import namedtuple
+
+# choices: a tuple of sequences, one choice from each makes a prompt
+# build:   called with one element from each of `choices`, makes the
+#          prompt
+Block = namedtuple("Block", ["choices", "build"])
+
+
+class DrillSpace:
+    """
+    All the prompts a drill can make.
+
+    Example:
+        >>> space = DrillSpace([Block((["a", "b"], [1, 2, 3]), lambda x, n: x * n)])
+        >>> len(space)
+        6
+        >>> space[4]
+        'bb'
+        >>> list(space)
+        ['a', 'aa', 'aaa', 'b', 'bb', 'bbb']
+        >>> import random
+        >>> sorted(space.shuffled(random.Random(1))) == sorted(space)
+        True
+    """
+
+    def __init__(self, blocks):
+        self.blocks = []
+        # Index where each block starts
+        self.starts = []
+        self.size = 0
+        for (choices, build) in blocks:
+            choices = tuple(tuple(choice) for choice in choices)
+            count = 1
+            for choice in choices:
+                count *= len(choice)
+            if count == 0:
+                continue
+            self.blocks += [(choices, build, count)]
+            self.starts += [self.size]
+            self.size += count
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+
+        block = bisect_right(self.starts, index) - 1
+        (choices, build, count) = self.blocks[block]
+        index -= self.starts[block]
+
+        # Mixed radix, last list changing fastest
+        picked = [None] * len(choices)
+        for i in range(len(choices) - 1, -1, -1):
+            (index, digit) = divmod(index, len(choices[i]))
+            picked[i] = choices[i][digit]
+        return build(*picked)
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self[index]
+
+    def shuffled(self, rng, forever=False):
+        """
+        Every prompt once each, in a random order drawn from `rng` (a
+        random.Random). With `forever`, start over with a new order
+        every time we run out.
+        """
+        while True:
+            permutation = FeistelPermutation(self.size, rng.getrandbits(64))
+            for index in permutation:
+                yield self[index]
+            if not forever or not self.size:
+                return
+
+
+# A few rounds of Feistel network with a cheap keyed mixing function is
+# plenty for shuffling prompts; it's not meant to be cryptographic.
+mask64 = (1 << 64) - 1
+
+
+def _mix(key, round_number, half):
+    # splitmix64's finalizer, seeded with the key and the round
+    z = (half + key + (round_number + 1) * 0x9E3779B97F4A7C15) & mask64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & mask64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & mask64
+    return z ^ (z >> 31)
+
+
+class FeistelPermutation:
+    """
+    A random-looking permutation of range(size), computed one element
+    at a time, so shuffling a range doesn't need a list of it.
+
+    The Feistel network permutes the numbers below the next power of 4
+    at or above `size`. Anything that lands outside range(size) just
+    gets run through again ("cycle walking") until it lands inside,
+    which takes at most a few tries on average since the bigger range
+    is under 4x `size`.
+
+    Example:
+        >>> sorted(FeistelPermutation(10, key=42)) == list(range(10))
+        True
+
+    It's a bijection for any size and key, including the sizes right
+    around a power of 4 and the tiny ones:
+
+        >>> all(
+        ...     sorted(FeistelPermutation(size, key)) == list(range(size))
+        ...     for size in (0, 1, 2, 3, 4, 5, 15, 16, 17, 63, 64, 65, 1000, 4097)
+        ...     for key in (0, 1, 2 ** 63, 0xDEADBEEF)
+        ... )
+        True
+        >>> list(FeistelPermutation(8, key=7)) == list(range(8))  # it does shuffle
+        False
+    """
+
+    rounds = 4
+
+    def __init__(self, size, key):
+        self.size = size
+        self.key = key & mask64
+        bits = max(2, (max(size - 1, 1)).bit_length())
+        self.half_bits = (bits + 1) // 2
+        self.half_mask = (1 << self.half_bits) - 1
+
+    def _permute(self, x):
+        (left, right) = (x >> self.half_bits, x & self.half_mask)
+        for round_number in range(self.rounds):
+            f = _mix(self.key, round_number, right) & self.half_mask
+            (left, right) = (right, left ^ f)
+        return (left << self.half_bits) | right
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        x = self._permute(index)
+        while x >= self.size:
+            x = self._permute(x)
+        return x
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self[index]
@@ -0,0 +1,186 @@
+# What goes into each drill, written down as plain data.
+#
+# A drill picks one of its slots (a verb, the kind of noun it takes, the
+# particle in between, and however the english prompt needs to phrase
+# it), then a noun for it, then a tense and so on. The slots used to be
+# tuple literals inside each drill function, rebuilt on every prompt,
+# with every word looked up again after it was picked.
+#
+# Now they live here, and genki_practice.drill_pool() compiles each
+# drill's slots once into ready-to-use records: the nouns with their
+# japanese spellings already attached, the verb's class, and all of its
+# conjugations. Making a prompt after that is just picking.
+#
+# Each slot is a dict:
+#
+#   nouns:    name of the noun list in nouns.py it takes
+#   verb:     the verb, as the drill writes it
+#   particle: between the noun and the verb (default "を")
+#
+# plus any english phrasings the drill's prompt needs. Order matters:
+# it's the order the drills pick from, so keep it stable.
+
+default_particle = "を"
+
+drill_specs = {
+    "single_ongoing_negative": [
+        {
+            "nouns": "do_able",
+            "verb": "する",
+            "did": "did",
+            "have_already_done": "have already done",
+            "did_not_do": "did not do",
+            "have_not_done": "have not done",
+        },
+        {
+            "nouns": "eat_able",
+            "verb": "食べる",
+            "did": "ate",
+            "have_already_done": "have already eaten",
+            "did_not_do": "didn't eat",
+            "have_not_done": "have not eaten",
+        },
+        {
+            "nouns": "drink_able",
+            "verb": "飲む",
+            "did": "drank",
+            "have_already_done": "have already drunk",
+            "did_not_do": "did not drink",
+            "have_not_done": "haven't drunk",
+        },
+        {
+            "nouns": "write_able",
+            "verb": "書く",
+            "did": "wrote",
+            "have_already_done": "already wrote",
+            "did_not_do": "did not write",
+            "have_not_done": "haven't written",
+        },
+        {
+            "nouns": "buy_able",
+            "verb": "買う",
+            "did": "bought",
+            "have_already_done": "already bought",
+            "did_not_do": "did not buy",
+            "have_not_done": "haven't bought",
+        },
+        {
+            "nouns": "places_absolute",
+            "verb": "行く",
+            "particle": "に",
+            "did": "went",
+            "have_already_done": "already went",
+            "did_not_do": "didn't go",
+            "have_not_done": "haven't gone",
+        },
+    ],
+    "plan_practice": [
+        {"nouns": "do_able", "verb": "する", "en_verb": "to do"},
+        {"nouns": "eat_able", "verb": "食べる", "en_verb": "to eat"},
+        {"nouns": "see_able", "verb": "見る", "en_verb": "to see"},
+        {"nouns": "read_able", "verb": "読む", "en_verb": "to read"},
+        {"nouns": "drink_able", "verb": "飲む", "en_verb": "to drink"},
+        {"nouns": "write_able", "verb": "書く", "en_verb": "to write"},
+        {"nouns": "buy_able", "verb": "買う", "en_verb": "to buy"},
+        {"nouns": "places_absolute", "verb": "行く", "particle": "に", "en_verb": "to go"},
+    ],
+    "tai_practice": [
+        {"nouns": "do_able", "verb": "する", "en_verb": "to do"},
+        {"nouns": "study_able", "verb": "勉強する", "en_verb": "to study"},
+        {"nouns": "become_able", "verb": "なる", "en_verb": "to become"},
+        {"nouns": "animals", "verb": "飼う", "en_verb": "to own"},
+        {"nouns": "eat_able", "verb": "食べる", "en_verb": "to eat"},
+        {"nouns": "see_able", "verb": "見る", "en_verb": "to see"},
+        {"nouns": "read_able", "verb": "読む", "en_verb": "to read"},
+        {"nouns": "drink_able", "verb": "飲む", "en_verb": "to drink"},
+        {"nouns": "write_able", "verb": "書く", "en_verb": "to write"},
+        {"nouns": "buy_able", "verb": "買う", "en_verb": "to buy"},
+        # {"nouns": "places_absolute", "verb": "行く", "en_verb": "to go"},
+    ],
+    "obligation_practice": [
+        {"nouns": "do_able", "verb": "する", "en_verb": "to do"},
+        {"nouns": "study_able", "verb": "勉強する", "en_verb": "to study"},
+        {"nouns": "become_able", "verb": "なる", "en_verb": "to become"},
+        # {"nouns": "animals", "verb": "飼う", "en_verb": "to own"},
+        {"nouns": "eat_able", "verb": "食べる", "en_verb": "to eat"},
+        {"nouns": "see_able", "verb": "見る", "en_verb": "to see"},
+        {"nouns": "read_able", "verb": "読む", "en_verb": "to read"},
+        {"nouns": "drink_able", "verb": "飲む", "en_verb": "to drink"},
+        {"nouns": "write_able", "verb": "書く", "en_verb": "to write"},
+        {"nouns": "buy_able", "verb": "買う", "en_verb": "to buy"},
+        {"nouns": "places_absolute", "verb": "行く", "particle": "に", "en_verb": "to go"},
+    ],
+}
+
+# Time words, by name -> the noun lists they're drawn from
+time_specs = {
+    "past": ["times_past"],
+    "future": ["times_future"],
+    "absolute": ["times_absolute"],
+    "any": ["times_past", "times_future", "times_absolute"],
+}
+
+# Time words that take a particle after them, by noun list
+time_particles = {"times_absolute": "に"}
+
+# What the counting drill counts. Each one is
+#
+#   counter: name of the counter in counters.py
+#   nouns:   name of the noun list in nouns.py it counts
+#   unit:    what the english prompt calls one of them, to give away
+#            which counter it wants
+#   numbers: how many of them it goes up to, counting from 1
+#   prices:  (optional) prices in yen to ask for, as in 七十円切手
+counting_specs = [
+    {
+        "counter": "sheet_counter",
+        "nouns": "flat_things",
+        "unit": "sheets",
+        "numbers": 100,
+    },
+    {
+        "counter": "sheet_counter",
+        "nouns": "priced_flat_things",
+        "unit": "sheets",
+        "numbers": 20,
+        "prices": [10, 20, 50, 63, 70, 84, 90, 100, 110, 120, 140, 500, 1000],
+    },
+    {
+        "counter": "stick_counter",
+        "nouns": "long_things",
+        "unit": "long things",
+        "numbers": 100,
+    },
+    {
+        "counter": "stick_counter",
+        "nouns": "drink_able",
+        "unit": "bottles",
+        "numbers": 100,
+    },
+    {"counter": "cup_counter", "nouns": "cup_able", "unit": "cups", "numbers": 100},
+    {
+        "counter": "books_counter",
+        "nouns": "bound_things",
+        "unit": "volumes",
+        "numbers": 100,
+    },
+    {
+        "counter": "small_items_counter",
+        "nouns": "small_things",
+        "unit": "pieces",
+        "numbers": 100,
+    },
+    {
+        "counter": "animal_counter",
+        "nouns": "small_animals",
+        "unit": "animals",
+        "numbers": 100,
+    },
+    {"counter": "people_counter", "nouns": "people", "unit": "people", "numbers": 100},
+    {
+        "counter": "shoes_counter",
+        "nouns": "pairs_of_shoes",
+        "unit": "pairs",
+        "numbers": 100,
+    },
+]
@@ -1,120 +1,199 @@
-# For working with the genki csv
-import pandas as pd
+# Nothing in here touches the workbook or builds the verb conjugator
+# at import time. Both happen on first use (see _vocab() and _jvfg()
+# below), so tools that only want e.g. verb_to_verbing or the noun
+# lists don't pay for pandas and the xlsx snapshot.
 import nouns
 
+from collections import deque, namedtuple
+from types import SimpleNamespace
+
 # Pick random nouns, verbs, etc.
-from random import choice as pick
+import random
 
-# Automatic verb conjugation, sort of
-from japaneseverbconjugator.src import JapaneseVerbFormGenerator
-from japaneseverbconjugator.src.constants.EnumeratedTypes import (
-    VerbClass,
-    Tense,
-    Polarity,
-)
+from random import choice as pick
 
-jvfg = JapaneseVerbFormGenerator.JapaneseVerbFormGenerator()
+# These are just enums, so they're cheap to import up front
+from japaneseverbconjugator.src.constants.EnumeratedTypes import Tense, Polarity
 
 # Import the noun and adjective conjugator
 from NounAndAdjectiveConjugator import *
 
+from memo import LRUCache, memoize
+
+import instrument
+
+from answers import AnswerLattice
+
+from drill_items import DrillItem
+
+from scheduler import ReviewScheduler
+
+from drill_space import Block, DrillSpace
+
+# Module attributes that get built lazily by __getattr__ below
+_lazy_vocab_attrs = ("df", "store", "index", "verb_df", "verb_list")
+
+_loaded_vocab = None
+_loaded_jvfg = None
+
+
+def _vocab():
+    """
+    Load the vocab (lessons 1-12) the first time somebody needs it.
+
+    The cleaned-up table comes out of the binary snapshot in vocab.py,
+    so we only pay for parsing the xlsx when the workbook actually
+    changes.
+    """
+    global _loaded_vocab
+    if _loaded_vocab is None:
+        from vocab import VocabIndex, filter_by, load_practice_store, load_practice_vocab
+
+        df = load_practice_vocab()
+
+        # One record per distinct word, with stable ids
+        store = load_practice_store()
+
+        # Define an easy-access list of verbs
+        verb_df = filter_by(df, "pos", "verb")
+        _loaded_vocab = SimpleNamespace(
+            df=df,
+            store=store,
+            # Dict lookups for japanese(), verb_class() and friends below
+            index=VocabIndex(store),
+            verb_df=verb_df,
+            verb_list=[entry.english for entry in store if "verb" in entry.pos],
+        )
+    return _loaded_vocab
+
+
+def _jvfg():
+    """
+    Automatic verb conjugation, sort of. Built on first use.
+    """
+    global _loaded_jvfg
+    if _loaded_jvfg is None:
+        from japaneseverbconjugator.src import JapaneseVerbFormGenerator
+
+        _loaded_jvfg = JapaneseVerbFormGenerator.JapaneseVerbFormGenerator()
+    return _loaded_jvfg
+
+
+def __getattr__(name):
+    """
+    Keep `genki_practice.df`, `.verb_list`, `.jvfg` and so on working
+    for code that reaches in from outside, without loading anything
+    until they're actually asked for.
+    """
+    if name in _lazy_vocab_attrs:
+        return getattr(_vocab(), name)
+    if name == "jvfg":
+        return _jvfg()
+    if name == "filter_by":
+        from vocab import filter_by
+
+        return filter_by
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # ================================================================== #
 # The provided macros are too verbose for me
 #
-# Requires: verb, verb_class, tense, polarity
-polite_form = jvfg.generate_polite_form
+# Every verb in the workbook is conjugated ahead of time when the vocab
+# snapshot gets built (see conjugations.py), so these are normally just
+# a dict lookup. Anything that isn't in the table (verbs from outside
+# the workbook, mostly) still goes through the generator.
+_loaded_conjugations = None
 
-# Requires: verb, verb_class, tense, polarity
-plain_form = jvfg.generate_plain_form
 
-# Requires: verb, verb_class
-te_form = jvfg.generate_te_form
+def _conjugations():
+    global _loaded_conjugations
+    if _loaded_conjugations is None:
+        from vocab import load_conjugations
 
-# ------------------------------------------------------------------ #
+        _loaded_conjugations = load_conjugations()
+    return _loaded_conjugations
 
 
-# Row 9 in the column name row
-df = pd.read_excel("Genki_2.xlsx", header=9)
+# Verbs that aren't in the table go through the generator, memoized
+# here. Shared by all threads; see cache_stats() and clear_caches().
+verb_form_cache = LRUCache(maxsize=4096)
 
-# The columns have names written in japanese. I'm not going to mutate
-# the csv in any way so we'll just rename the columns of the dataframe
-# as we instantiate it.
-#
-# "pos" is for "part of speech"
-c = {"単語": "word", "漢字表記": "kanji", "品詞": "pos", "英訳": "english", "課数": "lesson"}
-df.rename(columns=c, inplace=True)
 
+@memoize(verb_form_cache)
+def _generate_form(form, verb, verb_class, tense, polarity):
+    if form == "te":
+        return _jvfg().generate_te_form(verb, verb_class)
+    elif form == "plain":
+        return _jvfg().generate_plain_form(verb, verb_class, tense, polarity)
+    else:
+        return _jvfg().generate_polite_form(verb, verb_class, tense, polarity)
 
-# Replace the "parts of speech" entries with easier labels.
-#
-# Yes, they're longer (for the most part), but it's just easier to
-# read in-place so whatever.
-parts_of_speech = {
-    "n.": "noun",  # noun
-    "い-adj.": "i-adj",  # i adjective
-    "な-adj.": "na-adj",  # na adjective
-    "u-v.": "u-verb",  # u verb
-    "ru-v.": "ru-verb",  # ru verb
-    "irr-v.": "irr-verb",  # irregular verb
-    "adv.": "adv",  # adverb --- abbreviate so can filter by "verb" in
-    "part.": "particle",  # particle
-    "pre.": "pre-nom",  # pre-nominal expression, e.g. 「その___」
-    "suf.": "nf-suffix",  # (noun-forming) suffix, e.g. 「___円」or「___か月」
-    "exp.": "expression",  # expression
-}
 
-# Replace the columns
-df["pos"].replace(parts_of_speech, inplace=True)
+# Requires: verb, verb_class, tense, polarity
+def polite_form(verb, verb_class, tense, polarity):
+    key = (verb, verb_class, "polite", tense, polarity)
+    conjugated = _conjugations().get(key)
+    if conjugated is None:
+        conjugated = _generate_form("polite", verb, verb_class, tense, polarity)
+        if instrument.enabled:
+            instrument.count("conjugation.generated")
+    if instrument.enabled:
+        instrument.count("conjugation.polite")
+    return conjugated
 
 
-def filter_by(df, col, val):
-    """
-    df: the genki csv dataframe
-    col: the column we want to filter in
-    val: the value we want to filter for
+# Requires: verb, verb_class, tense, polarity
+def plain_form(verb, verb_class, tense, polarity):
+    key = (verb, verb_class, "plain", tense, polarity)
+    conjugated = _conjugations().get(key)
+    if conjugated is None:
+        conjugated = _generate_form("plain", verb, verb_class, tense, polarity)
+        if instrument.enabled:
+            instrument.count("conjugation.generated")
+    if instrument.enabled:
+        instrument.count("conjugation.plain")
+    return conjugated
 
-    Example:
-        filter_by(df, "lesson", "L15")
 
-    We have to do this because pandas built-in filtering scheme
-    doesn't allow us to filter by things like `val in df[col]`, so we
-    can't do things like `"L11" in df[col]` because the columns are
-    formatted like "会L11-II" or something.
+# Requires: verb, verb_class
+def te_form(verb, verb_class):
+    conjugated = _conjugations().get((verb, verb_class, "te", None, None))
+    if conjugated is None:
+        conjugated = _generate_form("te", verb, verb_class, None, None)
+        if instrument.enabled:
+            instrument.count("conjugation.generated")
+    if instrument.enabled:
+        instrument.count("conjugation.te")
+    return conjugated
+
+
+def cache_stats():
     """
-    # If we passed in a list of values to filter by, we check for
-    # where _any_ of them are valid
-    if type(val) == list:
-        return df[
-            [any([val_entry in df_entry for val_entry in val]) for df_entry in df[col]]
-        ]
+    hit/miss/eviction counts for the conjugation caches
+    """
+    return {
+        "verb_forms": verb_form_cache.stats(),
+        "adjective_forms": adjective_form_cache.stats(),
+    }
 
-    # Create a simple bool array to index into the dataframe with
-    return df[[val in entry for entry in df[col]]]
 
+def clear_caches():
+    verb_form_cache.clear()
+    adjective_form_cache.clear()
 
-# Get vocab for lessons 3-12. We have to get vocab for lessons 1 and 2
-# separately because the "in" part messes up by including things from
-# L11, L12, L13, ... because they all contain L1.
-#
-# I guess I should have just hard-coded this from the beginning but
-# w/e.
-our_lessons = [f"L{i}" for i in range(3, 13)]
-df = filter_by(df, "lesson", our_lessons)
-l1df = df[[("会L1" == entry) or ("L1," in entry) for entry in df["lesson"]]]
-l2df = df[[("会L2" == entry) or ("L2," in entry) for entry in df["lesson"]]]
-df = pd.concat([df, l1df, l2df])
 
-# Define an easy-access list of verbs
-verb_df = filter_by(df, "pos", "verb")
-verb_list = [entry for entry in verb_df["english"]]
+# ------------------------------------------------------------------ #
 
 
 def write_nouns():
     """
     write nouns to a text file so that we can do stuff with them
     """
+    from vocab import filter_by
+
     text_file = open("Nouns.txt", "w")
-    n_df = filter_by(df, "pos", "noun")
+    n_df = filter_by(_vocab().df, "pos", "noun")
     noun_string = ""
     for noun in n_df["english"].values:
         noun_string += f'"{noun}",\n'
@@ -144,36 +223,18 @@ def verb_to_verbing(verb):
 
 
 def verb_class(en_verb):
-    verb = df[[en_verb == entry for entry in df["english"]]]
-    verb_class = verb["pos"].values[0]
-    if verb_class == "ru-verb":
-        return VerbClass.ICHIDAN
-    elif verb_class == "u-verb":
-        return VerbClass.GODAN
-    elif verb_class == "irr-verb":
-        return VerbClass.IRREGULAR
-    else:
-        assert False  # Haha what
+    if instrument.enabled:
+        instrument.count("lookup.verb_class")
+    return _vocab().index.verb_class(en_verb)
 
 
 def j_verb_class(j_verb):
     """
     same as above but the input is japanese
     """
-    verb = df[[j_verb == entry for entry in df["word"]]]
-    if len(verb) == 0:
-        verb = df[[j_verb == entry for entry in df["kanji"]]]
-
-    verb_class = verb["pos"].values[0]
-
-    if verb_class == "ru-verb":
-        return VerbClass.ICHIDAN
-    elif verb_class == "u-verb":
-        return VerbClass.GODAN
-    elif verb_class == "irr-verb":
-        return VerbClass.IRREGULAR
-    else:
-        assert False  # Haha what
+    if instrument.enabled:
+        instrument.count("lookup.j_verb_class")
+    return _vocab().index.j_verb_class(j_verb)
 
 
 def japanese(english):
@@ -181,17 +242,51 @@ def japanese(english):
     return the japanese word corresponding to the `english` entry in
     our dataframe. Must be the exact wording given in the textbook.
     """
-    row = df[[english == entry for entry in df["english"]]]
-    return row["word"].values[0]
+    if instrument.enabled:
+        instrument.count("lookup.japanese")
+    return _vocab().index.japanese(english)
 
 
 def english(japanese):
     """
-    return the japanese word corresponding to the `english` entry in
+    return the english entry corresponding to the `japanese` word in
     our dataframe. Must be the exact wording given in the textbook.
     """
-    row = df[[japanese == entry for entry in df["word"]]]
-    return row["word"].values[0]
+    if instrument.enabled:
+        instrument.count("lookup.english")
+    return _vocab().index.english(japanese)
+
+
+def spellings(english):
+    """
+    every way the `english` entry can be written, kana first
+    """
+    if instrument.enabled:
+        instrument.count("lookup.spellings")
+    return _vocab().index.spellings(english)
+
+
+def j_spellings(j_word):
+    """
+    same as above but the input is japanese, and comes first
+    """
+    if instrument.enabled:
+        instrument.count("lookup.j_spellings")
+    return _vocab().index.j_spellings(j_word)
+
+
+def every_spelling(conjugate, spellings, *args):
+    """
+    `conjugate` (e.g. plain_form) for each of `spellings`, so either
+    the kana or the kanji gets accepted. Any spelling the generator
+    can't handle (it gives back None for 来る) is left out.
+    """
+    forms = []
+    for spelling in spellings:
+        form = conjugate(spelling, *args)
+        if form is not None and form not in forms:
+            forms += [form]
+    return forms
 
 
 # ================================================================== #
@@ -204,34 +299,339 @@ def english(japanese):
 #                                                                    #
 # ------------------------------------------------------------------ #
 
+def _picker(rng):
+    """
+    `pick`, but drawing from `rng` (a random.Random) if there is one,
+    so bulk generation can give every worker its own seeded stream.
+    """
+    choose = rng.choice if rng is not None else random.choice
+    if instrument.enabled:
+        return instrument.counted("pick", choose)
+    return choose
+
+
+# Which verbs a drill is allowed to draw. Rather than picking from the
+# whole verb list and re-rolling until we get one that works, each
+# drill names the rules its verbs have to pass, and the verbs that pass
+# all of them get looked up once and kept in a pool. Drawing a verb is
+# then just one pick.
+#
+# The rules take a VerbCandidate, so anything we already know about the
+# verb (class, kana) is there to test without more lookups.
+VerbCandidate = namedtuple("VerbCandidate", ["english", "kana", "vclass"])
+
+
+def no_placeholder_object(verb):
+    # e.g. "to open (something)", which doesn't read right in a prompt
+    return "(something)" not in verb.english
+
+
+def has_a_person_subject(verb):
+    # don't want verbs like "it rains"
+    return verb.english[0:2] != "it"
+
+
+def is_conjugatable(verb):
+    # The generator can't do a few of them, e.g. "かける（めがねを）",
+    # and those never make it into the conjugation table
+    return (verb.kana, verb.vclass, "te", None, None) in _conjugations()
+
+
+# Drill name -> the rules its verbs have to pass
+verb_rules = {
+    "qualify_noun": (no_placeholder_object, has_a_person_subject, is_conjugatable),
+    "short_form": (no_placeholder_object, has_a_person_subject, is_conjugatable),
+}
+
+_verb_pools = dict()
+
+
+def verb_pool(drill):
+    """
+    Every verb `drill` can use, as a tuple of VerbCandidates. Built
+    the first time it's asked for.
+    """
+    pool = _verb_pools.get(drill)
+    if pool is None:
+        with instrument.timed("build.verb_pool"):
+            rules = verb_rules[drill]
+            index = _vocab().index
+            candidates = (
+                VerbCandidate(verb, index.japanese(verb), index.verb_class(verb))
+                for verb in _vocab().verb_list
+            )
+            pool = tuple(
+                verb for verb in candidates if all(rule(verb) for rule in rules)
+            )
+        _verb_pools[drill] = pool
+    return pool
+
+
+# The other drills are built from slots: a verb, the nouns it takes,
+# the particle in between, and the english to phrase it with. Those are
+# written down in drill_specs.py, and get compiled here (once, the
+# first time a drill asks) into records with every lookup already done,
+# so a prompt is just picks from these.
+#
+# A Word is a noun or time word with all its japanese spellings (kana
+# first), and the particle that goes after it if that depends on the
+# word (に after the absolute times).
+Word = namedtuple("Word", ["english", "japanese", "particle"])
+
+# A Slot has the verb as the drill writes it, its class, every form of
+# it as (form, tense, polarity) -> (kana, kanji, ...) conjugations, the
+# particle, the nouns as Words, and the rest of the spec (the english
+# phrasings) as a dict.
+Slot = namedtuple("Slot", ["verb", "vclass", "forms", "particle", "nouns", "english"])
+
+
+def _verb_forms(verb, vclass):
+    j_verbs = j_spellings(verb)
+    forms = {("te", None, None): tuple(every_spelling(te_form, j_verbs, vclass))}
+    for (form, conjugate) in (("plain", plain_form), ("polite", polite_form)):
+        for tense in Tense:
+            for polarity in Polarity:
+                forms[(form, tense, polarity)] = tuple(
+                    every_spelling(conjugate, j_verbs, vclass, tense, polarity)
+                )
+    return forms
+
+
+_drill_pools = dict()
+_time_pools = dict()
+
+
+def drill_pool(drill):
+    """
+    The compiled slots for `drill`, in spec order.
+    """
+    pool = _drill_pools.get(drill)
+    if pool is None:
+        with instrument.timed("build.drill_pool"):
+            from drill_specs import default_particle, drill_specs
+
+            pool = []
+            for spec in drill_specs[drill]:
+                english = {
+                    key: val
+                    for (key, val) in spec.items()
+                    if key not in ("nouns", "verb", "particle")
+                }
+                verb = spec["verb"]
+                vclass = j_verb_class(verb)
+                noun_words = tuple(
+                    Word(noun, spellings(noun), "")
+                    for noun in getattr(nouns, spec["nouns"])
+                )
+                pool += [
+                    Slot(
+                        verb,
+                        vclass,
+                        _verb_forms(verb, vclass),
+                        spec.get("particle", default_particle),
+                        noun_words,
+                        english,
+                    )
+                ]
+        pool = _drill_pools[drill] = tuple(pool)
+    return pool
+
+
+def time_pool(name):
+    """
+    The time words called `name` in drill_specs.time_specs, as Words.
+    """
+    pool = _time_pools.get(name)
+    if pool is None:
+        from drill_specs import time_particles, time_specs
+
+        pool = []
+        for list_name in time_specs[name]:
+            for time in getattr(nouns, list_name):
+                particle = ""
+                for (particle_list, time_particle) in time_particles.items():
+                    if time in getattr(nouns, particle_list):
+                        particle = time_particle
+                pool += [Word(time, spellings(time), particle)]
+        pool = _time_pools[name] = tuple(pool)
+    return pool
+
+
+# Every drill is split in two: a generator that just makes prompts
+# (`<drill>_items()`, no input() or print() anywhere, so they can be
+# used to dump worksheets / decks in bulk), and the interactive version
+# on top of it that asks one of them.
+#
+# Each prompt is a DrillItem (see drill_items.py): which drill it came
+# from, the prompt, its AnswerLattice and the meta of what went into
+# it.
+#
+# The generators all take an optional `rng` (a random.Random) to draw
+# from instead of the global random module; see bulk.py.
+
+
+def ask(item):
+    """
+    Quiz on a single DrillItem. Returns True/False for whether the
+    answer was accepted, or None for the drills that just show a sample
+    response instead of grading.
+    """
+    try:
+        user_input = input(item.prompt + "\n")
+    except UnicodeDecodeError:
+        user_input = None
+
+    if not item.meta.get("graded", True):
+        print(f"Sample response is: {item.answers.preferred}\n")
+        return None
+
+    match = item.answers.match(user_input)
+    if match.accepted:
+        print("correct\n")
+        return True
+
+    if match.prefix:
+        print(f"You had it right up to {user_input[:match.prefix]}")
+    print(f"{item.answers.preferred} is the expected answer")
+    if len(item.answers) > 1:
+        # Too many to list out, so show them all in one line
+        print(f"Accepted: {item.answers}")
+    print()
+    return False
+
+
 # Lesson 5
-def practice_counting():
+#
+# The counting drill is built the same way, from drill_specs.
+# counting_specs: each counter gets compiled once into the nouns it
+# counts (as Words) and every number it goes up to, already written in
+# kanji and read out every accepted way. Those come from counters.py's
+# compiled table, so after the first prompt nothing is worked out
+# again.
+CountingSlot = namedtuple(
+    "CountingSlot", ["counter", "nouns", "numbers", "prices", "unit"]
+)
+
+# A number of something: n, how it's written (二枚), and every accepted
+# reading of it, preferred first
+Count = namedtuple("Count", ["n", "kanji", "readings"])
+
+_counting_pool = None
+
+
+def _counts(counter, numbers):
+    return tuple(
+        Count(n, counter.written(n), tuple(counter.quantity(n))) for n in numbers
+    )
+
+
+def counting_pool():
     """
-    Generates practice phrases like
-    七十円切手をにまいお願いします。
+    The compiled counting_specs, as CountingSlots, in spec order.
+    """
+    global _counting_pool
+    if _counting_pool is None:
+        with instrument.timed("build.counting_pool"):
+            import counters
+            from drill_specs import counting_specs
+
+            pool = []
+            for spec in counting_specs:
+                counter = getattr(counters, spec["counter"])
+                noun_words = tuple(
+                    Word(noun, spellings(noun), "")
+                    for noun in getattr(nouns, spec["nouns"])
+                )
+                prices = ()
+                if "prices" in spec:
+                    prices = _counts(counters.yen_counter, spec["prices"])
+                pool += [
+                    CountingSlot(
+                        spec["counter"],
+                        noun_words,
+                        _counts(counter, range(1, spec["numbers"] + 1)),
+                        prices,
+                        spec["unit"],
+                    )
+                ]
+        _counting_pool = tuple(pool)
+    return _counting_pool
+
+
+def counting_item(slot, noun, count, price=None):
     """
+    One counting prompt. `price` is a Count of yen, for the slots that
+    have prices.
+    """
+    en_price = f"{price.n}-yen " if price else ""
+    english_prompt = (
+        f'Translate "{en_price}{noun.english} × {count.n} ({slot.unit}), please"'
+    )
 
-    return
+    # Written out, kanji numbers and all
+    j_price = price.kanji if price else ""
+    sentence = f"{j_price}{noun.japanese[-1]}を{count.kanji}お願いします"
 
+    response = [
+        noun.japanese,
+        "を",
+        (*count.readings, count.kanji),
+        ("おねがいします", "お願いします"),
+    ]
+    if price:
+        response = [(*price.readings, price.kanji)] + response
 
-def qualify_noun():
+    meta = {
+        "lesson": 5,
+        "counter": slot.counter,
+        "n": count.n,
+        "noun": noun.english,
+        "price": price.n if price else None,
+        "kanji": sentence,
+    }
+    return DrillItem("counting", english_prompt, AnswerLattice(response), meta)
+
+
+@instrument.timed_items("generate.counting")
+def counting_items(rng=None):
+    pick = _picker(rng)
+
+    slots = counting_pool()
+
+    while True:
+        slot = pick(slots)
+
+        noun = pick(slot.nouns)
+
+        count = pick(slot.numbers)
+
+        price = pick(slot.prices) if slot.prices else None
+
+        yield counting_item(slot, noun, count, price)
+
+
+def practice_counting():
     """
-    Qualifying nouns with verbs and adjectives (see: L9, pg. 213-214)
+    Generates practice phrases like
+    七十円切手を二枚お願いします。
     """
-    # The method by which we'll indicate who is the subject of our
-    # sentence. These crrespond to the 4 examples given on page 214.
-    options = ["place", "frequency", "verb", "time"]
-    option = pick(options)
+    ask(next(counting_items()))
+
+
+# The method by which we'll indicate who is the subject of our
+# sentence. These crrespond to the 4 examples given on page 214.
+qualify_options = ["place", "frequency", "verb", "time"]
+qualify_polarities = [(Polarity.POSITIVE, ""), (Polarity.NEGATIVE, "NOT")]
 
-    # Pick the verb
-    verb = "it"
-    while ("(something)" in verb) or (
-        verb[0:2] == "it"
-    ):  # don't want verbs like "はじまる"
-        verb = pick(verb_list)
 
-    ja_verb = japanese(verb)
-    vclass = verb_class(verb)
+def qualify_noun_item(verb, option, detail=None):
+    """
+    One qualify_noun prompt. `verb` is a VerbCandidate, and `detail`
+    depends on the option: the frequency word, the (polarity, english)
+    pair, or the time word.
+    """
+    (verb, ja_verb, vclass) = verb
+    meta = {"lesson": 9, "graded": False, "option": option, "verb": verb, "vclass": vclass}
 
     if option == "place":
         en_verb = verb_to_verbing(verb)  # make it into the "ing" form
@@ -241,26 +641,26 @@ def qualify_noun():
         response = f"あそこで{ja_te_verb}いる人"
 
     elif option == "frequency":
-        freq = pick(nouns.frequency)  # Get a frequency word
+        freq = detail
         jfreq = japanese(freq)  # Convert it to japanese too
 
         en_verb = verb[3:]  # remove the leading "to "
 
         english_prompt = f"People who [{en_verb}] {freq}"
         response = f"{jfreq}{ja_verb}人"
+        meta["frequency"] = freq
 
     elif option == "verb":
-        (polarity, eng_pol) = pick(
-            [(Polarity.POSITIVE, ""), (Polarity.NEGATIVE, "NOT")]
-        )
+        (polarity, eng_pol) = detail
 
         en_verb = verb[3:]  # remove the leading "to "
         ja_ta_verb = plain_form(ja_verb, vclass, Tense.NONPAST, polarity)
         english_prompt = f"People who do {eng_pol} [{en_verb}]"
         response = f"{ja_ta_verb}人"
+        meta.update(tense=Tense.NONPAST, polarity=polarity)
 
     else:
-        time = pick(nouns.times_past)
+        time = detail
         jtime = japanese(time)
 
         en_verb = verb[3:]  # remove the leading "to "
@@ -268,19 +668,46 @@ def qualify_noun():
 
         english_prompt = f"A friend who [{en_verb} (PAST)] {time}"
         response = f"{jtime}{ja_ta_verb}友だち"
+        meta.update(tense=Tense.PAST, polarity=Polarity.POSITIVE, time=time)
 
-    # elif option == "time":
-    try:
-        user_input = input("translate " + english_prompt + "\n")
-    except UnicodeDecodeError:
-        pass
+    answers = AnswerLattice([response])
+    return DrillItem("qualify_noun", "translate " + english_prompt, answers, meta)
 
-    print(f"Sample response is: {response}\n")
 
-    return  # response
+@instrument.timed_items("generate.qualify_noun")
+def qualify_noun_items(rng=None):
+    """
+    Qualifying nouns with verbs and adjectives (see: L9, pg. 213-214)
+    """
+    pick = _picker(rng)
 
+    while True:
+        option = pick(qualify_options)
 
-def single_short_form(verb, eng_pol, eng_tense, ja_verb, vclass, polarity, tense):
+        # Pick the verb
+        verb = pick(verb_pool("qualify_noun"))
+
+        detail = None
+        if option == "frequency":
+            detail = pick(nouns.frequency)  # Get a frequency word
+        elif option == "verb":
+            detail = pick(qualify_polarities)
+        elif option == "time":
+            detail = pick(nouns.times_past)
+
+        yield qualify_noun_item(verb, option, detail)
+
+
+def qualify_noun():
+    ask(next(qualify_noun_items()))
+
+
+def short_form_item(verb, eng_pol, eng_tense, ja_verb, vclass, polarity, tense):
+    """
+    The prompt for one specific short form. The arguments are the same
+    tuple single_short_form takes (and hands back when you get it
+    wrong), which is also stored in meta["review"].
+    """
     en_verb = verb
     if eng_pol == "NEGATIVE":
         en_verb = en_verb[0:3] + "NOT " + en_verb[3:]
@@ -290,181 +717,142 @@ def single_short_form(verb, eng_pol, eng_tense, ja_verb, vclass, polarity, tense
 
     english_prompt = f'Short form of "{en_verb}":'
 
-    response = plain_form(ja_verb, vclass, tense, polarity)
+    # Kana or kanji, whichever
+    responses = every_spelling(plain_form, spellings(verb), vclass, tense, polarity)
 
-    return_me = None
+    review = (verb, eng_pol, eng_tense, ja_verb, vclass, polarity, tense)
+    meta = {
+        "lesson": 8,
+        "verb": verb,
+        "vclass": vclass,
+        "tense": tense,
+        "polarity": polarity,
+        "review": review,
+    }
+    return DrillItem("short_form", english_prompt, AnswerLattice([responses]), meta)
 
-    try:
-        user_input = input(english_prompt + "\n")
-        print(f"you said {user_input}")
-        if user_input != response:
-            return_me = (verb, eng_pol, eng_tense, ja_verb, vclass, polarity, tense)
 
-    except UnicodeDecodeError:
-        pass
+def single_short_form(verb, eng_pol, eng_tense, ja_verb, vclass, polarity, tense):
+    item = short_form_item(verb, eng_pol, eng_tense, ja_verb, vclass, polarity, tense)
+    if ask(item):
+        return None
+    return item.meta["review"]
 
-    print(f"Correct conjugation is: {response}\n")
 
-    return return_me
+short_form_polarities = [(Polarity.NEGATIVE, "NEGATIVE"), (Polarity.POSITIVE, "AFFIRMATIVE")]
+short_form_tenses = [(Tense.PAST, "PAST"), (Tense.NONPAST, "NONPAST")]
 
 
-def random_short_form():
+@instrument.timed_items("generate.short_form")
+def short_form_items(rng=None):
     """
-    This one picks a random short form and then runs single_short_form
-    to quiz on it
+    Random short forms, forever.
 
-    We keep these functions separate so that we can do a primitive
-    review feature in short_form_practice by feeding wrong ones back
-    into single_short_form later
+    We keep these separate from single_short_form so that we can do a
+    primitive review feature in short_form_practice by feeding wrong
+    ones back into single_short_form later
     """
-    polarity, eng_pol = pick(
-        [(Polarity.NEGATIVE, "NEGATIVE"), (Polarity.POSITIVE, "AFFIRMATIVE")]
-    )
+    pick = _picker(rng)
 
-    tense, eng_tense = pick([(Tense.PAST, "PAST"), (Tense.NONPAST, "NONPAST")])
-
-    # Pick the verb
-    verb = "it"
-    while ("(something)" in verb) or (
-        verb[0:2] == "it"
-    ):  # don't want verbs like "はじまる"
-        verb = pick(verb_list)
-
-    ja_verb = japanese(verb)
-    vclass = verb_class(verb)
-
-    return single_short_form(verb, eng_pol, eng_tense, ja_verb, vclass, polarity, tense)
-
-
-def short_form_practice(n):
-    wrong = []
-    for _ in range(n):
-        response = random_short_form()
-        if response is not None:
-            wrong += [response]
-
-    while wrong:
-        print(f"{len(wrong)} verbs to review.")
-        review = pick([1, 2, 3])
-        if review == 1:
-            forgotten_verb = wrong[0]
-            wrong = wrong[1:]
-            response = single_short_form(*forgotten_verb)
-            if response is not None:
-                wrong += [response]
-        else:
-            response = random_short_form()
-            if response is not None:
-                wrong += [response]
+    while True:
+        polarity, eng_pol = pick(short_form_polarities)
 
-    return
+        tense, eng_tense = pick(short_form_tenses)
 
+        # Pick the verb
+        (verb, ja_verb, vclass) = pick(verb_pool("short_form"))
 
-def single_ongoing_negative():
-    # verb = pick(verb_list)
+        yield short_form_item(verb, eng_pol, eng_tense, ja_verb, vclass, polarity, tense)
 
-    particle = "を"
 
-    (ntype, verb, did, have_already_done, did_not_do, have_not_done) = pick(
-        [
-            (
-                nouns.do_able,
-                "する",
-                "did",
-                "have already done",
-                "did not do",
-                "have not done",
-            ),
-            (
-                nouns.eat_able,
-                "食べる",
-                "ate",
-                "have already eaten",
-                "didn't eat",
-                "have not eaten",
-            ),
-            (
-                nouns.drink_able,
-                "飲む",
-                "drank",
-                "have already drunk",
-                "did not drink",
-                "haven't drunk",
-            ),
-            (
-                nouns.write_able,
-                "書く",
-                "wrote",
-                "already wrote",
-                "did not write",
-                "haven't written",
-            ),
-            (
-                nouns.buy_able,
-                "買う",
-                "bought",
-                "already bought",
-                "did not buy",
-                "haven't bought",
-            ),
-            (
-                nouns.places_absolute,
-                "行く",
-                "went",
-                "already went",
-                "didn't go",
-                "haven't gone",
-            ),
-        ]
-    )
+def random_short_form():
+    """
+    This one picks a random short form and quizzes on it. Returns the
+    short form tuple if you got it wrong, so it can be reviewed.
+    """
+    item = next(short_form_items())
+    if ask(item):
+        return None
+    return item.meta["review"]
 
-    if verb == "行く":
-        particle = "に"
 
-    noun = pick(ntype)
+def short_form_practice(n, learner=None):
+    """
+    `n` short forms, with reviews. Nothing gets saved unless you give a
+    `learner` (see practice_saved).
+    """
+    practice_saved(short_form_items(), n, learner)
 
-    # Ok I know this is garbage and I should be handling cases more
-    # intelligently but idk lay off ok
-    tense = pick([1, 2, 3, 4])
 
-    if tense == 1:
-        time = pick(nouns.times_past)
-        english_prompt = f"I {did} the {noun} {time}."
-        vclass = j_verb_class(verb)
-        jverb = polite_form(verb, vclass, Tense.PAST, Polarity.POSITIVE)
-        response = f"わたしは{japanese(time)}{japanese(noun)}{particle}{jverb}"
+def single_ongoing_negative_item(slot, noun, case, time=None):
+    """
+    One single_ongoing_negative prompt. `case` is which of the four
+    sentences (1-4), and cases 1 and 3 take a `time` Word.
+    """
+    en = slot.english
+    j_noun = noun.japanese
+    meta = {
+        "lesson": 8,
+        "verb": slot.verb,
+        "vclass": slot.vclass,
+        "noun": noun.english,
+    }
+
+    # The わたしは is optional, and nouns and verbs can be written in
+    # kana or kanji
+    if case == 1:
+        english_prompt = f"I {en['did']} the {noun.english} {time.english}."
+        jverbs = slot.forms[("polite", Tense.PAST, Polarity.POSITIVE)]
+        response = [("わたしは", ""), time.japanese, j_noun, slot.particle, jverbs]
+        meta.update(tense=Tense.PAST, polarity=Polarity.POSITIVE, time=time.english)
+
+    elif case == 2:
+        english_prompt = f"I {en['have_already_done']} the {noun.english}."
+        jverbs = slot.forms[("polite", Tense.PAST, Polarity.POSITIVE)]
+        response = [("わたしは", ""), "もう", j_noun, slot.particle, jverbs]
+        meta.update(tense=Tense.PAST, polarity=Polarity.POSITIVE)
+
+    elif case == 3:
+        english_prompt = f"I {en['did_not_do']} the {noun.english} {time.english}."
+        jverbs = slot.forms[("polite", Tense.PAST, Polarity.NEGATIVE)]
+        response = [("わたしは", ""), time.japanese, j_noun, slot.particle, jverbs]
+        meta.update(tense=Tense.PAST, polarity=Polarity.NEGATIVE, time=time.english)
 
-    elif tense == 2:
+    else:
+        english_prompt = f"I {en['have_not_done']} the {noun.english} yet."
+        jverbs = slot.forms[("te", None, None)]
+        response = [("わたしは", ""), "まだ", j_noun, slot.particle, jverbs, "いません"]
+        meta.update(tense=Tense.NONPAST, polarity=Polarity.NEGATIVE)
 
-        english_prompt = f"I {have_already_done} the {noun}."
-        vclass = j_verb_class(verb)
-        jverb = polite_form(verb, vclass, Tense.PAST, Polarity.POSITIVE)
-        response = f"わたしはもう{japanese(noun)}{particle}{jverb}"
+    answers = AnswerLattice(response)
+    return DrillItem("single_ongoing_negative", english_prompt, answers, meta)
 
-    if tense == 3:
-        time = pick(nouns.times_past)
-        english_prompt = f"I {did_not_do} the {noun} {time}."
-        vclass = j_verb_class(verb)
-        jverb = polite_form(verb, vclass, Tense.PAST, Polarity.NEGATIVE)
-        response = f"わたしは{japanese(time)}{japanese(noun)}{particle}{jverb}"
 
-    elif tense == 4:
-        english_prompt = f"I {have_not_done} the {noun} yet."
-        vclass = j_verb_class(verb)
-        jverb = te_form(verb, vclass)
-        response = f"わたしはまだ{japanese(noun)}{particle}{jverb}いません"
+@instrument.timed_items("generate.single_ongoing_negative")
+def single_ongoing_negative_items(rng=None):
+    pick = _picker(rng)
 
-    try:
-        user_input = input(english_prompt + "\n")
-        # print(f"you said {user_input}")
-        if user_input != response:
-            print(f"{response} is the expected answer\n")
-            return
-        else:
-            print("correct\n")
-    except UnicodeDecodeError:
-        print(f"{response} is the expected answer.\n")
-        pass
+    slots = drill_pool("single_ongoing_negative")
+    times_past = time_pool("past")
+
+    while True:
+        slot = pick(slots)
+
+        noun = pick(slot.nouns)
+
+        # Ok I know this is garbage and I should be handling cases more
+        # intelligently but idk lay off ok
+        case = pick([1, 2, 3, 4])
+
+        time = None
+        if case in (1, 3):
+            time = pick(times_past)
+
+        yield single_ongoing_negative_item(slot, noun, case, time)
+
+
+def single_ongoing_negative():
+    ask(next(single_ongoing_negative_items()))
 
 
 def comparison_practice():
@@ -472,105 +860,101 @@ def comparison_practice():
     pass
 
 
-def plan_practice():
-    (ntype, j_verb, j_part, en_verb) = pick(
-        [
-            (nouns.do_able, "する", "を", "to do"),
-            (nouns.eat_able, "たべる", "を", "to eat"),
-            (nouns.see_able, "みる", "を", "to see"),
-            (nouns.read_able, "よむ", "を", "to read"),
-            (nouns.drink_able, "のむ", "を", "to drink"),
-            (nouns.write_able, "かく", "を", "to write"),
-            (nouns.buy_able, "かう", "を", "to buy"),
-            (nouns.places_absolute, "いく", "に", "to go"),
-        ]
-    )
+plan_tenses = [
+    (True, Polarity.POSITIVE, "I was planning", "つもりでした",),
+    (True, Polarity.NEGATIVE, "I was not planning", "つもりでした",),
+    (False, Polarity.POSITIVE, "I plan", "つもりです",),
+    (False, Polarity.NEGATIVE, "I do not plan", "つもりです",),
+]
 
-    en_noun = pick(ntype)
-    j_noun = japanese(en_noun)
 
-    vclass = j_verb_class(j_verb)
+def plan_item(slot, noun, tense, time):
+    """
+    One plan_practice prompt. `tense` is one of plan_tenses.
+    """
+    past, polarity, en_tense, j_tense = tense
 
-    past, polarity, en_tense, j_tense = pick(
-        [
-            (True, Polarity.POSITIVE, "I was planning", "つもりでした",),
-            (True, Polarity.NEGATIVE, "I was not planning", "つもりでした",),
-            (False, Polarity.POSITIVE, "I plan", "つもりです",),
-            (False, Polarity.NEGATIVE, "I do not plan", "つもりです",),
-        ]
+    en_verb = slot.english["en_verb"]
+    (en_noun, en_time) = (noun.english, time.english)
+    english_prompt = f'Translate "{en_tense} {en_verb} {en_noun} {en_time}"'
+    # Optional わたしは, kana or kanji for everything
+    response = [
+        ("わたしは", ""),
+        time.japanese,
+        time.particle,
+        noun.japanese,
+        slot.particle,
+        slot.forms[("plain", Tense.NONPAST, polarity)],
+        j_tense,
+    ]
+
+    meta = {
+        "lesson": 10,
+        "verb": slot.verb,
+        "vclass": slot.vclass,
+        "tense": Tense.PAST if past else Tense.NONPAST,
+        "polarity": polarity,
+        "noun": noun.english,
+        "time": time.english,
+    }
+    return DrillItem("plan_practice", english_prompt, AnswerLattice(response), meta)
+
+
+@instrument.timed_items("generate.plan_practice")
+def plan_items(rng=None):
+    pick = _picker(rng)
+
+    slots = drill_pool("plan_practice")
+    (times_any, times_future, times_absolute) = (
+        time_pool("any"),
+        time_pool("future"),
+        time_pool("absolute"),
     )
 
-    if past:
-        # If somehting _was_ our plan before, it could have been for
-        # any time.
-        en_time = pick(nouns.times_past + nouns.times_future + nouns.times_absolute)
+    while True:
+        slot = pick(slots)
 
-    elif pick([True, True, False]):  # Give it some shitty odds
-        en_time = pick(nouns.times_future)
+        noun = pick(slot.nouns)
 
-    else:
-        en_time = pick(nouns.times_absolute)
+        tense = pick(plan_tenses)
 
-    time_part = ""
-    if en_time in nouns.times_absolute:
-        time_part = "に"
+        if tense[0]:
+            # If somehting _was_ our plan before, it could have been for
+            # any time.
+            time = pick(times_any)
 
-    j_time = japanese(en_time)
+        elif pick([True, True, False]):  # Give it some shitty odds
+            time = pick(times_future)
 
-    j_verb = plain_form(j_verb, vclass, Tense.NONPAST, polarity)
+        else:
+            time = pick(times_absolute)
 
-    english_prompt = f'Translate "{en_tense} {en_verb} {en_noun} {en_time}"'
-    response = f"わたしは{j_time}{time_part}{j_noun}{j_part}{j_verb}{j_tense}"
+        yield plan_item(slot, noun, tense, time)
 
-    try:
-        user_input = input(english_prompt + "\n")
-        # print(f"you said {user_input}")
-        if user_input != response:
-            print(f"{response} is the expected answer\n")
-            return
-        else:
-            print("correct\n")
-    except UnicodeDecodeError:
-        print(f"{response} is the expected answer.\n")
-        pass
+
+def plan_practice():
+    ask(next(plan_items()))
 
 
 def become_practice():
     pass
 
 
-def tai_practice():
-    (ntype, j_verb, en_verb) = pick(
-        [
-            (nouns.do_able, "する", "to do"),
-            (nouns.study_able, "勉強する", "to study"),
-            (nouns.become_able, "なる", "to become"),
-            (nouns.animals, "飼う", "to own"),
-            (nouns.eat_able, "食べる", "to eat"),
-            (nouns.see_able, "見る", "to see"),
-            (nouns.read_able, "読む", "to read"),
-            (nouns.drink_able, "飲む", "to drink"),
-            (nouns.write_able, "書く", "to write"),
-            (nouns.buy_able, "買う", "to buy"),
-            # (nouns.places_absolute, "行く", "to go"),
-        ]
-    )
-
-    en_noun = pick(ntype)
-    j_noun = japanese(en_noun)
+tai_suffixes = [
+    ("たいです", "[I] want"),
+    ("たくないです", "[I] do not want"),
+    ("たかった", "[I] wanted"),
+    ("たくなかった", "[I] didn't want"),
+    ("たがっています", "[Mary] seems to want"),
+    ("たがっていました", "[Mary] seems to have wanted"),
+]
 
-    vclass = j_verb_class(j_verb)
 
-    tai_suffix, en_prefix = pick(
-        [
-            ("たいです", "[I] want"),
-            ("たくないです", "[I] do not want"),
-            ("たかった", "[I] wanted"),
-            ("たくなかった", "[I] didn't want"),
-            ("たがっています", "[Mary] seems to want"),
-            ("たがっていました", "[Mary] seems to have wanted"),
-        ]
-    )
+def tai_item(slot, noun, suffix):
+    """
+    One tai_practice prompt. `suffix` is one of tai_suffixes.
+    """
+    tai_suffix, en_prefix = suffix
 
     # if past:
     #     # If somehting _was_ our plan before, it could have been for
@@ -580,77 +964,66 @@ def tai_practice():
     #     en_time = pick(nouns.times_future + nouns.times_absolute)
     # j_time = japanese(en_time)
 
-    j_verb = polite_form(j_verb, vclass, Tense.NONPAST, Polarity.POSITIVE)
-
     # Trim off the 「ます」at the end
-    j_verb = j_verb[0:-2]
+    j_verb_forms = [
+        j_verb_form[0:-2]
+        for j_verb_form in slot.forms[("polite", Tense.NONPAST, Polarity.POSITIVE)]
+    ]
 
-    english_prompt = f'Translate "{en_prefix} {en_verb} {en_noun}"'
-    response = f"{j_noun}を{j_verb}{tai_suffix}"
+    en_verb = slot.english["en_verb"]
+    english_prompt = f'Translate "{en_prefix} {en_verb} {noun.english}"'
+    response = [noun.japanese, slot.particle, j_verb_forms, tai_suffix]
 
-    try:
-        user_input = input(english_prompt + "\n")
-        # print(f"you said {user_input}")
-        if user_input != response:
-            print(f"{response} is the expected answer\n")
-            return
-        else:
-            print("correct\n")
-    except UnicodeDecodeError:
-        print(f"{response} is the expected answer.\n")
-        pass
+    meta = {
+        "lesson": 11,
+        "verb": slot.verb,
+        "vclass": slot.vclass,
+        "noun": noun.english,
+        "suffix": tai_suffix,
+    }
+    return DrillItem("tai_practice", english_prompt, AnswerLattice(response), meta)
 
 
-def n_desu_practice():
-    pass
+@instrument.timed_items("generate.tai_practice")
+def tai_items(rng=None):
+    pick = _picker(rng)
 
+    slots = drill_pool("tai_practice")
 
-def youd_better_practice():
-    pass
+    while True:
+        slot = pick(slots)
 
+        noun = pick(slot.nouns)
 
-def obligation_practice():
+        suffix = pick(tai_suffixes)
 
-    particle = "を"
+        yield tai_item(slot, noun, suffix)
 
-    (ntype, j_verb, en_verb) = pick(
-        [
-            (nouns.do_able, "する", "to do"),
-            (nouns.study_able, "勉強する", "to study"),
-            (nouns.become_able, "なる", "to become"),
-            # (nouns.animals, "飼う", "to own"),
-            (nouns.eat_able, "食べる", "to eat"),
-            (nouns.see_able, "見る", "to see"),
-            (nouns.read_able, "読む", "to read"),
-            (nouns.drink_able, "飲む", "to drink"),
-            (nouns.write_able, "書く", "to write"),
-            (nouns.buy_able, "買う", "to buy"),
-            (nouns.places_absolute, "行く", "to go"),
-        ]
-    )
 
-    if j_verb == "行く":
-        particle = "に"
+def tai_practice():
+    ask(next(tai_items()))
 
-    en_noun = pick(ntype)
-    j_noun = japanese(en_noun)
 
-    vclass = j_verb_class(j_verb)
+def n_desu_practice():
+    pass
 
-    in_the_past = pick([True, False])
 
-    en_n_desu = ""
+def youd_better_practice():
+    pass
+
 
-    do_n_desu = pick([True, False])
+def obligation_item(slot, noun, in_the_past, do_n_desu, time):
+    """
+    One obligation_practice prompt. `time` is from the past times if
+    `in_the_past`, otherwise the future ones.
+    """
+    en_n_desu = ""
     if do_n_desu:
         en_n_desu = "(explanation)"
 
     n_desu = ""
-    en_time = ""
 
     if in_the_past:
-        en_time = pick(nouns.times_past)
-        j_time = japanese(en_time)
         en_prefix = "[I] had"
         j_suffixes = [
             "ければいけませんでした",
@@ -663,8 +1036,6 @@ def obligation_practice():
             n_desu = "なんでした"
 
     else:
-        en_time = pick(nouns.times_future)
-        j_time = japanese(en_time)
         en_prefix = "[I] have"
         j_suffixes = [
             "ければいけません",
@@ -675,46 +1046,363 @@ def obligation_practice():
         if do_n_desu:
             n_desu = "なんです"
 
-    j_verb = plain_form(j_verb, vclass, Tense.NONPAST, Polarity.NEGATIVE)
-    j_verb = j_verb[0:-1]  # Trim off the 「い」at the end
+    # Trim off the 「い」at the end
+    j_verb_forms = [
+        j_verb_form[0:-1]
+        for j_verb_form in slot.forms[("plain", Tense.NONPAST, Polarity.NEGATIVE)]
+    ]
 
+    en_verb = slot.english["en_verb"]
+    (en_noun, en_time) = (noun.english, time.english)
     english_prompt = (
         f'Translate "{en_prefix} {en_verb} {en_noun} {en_time} {en_n_desu}"'
     )
-    possible_responses = [
-        f"{j_time}{j_noun}{particle}{j_verb}{j_suffix}{n_desu}"
-        for j_suffix in j_suffixes
-    ]
+    # Any of the suffixes, with or without わたしは, kana or kanji
+    possible_responses = AnswerLattice(
+        [
+            ("", "わたしは"),
+            time.japanese,
+            noun.japanese,
+            slot.particle,
+            j_verb_forms,
+            j_suffixes,
+            n_desu,
+        ]
+    )
+
+    meta = {
+        "lesson": 12,
+        "verb": slot.verb,
+        "vclass": slot.vclass,
+        "tense": Tense.PAST if in_the_past else Tense.NONPAST,
+        "noun": noun.english,
+        "time": time.english,
+        "n_desu": do_n_desu,
+    }
+    return DrillItem("obligation_practice", english_prompt, possible_responses, meta)
 
-    try:
-        user_input = input(english_prompt + "\n")
-        # print(f"you said {user_input}")
-        if user_input not in possible_responses:
-            print("Any of the following would have been accepted:\n")
-            for response in possible_responses:
-                print(response)
-            return
-        else:
-            print("correct\n")
-    except UnicodeDecodeError:
-        print("Any of the following would have been accepted:\n")
-        for response in possible_responses:
-            print(response)
-        pass
 
+@instrument.timed_items("generate.obligation_practice")
+def obligation_items(rng=None):
+    pick = _picker(rng)
+
+    slots = drill_pool("obligation_practice")
+    (times_past, times_future) = (time_pool("past"), time_pool("future"))
 
-def practice_all():
     while True:
-        practice_func = pick(
-            [
-                qualify_noun,
-                random_short_form,
-                single_ongoing_negative,
-                plan_practice,
-                # become_practice,
-                tai_practice,
-                # n_desu_practice,
-                obligation_practice,
-            ]
+        slot = pick(slots)
+
+        noun = pick(slot.nouns)
+
+        in_the_past = pick([True, False])
+
+        do_n_desu = pick([True, False])
+
+        if in_the_past:
+            time = pick(times_past)
+        else:
+            time = pick(times_future)
+
+        yield obligation_item(slot, noun, in_the_past, do_n_desu, time)
+
+
+def obligation_practice():
+    ask(next(obligation_items()))
+
+
+# Every drill that has a prompt generator, by name
+drill_generators = {
+    "qualify_noun": qualify_noun_items,
+    "short_form": short_form_items,
+    "single_ongoing_negative": single_ongoing_negative_items,
+    "plan_practice": plan_items,
+    "tai_practice": tai_items,
+    "obligation_practice": obligation_items,
+    "counting": counting_items,
+}
+
+
+# ------------------------------------------------------------------ #
+# Every prompt each drill can make, numbered (see drill_space.py), so
+# they can be gone through evenly without repeats, or all exported.
+# The blocks cover exactly what the generators above can pick, built
+# with the same *_item functions.
+
+
+def qualify_noun_space():
+    verbs = verb_pool("qualify_noun")
+    return DrillSpace(
+        [
+            Block((verbs, ["place"]), qualify_noun_item),
+            Block((verbs, ["frequency"], nouns.frequency), qualify_noun_item),
+            Block((verbs, ["verb"], qualify_polarities), qualify_noun_item),
+            Block((verbs, ["time"], nouns.times_past), qualify_noun_item),
+        ]
+    )
+
+
+def short_form_space():
+    def build(polarity, tense, verb):
+        (verb, ja_verb, vclass) = verb
+        return short_form_item(
+            verb, polarity[1], tense[1], ja_verb, vclass, polarity[0], tense[0]
         )
-        practice_func()
+
+    choices = (short_form_polarities, short_form_tenses, verb_pool("short_form"))
+    return DrillSpace([Block(choices, build)])
+
+
+def single_ongoing_negative_space():
+    (times_past, build) = (time_pool("past"), single_ongoing_negative_item)
+    blocks = []
+    for slot in drill_pool("single_ongoing_negative"):
+        blocks += [
+            Block(([slot], slot.nouns, [1, 3], times_past), build),
+            Block(([slot], slot.nouns, [2, 4]), build),
+        ]
+    return DrillSpace(blocks)
+
+
+def plan_space():
+    past_tenses = [tense for tense in plan_tenses if tense[0]]
+    other_tenses = [tense for tense in plan_tenses if not tense[0]]
+    other_times = time_pool("future") + time_pool("absolute")
+    blocks = []
+    for slot in drill_pool("plan_practice"):
+        blocks += [
+            Block(([slot], slot.nouns, past_tenses, time_pool("any")), plan_item),
+            Block(([slot], slot.nouns, other_tenses, other_times), plan_item),
+        ]
+    return DrillSpace(blocks)
+
+
+def tai_space():
+    blocks = []
+    for slot in drill_pool("tai_practice"):
+        blocks += [Block(([slot], slot.nouns, tai_suffixes), tai_item)]
+    return DrillSpace(blocks)
+
+
+def obligation_space():
+    blocks = []
+    for slot in drill_pool("obligation_practice"):
+        for (in_the_past, times) in ((True, "past"), (False, "future")):
+            choices = ([slot], slot.nouns, [in_the_past], [True, False])
+            blocks += [Block((*choices, time_pool(times)), obligation_item)]
+    return DrillSpace(blocks)
+
+
+def counting_space():
+    blocks = []
+    for slot in counting_pool():
+        choices = ([slot], slot.nouns, slot.numbers)
+        if slot.prices:
+            choices = (*choices, slot.prices)
+        blocks += [Block(choices, counting_item)]
+    return DrillSpace(blocks)
+
+
+drill_space_builders = {
+    "qualify_noun": qualify_noun_space,
+    "short_form": short_form_space,
+    "single_ongoing_negative": single_ongoing_negative_space,
+    "plan_practice": plan_space,
+    "tai_practice": tai_space,
+    "obligation_practice": obligation_space,
+    "counting": counting_space,
+}
+
+_drill_spaces = dict()
+
+
+def drill_space(drill):
+    """
+    The DrillSpace for `drill`, built the first time it's asked for.
+    """
+    space = _drill_spaces.get(drill)
+    if space is None:
+        with instrument.timed("build.drill_space"):
+            space = _drill_spaces[drill] = drill_space_builders[drill]()
+    return space
+
+
+def build_pools():
+    """
+    Load the vocab and conjugations and build every drill's pools up
+    front, so the first prompt of each drill doesn't pay for them.
+    """
+    from drill_specs import drill_specs, time_specs
+
+    _vocab()
+    _conjugations()
+    for drill in verb_rules:
+        verb_pool(drill)
+    for drill in drill_specs:
+        drill_pool(drill)
+    for name in time_specs:
+        time_pool(name)
+    counting_pool()
+
+
+def shuffled_items(drill, rng=None):
+    """
+    Like drill_generators[drill], but every possible prompt comes up
+    exactly once (in a random order) before any of them repeats.
+    """
+    return drill_space(drill).shuffled(rng if rng is not None else random, forever=True)
+
+
+# In the practice loops, time is counted in prompts asked. Something
+# you missed comes back `relearn_turns` prompts later, and after that
+# SM-2 spaces it out in steps of `review_turns` prompts (3, then 18,
+# ...).
+review_turns = 3
+relearn_turns = 2
+
+
+class ReviewSession:
+    """
+    The state of one practice session: `n` new prompts from `items`
+    (forever if n is None), with reviews of the ones you missed mixed
+    in as they come due, and anything in `backlog` (e.g. cards that
+    came due since last time) asked before the new prompts.
+
+    A missed prompt keeps coming back until you've got it right
+    `graduate` times in a row.
+
+    No I/O in here, so the terminal loop below and the quiz server can
+    both drive it:
+
+        >>> session = ReviewSession(plan_items(), 10)
+        >>> (item, is_review) = session.next_item()
+        >>> session.record(item, ask(item))  # doctest: +SKIP
+    """
+
+    def __init__(self, items, n=None, scheduler=None, graduate=2, backlog=()):
+        if scheduler is None:
+            scheduler = ReviewScheduler(
+                unit=review_turns, relearn_delay=relearn_turns / review_turns
+            )
+        self.items = items
+        self.n = n
+        self.scheduler = scheduler
+        self.graduate = graduate
+        self.backlog = deque(backlog)
+        self.turn = 0
+        self.asked = 0
+
+    def _more_new(self):
+        return self.n is None or self.asked < self.n
+
+    def next_item(self):
+        """
+        The next prompt to ask, or None once the session is over.
+        Returns (item, is_review).
+        """
+        scheduler = self.scheduler
+        while self._more_new() or len(scheduler) or self.backlog:
+            card = scheduler.pop_due(now=self.turn)
+            if card is not None:
+                return (card.item, True)
+            if self.backlog:
+                return (self.backlog.popleft(), True)
+            if self._more_new():
+                self.asked += 1
+                return (next(self.items), False)
+            # Out of new prompts, so skip ahead to the next review
+            following = scheduler.next_due()
+            if following is None:
+                # What's left was asked but never graded again (e.g.
+                # recorded as None), so there's nothing to come back to
+                return None
+            self.turn = following
+        return None
+
+    def record(self, item, result):
+        """
+        What ask() (or whatever did the asking) said about `item`.
+        """
+        self.turn += 1
+        key = (item.drill, item.prompt)
+        if result is None or (result and key not in self.scheduler):
+            # Not graded, or right first time: nothing to review
+            return
+        card = self.scheduler.grade(key, item, 4 if result else 1, now=self.turn)
+        if card.reps >= self.graduate:
+            self.scheduler.forget(key)
+
+
+def practice_with_review(items, n=None, scheduler=None, graduate=2, progress=None):
+    """
+    Quiz on `n` new prompts from `items` (forever if n is None), with
+    reviews mixed in; see ReviewSession. Works with any of the drill
+    generators. Returns the scheduler.
+
+    With a progress.ProgressStore, everything gets saved as we go, and
+    anything that came due since last time gets asked before the new
+    prompts.
+    """
+    backlog = progress.due_items() if progress is not None else []
+    if backlog:
+        print(f"{len(backlog)} due from last time.")
+    session = ReviewSession(items, n, scheduler, graduate, backlog)
+
+    while True:
+        following = session.next_item()
+        if following is None:
+            break
+        (item, is_review) = following
+        if is_review:
+            print(f"{len(session.scheduler) + len(session.backlog)} to review.")
+
+        result = ask(item)
+        session.record(item, result)
+        if progress is not None:
+            progress.grade(item, result)
+
+    return session.scheduler
+
+
+def practice_saved(items, n=None, learner=None):
+    """
+    practice_with_review, and if there's a `learner` (e.g. "default"),
+    saving their progress in progress.db (see progress.py) and starting
+    with whatever of theirs is due. Without one, progress.db isn't
+    opened at all, so practicing has no side effects unless asked to.
+    """
+    if learner is None:
+        return practice_with_review(items, n)
+
+    from progress import ProgressStore
+
+    with ProgressStore(learner=learner) as progress:
+        return practice_with_review(items, n, progress=progress)
+
+
+def mixed_items(rng=None):
+    """
+    Prompts from every drill, picked at random.
+    """
+    pick = _picker(rng)
+
+    streams = [
+        qualify_noun_items(rng),
+        short_form_items(rng),
+        single_ongoing_negative_items(rng),
+        plan_items(rng),
+        # become_practice,
+        tai_items(rng),
+        # n_desu_practice,
+        obligation_items(rng),
+        counting_items(rng),
+    ]
+    while True:
+        yield next(pick(streams))
+
+
+def practice_all(learner=None):
+    """
+    Every drill, forever, with reviews. Nothing gets saved unless you
+    give a `learner` (see practice_saved).
+    """
+    practice_saved(mixed_items(), None, learner)
@@ -0,0 +1,288 @@
+# Counting and timing the hot paths, for when something is slow and we
+# want to know where the time goes.
+#
+# Off by default. Set GENKI_STATS=1 in the environment (or pass --stats
+# to bulk.py or quiz_server.py, or call enable()) and it keeps:
+#
+#   - counters, e.g. how many japanese() lookups or conjugations there
+#     were, and how many of those had to go through the generator
+#   - latency histograms, e.g. how long each drill takes to make one
+#     prompt, in power-of-2 buckets of nanoseconds
+#
+# stats() gives all of it back as a dict, and report() prints it (which
+# happens on exit too, once enabled).
+#
+# While it's off, every call site is just `if instrument.enabled:`, and
+# the drill generators aren't wrapped at all, so leaving the calls in
+# costs next to nothing.
+import atexit
+import os
+import sys
+import threading
+import time
+
+from functools import wraps
+
+enabled = False
+
+counters = dict()
+histograms = dict()
+
+_lock = threading.Lock()
+_report_registered = False
+
+
+class Histogram:
+    """
+    Latencies in power-of-2 buckets: bucket b holds everything from
+    2**(b-1) up to 2**b - 1 nanoseconds. Quantiles come out as the top
+    of the bucket they land in, so they're within a factor of 2.
+
+    Example:
+        >>> h = Histogram()
+        >>> for ns in (900, 1100, 70_000):
+        ...     h.record(ns)
+        >>> h.quantile(0.5)
+        2047
+    """
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, ns):
+        self.buckets[min(ns.bit_length(), 63)] += 1
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+
+    def merge(self, other):
+        for (b, n) in enumerate(other.buckets):
+            self.buckets[b] += n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        seen = 0
+        for (b, n) in enumerate(self.buckets):
+            seen += n
+            if seen >= q * self.count:
+                return min((1 << b) - 1, self.max)
+        return self.max
+
+    def summary(self):
+        """
+        count, mean, min, max and some quantiles, in microseconds
+        """
+        if not self.count:
+            return {"count": 0}
+
+        def us(ns):
+            return round(ns / 1000, 2)
+
+        return {
+            "count": self.count,
+            "mean_us": us(self.total / self.count),
+            "min_us": us(self.min),
+            "p50_us": us(self.quantile(0.5)),
+            "p90_us": us(self.quantile(0.9)),
+            "p99_us": us(self.quantile(0.99)),
+            "max_us": us(self.max),
+        }
+
+
+# ------------------------------------------------------------------ #
+# Recording. Callers check `enabled` first, so these don't.
+
+
+def count(name, n=1):
+    with _lock:
+        counters[name] = counters.get(name, 0) + n
+
+
+def observe(name, ns):
+    with _lock:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram()
+        histogram.record(ns)
+
+
+class timed:
+    """
+    Time a block into histogram `name`, if we're enabled.
+
+    Example:
+        >>> with timed("build.verb_pool"):
+        ...     pool = sum(range(10))
+    """
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns() if enabled else None
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            observe(self.name, time.perf_counter_ns() - self.start)
+
+
+def counted(name, func):
+    """
+    `func`, but counting its calls as `name`.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        count(name)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _timed_items(name, items):
+    clock = time.perf_counter_ns
+    while True:
+        start = clock()
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        observe(name, clock() - start)
+        yield item
+
+
+def timed_items(name):
+    """
+    Decorator for drill generators: while enabled, how long each prompt
+    takes to make goes into histogram `name`. Whether to time is
+    decided when the generator is created, so a generator made while
+    disabled is handed back untouched.
+    """
+
+    def decorate(make_items):
+        @wraps(make_items)
+        def wrapper(*args, **kwargs):
+            items = make_items(*args, **kwargs)
+            if enabled:
+                return _timed_items(name, items)
+            return items
+
+        return wrapper
+
+    return decorate
+
+
+# ------------------------------------------------------------------ #
+# Reading it back
+
+
+def stats():
+    """
+    Everything recorded so far, as plain dicts.
+    """
+    with _lock:
+        return {
+            "enabled": enabled,
+            "counters": dict(sorted(counters.items())),
+            "histograms": {
+                name: histogram.summary()
+                for (name, histogram) in sorted(histograms.items())
+            },
+        }
+
+
+def reset():
+    with _lock:
+        counters.clear()
+        histograms.clear()
+
+
+def drain():
+    """
+    Take everything recorded so far (raw, for merge()) and start over.
+    For handing a worker process's numbers back to its parent.
+    """
+    with _lock:
+        taken = (dict(counters), dict(histograms))
+        counters.clear()
+        histograms.clear()
+    return taken
+
+
+def merge(taken):
+    """
+    Add what drain() gave back (from this process or another) to ours.
+    """
+    (more_counters, more_histograms) = taken
+    with _lock:
+        for (name, n) in more_counters.items():
+            counters[name] = counters.get(name, 0) + n
+        for (name, more) in more_histograms.items():
+            histogram = histograms.get(name)
+            if histogram is None:
+                histogram = histograms[name] = Histogram()
+            histogram.merge(more)
+
+
+def report(file=None):
+    """
+    Print stats() as a couple of tables.
+    """
+    if file is None:
+        file = sys.stderr
+    current = stats()
+    if not current["counters"] and not current["histograms"]:
+        return
+
+    print("\n---- genki stats ----", file=file)
+    if current["counters"]:
+        width = max(len(name) for name in current["counters"])
+        for (name, n) in current["counters"].items():
+            print(f"{name:<{width}}  {n:>12,}", file=file)
+
+    if current["histograms"]:
+        width = max(len(name) for name in current["histograms"])
+        columns = ("count", "mean_us", "p50_us", "p90_us", "p99_us", "max_us")
+        print(file=file)
+        print(f"{'':<{width}}" + "".join(f"{c:>11}" for c in columns), file=file)
+        for (name, summary) in current["histograms"].items():
+            cells = "".join(f"{summary.get(c, ''):>11}" for c in columns)
+            print(f"{name:<{width}}{cells}", file=file)
+
+
+# ------------------------------------------------------------------ #
+
+
+def enable(report_at_exit=True):
+    global enabled, _report_registered
+    enabled = True
+    if report_at_exit and not _report_registered:
+        atexit.register(report)
+        _report_registered = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+if os.environ.get("GENKI_STATS", "") not in ("", "0"):
+    enable()
@@ -0,0 +1,107 @@
+# A small bounded LRU cache for memoizing conjugations.
+#
+# functools.lru_cache would almost do, but it doesn't count evictions
+# and there's no way to share one cache between a bunch of different
+# functions, which is what we want for e.g. all the adjective forms.
+import threading
+
+from collections import OrderedDict
+from functools import wraps
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with hit/miss/eviction
+    counters.
+
+    Example:
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache.get_or_compute("a", lambda: 1)
+        1
+        >>> cache.get_or_compute("a", lambda: 1)
+        1
+        >>> cache.stats()
+        {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': 2}
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            try:
+                val = self._data[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return val
+
+        # Compute outside the lock so one slow conjugation doesn't hold
+        # up every other thread. Two threads missing on the same key at
+        # once will both compute it, which is harmless.
+        val = compute()
+
+        with self._lock:
+            self._data[key] = val
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return val
+
+    def clear(self):
+        """
+        Drop everything and reset the counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+
+def memoize(cache):
+    """
+    Decorator that memoizes a function in `cache` (an LRUCache). The
+    function's name is part of the key, so one cache can be shared
+    between several functions. Arguments have to be hashable.
+
+    Example:
+        >>> forms = LRUCache()
+        >>> @memoize(forms)
+        ... def i_adj_te_form(dict_form):
+        ...     return dict_form[:-1] + "くて"
+    """
+
+    def decorator(func):
+        name = func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items()))) if kwargs else (name, args)
+            return cache.get_or_compute(key, lambda: func(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
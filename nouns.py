@@ -450,6 +450,61 @@ times_absolute = [
     "winter",
 ]
 
+# Things to count, by the counter they take (see counters.py)
+flat_things = [  # 枚
+    "postal stamps",
+    "ticket",
+    "shirt",
+    "postcard",
+    "picture; photograph",
+]
+
+# The ones you'd ask for by price, like 七十円切手
+priced_flat_things = [
+    "postal stamps",
+    "ticket",
+    "postcard",
+]
+
+long_things = [  # 本
+    "umbrella",
+    "pen",
+    "pencil",
+]
+
+bound_things = [  # 冊
+    "magazine",
+    "textbook",
+    "dictionary",
+    "book",
+]
+
+small_things = [  # 個
+    "apple",
+    "tomato",
+    "rice cake",
+    "cake",
+    "hamburger",
+]
+
+small_animals = [  # 匹
+    "dog",
+    "cat",
+    "fish",
+]
+
+cup_able = [  # 杯
+    "coffee",
+    "green tea",
+    "water",
+    "juice",
+    "milk",
+]
+
+pairs_of_shoes = [  # 足
+    "shoes",
+]
+
 categories = [
     "color",
     "sports",
@@ -611,5 +666,13 @@ noun_lists = [
     times_future,
     times_relative,
     times_absolute,
+    flat_things,
+    priced_flat_things,
+    long_things,
+    bound_things,
+    small_things,
+    small_animals,
+    cup_able,
+    pairs_of_shoes,
     categories,
 ]
@@ -9,7 +9,6 @@ import numpy as np
 from multiprocessing import Pool
 from bs4 import BeautifulSoup
 from tqdm import tqdm
-from copy import deepcopy
 
 from constants import *
 from genki_ingest import *
@@ -45,27 +44,24 @@ def test_word(k_word, reading):
 
 
 def main():
-    pre_dfrows = [row for (_, row) in df.iterrows()]
-
     # Some words are stored in the genki excel file with multiple
-    # kanji. It's actually just two: kotae and hayaku.
+    # kanji. It's actually just two: kotae and hayaku. Those get one
+    # card per kanji; the records are immutable so this just makes
+    # lightweight copies with the kanji swapped out.
     dfrows = []
-    for row in pre_dfrows:
-        if not pd.isnull(row["kanji"]):
-            newrow = deepcopy(row)
-            kanjis = row["kanji"].split("/")
-            for kanji in kanjis:
-                newrow["kanji"] = kanji
-                dfrows += [newrow]
+    for row in store:
+        if row.kanji is not None:
+            for kanji in row.kanji.split("/"):
+                dfrows += [row._replace(kanji=kanji)]
         else:
             dfrows += [row]
 
     mondais = []
     for (ind, row) in tqdm(list(enumerate(dfrows))):
-        row_tags = clean_lesson_tag(row["lesson"])
-        if not pd.isnull(row["kanji"]):
-            kanji = clean_word(row["kanji"])
-            word = clean_word(row["word"])
+        row_tags = clean_lesson_tag(row.lesson)
+        if row.kanji is not None:
+            kanji = clean_word(row.kanji)
+            word = clean_word(row.word)
 
             # REMOVE THIS
             if "、" in word:
@@ -104,24 +100,24 @@ def main():
             pitch_note = genanki.Note(
                 model=genki_pitch_model,  # in constants.py
                 fields=[
-                    row["kanji"],
+                    row.kanji,
                     f_str,
-                    row["english"],
-                    row["pos"],
+                    row.english,
+                    row.pos,
                     p_str,
                 ],
                 tags=row_tags,
             )
         else:
             # lmao this is kind of dumb
-            pitch_str = get_pitch(row["word"], row["word"])
+            pitch_str = get_pitch(row.word, row.word)
             pitch_note = genanki.Note(
                 model=genki_pitch_model,
                 fields=[
-                    row["word"],
-                    row["word"],
-                    row["english"],
-                    row["pos"],
+                    row.word,
+                    row.word,
+                    row.english,
+                    row.pos,
                     pitch_str,
                 ],
                 tags=row_tags,
@@ -136,16 +132,12 @@ def main():
         "../anki-data/Genki_pitch/genki_pitch.apkg"
     )
 
-    try:
+    if mondais:
         print("There were some problems.")
-        mondai_df = np.array(dfrows)[np.array(mondais)]
-
-        c = {0: "word", 1: "kanji", 2: "pos", 3: "english", 4: "lesson"}
-        mdf.rename(columns=c, inplace=True)
-
+        # Same columns as the vocab table, plus the stable vocab id
+        mondai_df = pd.DataFrame([dfrows[i] for i in mondais])
         mondai_df.to_csv("mondais.csv", index=False)
-    except:
-        return mondais
+    return mondais
 
 
 if __name__ == "__main__":
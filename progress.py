@@ -0,0 +1,294 @@
+# Keeping track of how practice goes between sessions.
+#
+# Every graded prompt gets logged as an attempt, and its SM-2 card (see
+# scheduler.py) gets saved, in a SQLite database next to the workbook.
+# The next session can then start with whatever has come due since.
+#
+# The prompt loop shouldn't ever sit waiting on the disk, so writes go
+# on a queue and a background thread commits them in batches. The
+# database is in WAL mode, so reading the due queue doesn't have to
+# wait for the writer either.
+#
+# Tables:
+#
+#   attempts: learner, drill, prompt, correct, at
+#   schedule: learner, drill, prompt, ease, interval, reps, due, item
+#
+# where `item` is the DrillItem as JSON (see drill_items.py), so
+# a due card can be asked again without regenerating it. Both are
+# indexed on (learner, time), so loading a learner's due queue doesn't
+# get slower as the attempt log grows.
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+from drill_items import item_from_json, item_to_json
+from scheduler import Card, ReviewScheduler
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+default_progress_path = os.path.join(here, "progress.db")
+
+schema = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    learner TEXT NOT NULL,
+    drill TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_by_learner ON attempts (learner, at);
+
+CREATE TABLE IF NOT EXISTS schedule (
+    learner TEXT NOT NULL,
+    drill TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    ease REAL NOT NULL,
+    interval REAL NOT NULL,
+    reps INTEGER NOT NULL,
+    due REAL NOT NULL,
+    item TEXT NOT NULL,
+    PRIMARY KEY (learner, drill, prompt)
+);
+CREATE INDEX IF NOT EXISTS schedule_by_due ON schedule (learner, due);
+"""
+
+save_card_sql = """
+INSERT INTO schedule (learner, drill, prompt, ease, interval, reps, due, item)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (learner, drill, prompt) DO UPDATE SET
+    ease = excluded.ease,
+    interval = excluded.interval,
+    reps = excluded.reps,
+    due = excluded.due,
+    item = excluded.item
+"""
+
+record_attempt_sql = """
+INSERT INTO attempts (learner, drill, prompt, correct, at) VALUES (?, ?, ?, ?, ?)
+"""
+
+class ProgressStore:
+    """
+    One learner's attempts and review schedule.
+
+    Example:
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "progress.db")
+        >>> progress = ProgressStore(path, learner="mary")
+        >>> for item in progress.due_items():  # nothing due yet
+        ...     progress.grade(item, ask(item))
+        >>> progress.close()
+    """
+
+    def __init__(
+        self,
+        path=default_progress_path,
+        learner="default",
+        batch_size=256,
+        flush_interval=0.5,
+    ):
+        self.path = path
+        self.learner = learner
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        # Wall clock, with an interval of 1 meaning a day
+        self.scheduler = ReviewScheduler()
+
+        self._db = self._connect()
+        self._db.executescript(schema)
+        # Reads can come from other threads (e.g. the quiz server's
+        # executor), so they take turns on the one connection
+        self._read_lock = threading.Lock()
+
+        self._writes = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="progress-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        # Fine to lose the last few writes if the machine dies, but
+        # never to corrupt anything. Saves an fsync per commit.
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    # -------------------------------------------------------------- #
+    # Writing, on the background thread
+
+    def _write_loop(self):
+        try:
+            db = self._connect()
+        except Exception as e:
+            # Keep going anyway, so flush() and close() still return;
+            # there's just nowhere to save to
+            print(f"couldn't open progress for writing: {e}", file=sys.stderr)
+            db = None
+
+        stopping = False
+        while not stopping:
+            batch = [self._writes.get()]
+            # Pick up whatever else shows up in the next little while,
+            # and commit it all at once
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch += [self._writes.get(timeout=timeout)]
+                except queue.Empty:
+                    break
+
+            # flush() and close() put a (None, event) in the queue and
+            # wait for us to get to it
+            writes = [(sql, params) for (sql, params) in batch if sql is not None]
+            waiting = [params for (sql, params) in batch if sql is None]
+            try:
+                if db is not None:
+                    with db:
+                        for (sql, params) in writes:
+                            db.execute(sql, params)
+            except Exception as e:
+                # Losing a batch of progress isn't worth taking the
+                # practice session down over, and neither is this
+                # thread dying with somebody waiting on it
+                print(f"couldn't save progress: {e}", file=sys.stderr)
+            finally:
+                for done in waiting:
+                    stopping = stopping or done is None
+                    if done is not None:
+                        done.set()
+        if db is not None:
+            db.close()
+
+    def _write(self, sql, params):
+        self._writes.put((sql, params))
+
+    def flush(self):
+        """
+        Block until everything written so far is committed.
+        """
+        done = threading.Event()
+        self._writes.put((None, done))
+        done.wait()
+
+    def close(self):
+        self.flush()
+        self._writes.put((None, None))
+        self._writer.join()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------------------- #
+    # Reading
+
+    def _card_from_row(self, row):
+        (drill, prompt, ease, interval, reps, due, item) = row
+        return Card((drill, prompt), item_from_json(item), ease, interval, reps, due)
+
+    def _load_card(self, key):
+        with self._read_lock:
+            row = self._db.execute(
+                "SELECT drill, prompt, ease, interval, reps, due, item FROM schedule "
+                "WHERE learner = ? AND drill = ? AND prompt = ?",
+                (self.learner, *key),
+            ).fetchone()
+        return self._card_from_row(row) if row is not None else None
+
+    def load_due(self, now=None, limit=None):
+        """
+        Every card that's due at `now` (default: now), the most overdue
+        first, each time it's asked. They get added to self.scheduler
+        too.
+        """
+        if now is None:
+            now = time.time()
+        sql = (
+            "SELECT drill, prompt, ease, interval, reps, due, item FROM schedule "
+            "WHERE learner = ? AND due <= ? ORDER BY due"
+        )
+        params = (self.learner, now)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+
+        with self._read_lock:
+            rows = self._db.execute(sql, params).fetchall()
+
+        cards = []
+        for row in rows:
+            card = self._card_from_row(row)
+            known = self.scheduler.cards.get(card.key)
+            if known is None:
+                cards += [self.scheduler.add(card)]
+            elif known.due <= now:
+                # Already loaded or graded since we started, and ours
+                # is more up to date than what's been written so far.
+                # Still due, though, so it goes back in the queue
+                # (e.g. for another drill, or a session that got
+                # dropped before reaching it)
+                cards += [known]
+        return cards
+
+    def due_items(self, now=None, limit=None):
+        return [card.item for card in self.load_due(now, limit)]
+
+    def history(self, since=0):
+        """
+        (drill, prompt, correct, at) for every attempt since `since`.
+        """
+        self.flush()
+        with self._read_lock:
+            return self._db.execute(
+                "SELECT drill, prompt, correct, at FROM attempts "
+                "WHERE learner = ? AND at >= ? ORDER BY at",
+                (self.learner, since),
+            ).fetchall()
+
+    # -------------------------------------------------------------- #
+
+    def grade(self, item, correct, now=None):
+        """
+        Log an attempt at `item` and reschedule it. `correct` is what
+        ask() returned; ungraded prompts (None) aren't kept.
+        """
+        if correct is None:
+            return None
+        if now is None:
+            now = time.time()
+
+        key = (item.drill, item.prompt)
+        if key not in self.scheduler:
+            card = self._load_card(key)
+            if card is not None:
+                self.scheduler.add(card)
+
+        card = self.scheduler.grade(key, item, 4 if correct else 1, now=now)
+
+        self._write(record_attempt_sql, (self.learner, *key, int(correct), now))
+        self._write(
+            save_card_sql,
+            (
+                self.learner,
+                *key,
+                card.ease,
+                card.interval,
+                card.reps,
+                card.due,
+                item_to_json(item),
+            ),
+        )
+        return card
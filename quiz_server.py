@@ -0,0 +1,401 @@
+# Serve practice sessions over HTTP.
+#
+# Rather than everybody running their own `python -i genki_practice.py`
+# (and each of those loading the workbook and building its own
+# conjugator), one server loads the vocab, the conjugation table and
+# the drill pools once and hands out prompts to as many learners as want
+# them. It's plain asyncio and the standard library, no web framework.
+#
+# Everything is JSON:
+#
+#   POST   /sessions               {"drill": "plan_practice", "n": 20,
+#                                   "learner": "mary", "seed": 1}
+#                                  -> {"session": ..., "prompt": {...}}
+#   GET    /sessions/<id>          -> the current prompt
+#   POST   /sessions/<id>/answer   {"answer": "..."}
+#                                  -> how it went, plus the next prompt
+#   DELETE /sessions/<id>
+#   GET    /drills                 -> the drills you can ask for
+#   GET    /stats                  -> session count and cache stats, plus
+#                                     timings if --stats is on (see
+#                                     instrument.py)
+#
+# "drill" can be any of genki_practice.drill_generators, or "mixed" for
+# all of them (the default). Leave "n" out to go forever. With a
+# "learner", attempts get saved in progress.db and that learner's due
+# cards are asked first.
+#
+# Making a prompt is a few dict lookups, so that happens right on the
+# event loop. Anything that might hit the disk (loading the vocab on
+# startup, reading a learner's due queue) goes to the default executor
+# so the other sessions don't have to wait for it.
+#
+# Usage:
+#   python quiz_server.py [--host 127.0.0.1] [--port 8765] [--stats]
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import secrets
+import threading
+import time
+import traceback
+
+from http import HTTPStatus
+
+import genki_practice
+import instrument
+
+# Drop sessions nobody has touched in this long
+session_timeout = 30 * 60
+
+# Don't read request bodies bigger than this
+max_body = 64 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+def _field(body, name, types, default=None):
+    """
+    body[name] (or `default` if it's missing or null), as long as it's
+    one of `types`. JSON true/false don't count as ints.
+    """
+    val = body.get(name)
+    if val is None:
+        return default
+    if isinstance(val, bool) or not isinstance(val, types):
+        if not isinstance(types, tuple):
+            types = (types,)
+        kinds = " or ".join({int: "a whole number", str: "a string"}[t] for t in types)
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f'"{name}" has to be {kinds}')
+    return val
+
+
+class Session:
+    """
+    One learner working through one drill.
+    """
+
+    def __init__(self, drill, n=None, learner=None, seed=None, backlog=()):
+        rng = random.Random(seed)
+        if drill == "mixed":
+            items = genki_practice.mixed_items(rng)
+        else:
+            items = genki_practice.drill_generators[drill](rng)
+
+        self.drill = drill
+        self.learner = learner
+        self.review = genki_practice.ReviewSession(items, n, backlog=backlog)
+        self.numbers = itertools.count(1)
+        self.touched = time.monotonic()
+        self._advance()
+
+    def _advance(self):
+        following = self.review.next_item()
+        if following is None:
+            (self.item, self.is_review, self.number) = (None, False, None)
+        else:
+            (self.item, self.is_review) = following
+            self.number = next(self.numbers)
+
+    def prompt(self):
+        if self.item is None:
+            return None
+        return {
+            "number": self.number,
+            "drill": self.item.drill,
+            "prompt": self.item.prompt,
+            "review": self.is_review,
+            "graded": self.item.meta.get("graded", True),
+        }
+
+    def answer(self, text):
+        """
+        Grade `text` against the current prompt and move on to the
+        next one. Returns (result, item, feedback), where result is
+        what ask() would have said (None for the ungraded drills).
+        """
+        item = self.item
+        answers = item.answers
+        if item.meta.get("graded", True):
+            match = answers.match(text)
+            result = match.accepted
+            feedback = {"correct": result, "prefix": match.prefix}
+        else:
+            result = None
+            feedback = {"correct": None}
+
+        feedback.update(expected=answers.preferred, accepted=str(answers))
+        self.review.record(item, result)
+        self._advance()
+        return (result, item, feedback)
+
+
+class QuizServer:
+    def __init__(self, progress=True):
+        self.sessions = dict()
+        self.progress = progress
+        self._stores = dict()
+        self._stores_lock = threading.Lock()
+
+    # -------------------------------------------------------------- #
+    # Things that can block, run in the executor
+
+    def _store(self, learner):
+        # One ProgressStore per learner, kept open for the life of the
+        # server, with a lock to take around anything that touches it:
+        # its scheduler is a plain heap, and requests for the same
+        # learner can land on different executor threads at once
+        with self._stores_lock:
+            entry = self._stores.get(learner)
+            if entry is None:
+                from progress import ProgressStore
+
+                entry = (ProgressStore(learner=learner), threading.Lock())
+                self._stores[learner] = entry
+        return entry
+
+    def _due_items(self, learner):
+        (store, lock) = self._store(learner)
+        with lock:
+            return store.due_items()
+
+    def _grade(self, learner, item, result):
+        (store, lock) = self._store(learner)
+        with lock:
+            return store.grade(item, result)
+
+    def warm_up(self):
+        """
+        Load everything the drills need, so the first session doesn't
+        pay for it.
+        """
+        genki_practice.build_pools()
+
+    def close(self):
+        for (store, lock) in self._stores.values():
+            store.close()
+
+    # -------------------------------------------------------------- #
+    # Routes
+
+    async def create_session(self, body):
+        drill = _field(body, "drill", str, "mixed")
+        if drill != "mixed" and drill not in genki_practice.drill_generators:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"no drill called {drill!r}")
+        n = _field(body, "n", int)
+        if n is not None and n < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, '"n" has to be a whole number')
+        seed = _field(body, "seed", (int, str))
+
+        learner = _field(body, "learner", (str, int))
+        if learner is not None:
+            learner = str(learner)
+        backlog = []
+        if learner is not None and self.progress:
+            loop = asyncio.get_running_loop()
+            backlog = await loop.run_in_executor(None, self._due_items, learner)
+            if drill != "mixed":
+                backlog = [item for item in backlog if item.drill == drill]
+
+        session = Session(drill, n, learner, seed, backlog)
+        session_id = secrets.token_urlsafe(12)
+        self.sessions[session_id] = session
+        return {"session": session_id, "prompt": session.prompt()}
+
+    def _session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "no such session")
+        session.touched = time.monotonic()
+        return session
+
+    async def get_session(self, session_id):
+        session = self._session(session_id)
+        return {"session": session_id, "prompt": session.prompt()}
+
+    async def answer(self, session_id, body):
+        session = self._session(session_id)
+        if session.item is None:
+            raise HTTPError(HTTPStatus.CONFLICT, "session is finished")
+        text = body.get("answer")
+        if not isinstance(text, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, '"answer" has to be a string')
+
+        (result, item, feedback) = session.answer(text)
+        if session.learner is not None and self.progress:
+            # The write itself happens in the background, but the
+            # store might need to read the card's old state first
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._grade, session.learner, item, result)
+
+        feedback["next"] = session.prompt()
+        return feedback
+
+    async def delete_session(self, session_id):
+        self._session(session_id)
+        del self.sessions[session_id]
+        return {}
+
+    async def stats(self):
+        return {
+            "sessions": len(self.sessions),
+            "caches": genki_practice.cache_stats(),
+            "instrument": instrument.stats(),
+        }
+
+    async def route(self, method, path, body):
+        parts = [part for part in path.split("?")[0].split("/") if part]
+
+        if parts == ["sessions"] and method == "POST":
+            return await self.create_session(body)
+        if parts == ["drills"] and method == "GET":
+            return {"drills": ["mixed", *genki_practice.drill_generators]}
+        if parts == ["stats"] and method == "GET":
+            return await self.stats()
+        if len(parts) == 2 and parts[0] == "sessions":
+            if method == "GET":
+                return await self.get_session(parts[1])
+            if method == "DELETE":
+                return await self.delete_session(parts[1])
+        if len(parts) == 3 and parts[0] == "sessions" and parts[2] == "answer":
+            if method == "POST":
+                return await self.answer(parts[1], body)
+
+        raise HTTPError(HTTPStatus.NOT_FOUND)
+
+    # -------------------------------------------------------------- #
+    # HTTP
+
+    async def handle(self, reader, writer):
+        """
+        One connection, possibly several requests long (keep-alive).
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    (method, path, version) = request_line.decode("latin-1").split()
+                except ValueError:
+                    error = {"error": "bad request"}
+                    await self.respond(writer, HTTPStatus.BAD_REQUEST, error, False)
+                    break
+
+                headers = dict()
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    (name, _, value) = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if version == "HTTP/1.0":
+                    keep_alive = headers.get("connection", "").lower() == "keep-alive"
+
+                try:
+                    try:
+                        length = int(headers.get("content-length", 0))
+                    except ValueError:
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "bad Content-Length")
+                    if length > max_body:
+                        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                    raw = await reader.readexactly(length) if length else b""
+                    try:
+                        body = json.loads(raw) if raw else {}
+                    except ValueError:
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "body isn't JSON")
+                    if not isinstance(body, dict):
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "body isn't an object")
+
+                    response = await self.route(method, path, body)
+                    status = HTTPStatus.OK
+                except HTTPError as e:
+                    (status, response) = (e.status, {"error": str(e)})
+                except Exception:
+                    # A bug, not a bad request, but the client still
+                    # gets an answer and the connection stays usable
+                    traceback.print_exc()
+                    status = HTTPStatus.INTERNAL_SERVER_ERROR
+                    response = {"error": status.phrase}
+
+                await self.respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def reap_sessions(self):
+        """
+        Every so often, drop the sessions that have been idle too long.
+        """
+        while True:
+            await asyncio.sleep(60)
+            cutoff = time.monotonic() - session_timeout
+            stale = [
+                session_id
+                for (session_id, session) in self.sessions.items()
+                if session.touched < cutoff
+            ]
+            for session_id in stale:
+                del self.sessions[session_id]
+
+
+async def serve(host="127.0.0.1", port=8765, progress=True):
+    server = QuizServer(progress=progress)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, server.warm_up)
+
+    http = await asyncio.start_server(server.handle, host, port)
+    reaper = asyncio.create_task(server.reap_sessions())
+    print(f"Serving on http://{host}:{port}")
+    try:
+        async with http:
+            await http.serve_forever()
+    finally:
+        reaper.cancel()
+        await loop.run_in_executor(None, server.close)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve practice sessions over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--no-progress", action="store_true", help="don't save anybody's progress"
+    )
+    parser.add_argument(
+        "--stats", action="store_true", help="time and count the hot paths"
+    )
+    args = parser.parse_args()
+    if args.stats:
+        instrument.enable()
+    try:
+        asyncio.run(serve(args.host, args.port, progress=not args.no_progress))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
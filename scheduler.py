@@ -0,0 +1,239 @@
+# Spaced-repetition review scheduling.
+#
+# Every item we're reviewing has an SM-2 style ease factor and interval
+# (see https://super-memory.com/english/ol/sm2.htm), and sits in a heap
+# keyed on when it's next due. Grading an item works out its new
+# interval and pushes it back on the heap, so rescheduling is O(log n)
+# no matter how big the backlog gets.
+#
+# Rescheduling doesn't go looking for the item's old heap entry.
+# Instead each card remembers which entry is its current one, and
+# entries that don't match get thrown away when they come off the top.
+#
+# What "now" means is up to whoever is driving it. It's wall-clock time
+# by default (with an interval of 1 meaning one day), but the practice
+# loops in genki_practice count prompts instead, so that something you
+# missed comes back a few questions later.
+#
+# The examples in the docstrings run: python -m doctest scheduler.py
+import heapq
+import itertools
+import time
+
+# Default ease for a card we haven't seen before, and the floor SM-2
+# puts on it
+initial_ease = 2.5
+min_ease = 1.3
+
+# Grades are SM-2's 0-5. Anything under 3 counts as forgotten.
+pass_grade = 3
+
+
+class Card:
+    """
+    Scheduling state for one item.
+
+    key:      whatever identifies the item, e.g. (drill, prompt)
+    item:     the thing to hand back when it's due (a DrillItem, say)
+    ease:     SM-2 ease factor
+    interval: how long until the next review, in units
+    reps:     how many times in a row it's been remembered
+    due:      when it's next due
+    """
+
+    __slots__ = ("key", "item", "ease", "interval", "reps", "due", "_entry")
+
+    def __init__(self, key, item, ease=initial_ease, interval=0, reps=0, due=0):
+        self.key = key
+        self.item = item
+        self.ease = ease
+        self.interval = interval
+        self.reps = reps
+        self.due = due
+        self._entry = None
+
+    def __repr__(self):
+        return (
+            f"Card({self.key!r}, ease={self.ease:.2f}, interval={self.interval}, "
+            f"reps={self.reps}, due={self.due})"
+        )
+
+
+def sm2(card, grade, relearn_delay):
+    """
+    New (ease, interval, reps) for `card` after being graded `grade`
+    (0-5). Forgotten cards start over, and come back after
+    `relearn_delay` instead of a full interval.
+
+    Example:
+        >>> card = Card("たべる", None)
+        >>> for grade in (4, 4, 4, 5, 1, 0):
+        ...     (card.ease, card.interval, card.reps) = sm2(card, grade, 0.5)
+        ...     print(card.ease, card.interval, card.reps)
+        2.5 1 1
+        2.5 6 2
+        2.5 15 3
+        2.6 39 4
+        2.06 0.5 0
+        1.3 0.5 0
+    """
+    ease = card.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02)
+    ease = max(min_ease, ease)
+
+    if grade < pass_grade:
+        return (ease, relearn_delay, 0)
+
+    reps = card.reps + 1
+    if reps == 1:
+        interval = 1
+    elif reps == 2:
+        interval = 6
+    else:
+        interval = round(card.interval * ease)
+    return (ease, interval, reps)
+
+
+class ReviewScheduler:
+    """
+    Heap of cards ordered by due time.
+
+    Example:
+        >>> scheduler = ReviewScheduler(clock=lambda: 0, unit=1)
+        >>> card = scheduler.grade("たべる", "食べる", 1)  # forgot it
+        >>> scheduler.pop_due(now=10).key
+        'たべる'
+
+    Intervals are in units of `unit`, counted from when it was graded:
+
+        >>> scheduler = ReviewScheduler(unit=10, relearn_delay=0.5)
+        >>> scheduler.grade("のむ", "飲む", 4, now=100).due
+        110
+        >>> scheduler.grade("のむ", "飲む", 4, now=110).due
+        170
+        >>> scheduler.grade("のむ", "飲む", 1, now=170).due
+        175.0
+        >>> scheduler.peek_due(now=174) is None
+        True
+        >>> scheduler.pop_due(now=175).key
+        'のむ'
+    """
+
+    def __init__(self, clock=time.time, unit=86400, relearn_delay=1 / 144):
+        # `unit` is how long an interval of 1 is in clock time, and
+        # `relearn_delay` how many units to wait before trying a
+        # forgotten card again (by default 10 minutes, in days)
+        self.clock = clock
+        self.unit = unit
+        self.relearn_delay = relearn_delay
+        self.cards = dict()
+        self._heap = []
+        # Tie breaker, so cards due at the same time come out in the
+        # order they were scheduled and never get compared themselves
+        self._order = itertools.count()
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __contains__(self, key):
+        return key in self.cards
+
+    def __iter__(self):
+        return iter(self.cards.values())
+
+    def _push(self, card):
+        entry = (card.due, next(self._order), card.key)
+        card._entry = entry
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self.cards) + 64:
+            self.compact()
+
+    def _is_current(self, entry):
+        card = self.cards.get(entry[2])
+        return card is not None and card._entry is entry
+
+    def _prune(self):
+        # Drop stale entries off the top until the next one is real
+        heap = self._heap
+        while heap and not self._is_current(heap[0]):
+            heapq.heappop(heap)
+
+    def add(self, card):
+        """
+        Schedule a card as-is, e.g. one loaded back from storage.
+        """
+        self.cards[card.key] = card
+        self._push(card)
+        return card
+
+    def grade(self, key, item, grade, now=None):
+        """
+        Record a review of `key` graded `grade` (0-5) and reschedule it.
+        Cards we haven't seen yet get created. Returns the card.
+        """
+        if now is None:
+            now = self.clock()
+
+        card = self.cards.get(key)
+        if card is None:
+            card = self.cards[key] = Card(key, item)
+        card.item = item
+
+        (card.ease, card.interval, card.reps) = sm2(card, grade, self.relearn_delay)
+        card.due = now + card.interval * self.unit
+        self._push(card)
+        return card
+
+    def forget(self, key):
+        """
+        Stop scheduling `key`. Its heap entry just goes stale.
+        """
+        return self.cards.pop(key, None)
+
+    def next_due(self):
+        """
+        When the earliest card is due, or None if there aren't any.
+        """
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def peek_due(self, now=None):
+        """
+        The card that's been due the longest, or None if nothing is due
+        yet. Leaves it scheduled.
+        """
+        if now is None:
+            now = self.clock()
+        self._prune()
+        if self._heap and self._heap[0][0] <= now:
+            return self.cards[self._heap[0][2]]
+        return None
+
+    def pop_due(self, now=None):
+        """
+        Same as peek_due, but takes the card off the heap. It stays
+        known (with its ease and so on) until it's graded again, which
+        puts it back.
+        """
+        card = self.peek_due(now)
+        if card is not None:
+            heapq.heappop(self._heap)
+            card._entry = None
+        return card
+
+    def due_count(self, now=None):
+        """
+        How many cards are due. O(n), for display.
+        """
+        if now is None:
+            now = self.clock()
+        return sum(
+            1 for entry in self._heap if entry[0] <= now and self._is_current(entry)
+        )
+
+    def compact(self):
+        """
+        Rebuild the heap without the stale entries, if lots of
+        rescheduling has left it much bigger than the number of cards.
+        """
+        self._heap = [entry for entry in self._heap if self._is_current(entry)]
+        heapq.heapify(self._heap)
@@ -0,0 +1,635 @@
+# Loading the Genki vocab workbook.
+#
+# Reading Genki_2.xlsx through openpyxl is by far the slowest part of
+# starting up, so we keep a binary snapshot of the cleaned-up tables
+# next to the workbook. The snapshot is keyed on a hash of the
+# workbook's contents and on the conjugator's version (the conjugation
+# table comes from it), so if either changes it just gets rebuilt on
+# the next load.
+import hashlib
+import importlib.metadata
+import os
+import pickle
+import re
+import sys
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from japaneseverbconjugator.src.constants.EnumeratedTypes import VerbClass
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+default_workbook = os.path.join(here, "Genki_2.xlsx")
+default_cache_dir = os.path.join(here, ".vocab_cache")
+
+# Bump this whenever the contents of the snapshot change shape, so
+# that old snapshots get thrown out instead of unpickled.
+SNAPSHOT_VERSION = 6
+
+# Row 9 in the column name row
+header_row = 9
+
+# The columns have names written in japanese. I'm not going to mutate
+# the csv in any way so we'll just rename the columns of the dataframe
+# as we instantiate it.
+#
+# "pos" is for "part of speech"
+columns = {"単語": "word", "漢字表記": "kanji", "品詞": "pos", "英訳": "english", "課数": "lesson"}
+
+# Replace the "parts of speech" entries with easier labels.
+#
+# Yes, they're longer (for the most part), but it's just easier to
+# read in-place so whatever.
+parts_of_speech = {
+    "n.": "noun",  # noun
+    "い-adj.": "i-adj",  # i adjective
+    "な-adj.": "na-adj",  # na adjective
+    "u-v.": "u-verb",  # u verb
+    "ru-v.": "ru-verb",  # ru verb
+    "irr-v.": "irr-verb",  # irregular verb
+    "adv.": "adv",  # adverb --- abbreviate so can filter by "verb" in
+    "part.": "particle",  # particle
+    "pre.": "pre-nom",  # pre-nominal expression, e.g. 「その___」
+    "suf.": "nf-suffix",  # (noun-forming) suffix, e.g. 「___円」or「___か月」
+    "exp.": "expression",  # expression
+}
+
+# Which VerbClass goes with which (cleaned-up) part of speech
+verb_classes = {
+    "ru-verb": VerbClass.ICHIDAN,
+    "u-verb": VerbClass.GODAN,
+    "irr-verb": VerbClass.IRREGULAR,
+}
+
+
+def filter_by(df, col, val):
+    """
+    df: the genki csv dataframe
+    col: the column we want to filter in
+    val: the value we want to filter for
+
+    Example:
+        filter_by(df, "lesson", "L15")
+
+    We have to do this because pandas built-in filtering scheme
+    doesn't allow us to filter by things like `val in df[col]`, so we
+    can't do things like `"L11" in df[col]` because the columns are
+    formatted like "会L11-II" or something.
+
+    Same results as checking `val in entry` row by row, but done with
+    pandas string ops. For categorical columns (pos, lesson) we only
+    have to test each distinct category once and then `isin` on the
+    codes.
+    """
+    return df[filter_mask(df[col], val)]
+
+
+def filter_mask(column, val):
+    """
+    Boolean mask of the entries in `column` that contain `val` (or, if
+    `val` is a list, _any_ of the values in it).
+    """
+    # If we passed in a list of values to filter by, we check for
+    # where _any_ of them are valid
+    if isinstance(val, (list, tuple, set, frozenset)):
+        vals = list(val)
+    else:
+        vals = [val]
+
+    if not vals:
+        return np.zeros(len(column), dtype=bool)
+
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Test each category once, then look every row's code up in
+        # that. The extra False on the end is for the -1 code that
+        # missing values get.
+        hits = [
+            isinstance(category, str) and any(v in category for v in vals)
+            for category in column.cat.categories
+        ]
+        hits = np.array(hits + [False], dtype=bool)
+        return hits[column.array.codes]
+
+    return _contains_any(column, vals).to_numpy()
+
+
+def _contains_any(column, vals):
+    if len(vals) == 1:
+        return column.str.contains(vals[0], regex=False, na=False)
+    # One compiled alternation instead of a pass per value
+    pattern = "|".join(re.escape(v) for v in vals)
+    return column.str.contains(pattern, regex=True, na=False)
+
+
+def read_workbook(path=default_workbook):
+    """
+    Parse the workbook the slow way and clean it up: rename the
+    columns, swap in the easier part of speech labels and make the
+    low-cardinality columns categorical.
+    """
+    df = pd.read_excel(path, header=header_row)
+    df = df.rename(columns=columns)
+    # A few cells have stray whitespace ("n. "), which would otherwise
+    # slip past the relabeling
+    df["pos"] = df["pos"].str.strip().replace(parts_of_speech)
+
+    # Only a few dozen distinct values in these, so storing them as
+    # categoricals lets filter_by test each value once instead of
+    # once per row.
+    df["pos"] = df["pos"].astype("category")
+    df["lesson"] = df["lesson"].astype("category")
+    return df
+
+
+# ------------------------------------------------------------------ #
+# Lesson tags
+#
+# The lesson column has strings like "会L11-II", "会L9, 会L9(e)" or
+# "読L8-II, 会L11". Each comma separated piece is one tag:
+#
+#   book:    会 (conversation & grammar) or 読 (reading & writing)
+#   lesson:  the lesson number. The greetings section ("会G") comes
+#            before lesson 1, so it gets lesson 0.
+#   section: "I", "II", "III" for the 読 sections, "e" for the 会
+#            useful expressions lists (the "(e)" ones), "" otherwise
+LessonTag = namedtuple("LessonTag", ["book", "lesson", "section"])
+
+lesson_tag_re = re.compile(r"(会|読)(?:L(\d+)(?:-([IV]+))?(\(e\))?|(G))")
+
+
+def parse_lesson_tags(lesson_str):
+    """
+    Example:
+        >>> parse_lesson_tags("読L8-II, 会L11(e)")
+        (LessonTag(book='読', lesson=8, section='II'), LessonTag(book='会', lesson=11, section='e'))
+    """
+    tags = []
+    for match in lesson_tag_re.finditer(lesson_str):
+        (book, lesson, section, expression, greetings) = match.groups()
+        if greetings:
+            tags += [LessonTag(book, 0, "")]
+        else:
+            tags += [LessonTag(book, int(lesson), section or ("e" if expression else ""))]
+    return tuple(tags)
+
+
+class LessonIndex:
+    """
+    Inverted index from lesson tags to the rows that have them.
+
+    Every distinct tag maps to a bitset (a python int, bit i set means
+    row i has the tag), so picking out e.g. "lessons 1-12, conversation
+    only" is OR-ing together the handful of bitsets whose tags match
+    instead of looking at every row.
+
+    Example:
+        >>> df = load_snapshot()["all"]
+        >>> lessons = LessonIndex(df["lesson"])
+        >>> picked = lessons.select(df, lessons=range(1, 13), books="会")
+        >>> list(picked["lesson"][:3])
+        ['会L3', '会L4', '会L4']
+    """
+
+    def __init__(self, lesson_column):
+        # Parse each distinct string once; lots of rows share them
+        parsed = dict()
+        self.tags = []
+        self.bits = dict()
+        for (row, lesson_str) in enumerate(lesson_column):
+            if lesson_str not in parsed:
+                parsed[lesson_str] = parse_lesson_tags(lesson_str)
+            self.tags += [parsed[lesson_str]]
+            for tag in parsed[lesson_str]:
+                self.bits[tag] = self.bits.get(tag, 0) | (1 << row)
+        self.n_rows = len(self.tags)
+
+    def rows(self, lessons=None, books=None, sections=None):
+        """
+        Bitset of the rows with at least one tag matching all of the
+        given constraints. Each argument can be a single value or a
+        collection of them; None means anything goes.
+        """
+        lessons = _as_set(lessons)
+        books = _as_set(books)
+        sections = _as_set(sections)
+
+        bits = 0
+        for (tag, tag_bits) in self.bits.items():
+            if lessons is not None and tag.lesson not in lessons:
+                continue
+            if books is not None and tag.book not in books:
+                continue
+            if sections is not None and tag.section not in sections:
+                continue
+            bits |= tag_bits
+        return bits
+
+    def mask(self, lessons=None, books=None, sections=None):
+        """
+        Same as rows() but as a boolean array to index a dataframe with.
+        """
+        bits = self.rows(lessons, books, sections)
+        n_bytes = (self.n_rows + 7) // 8
+        packed = np.frombuffer(bits.to_bytes(n_bytes, "little"), dtype=np.uint8)
+        return np.unpackbits(packed, bitorder="little")[: self.n_rows].astype(bool)
+
+    def select(self, df, lessons=None, books=None, sections=None):
+        """
+        The rows of `df` (which has to be the table this index was built
+        from) matching the given lessons, books and sections.
+        """
+        return df[self.mask(lessons, books, sections)]
+
+
+def _as_set(vals):
+    if vals is None:
+        return None
+    if isinstance(vals, (str, int)):
+        return {vals}
+    return set(vals)
+
+
+# The lessons genki_practice drills on. This is every tag for lessons
+# 1-12, so compared to the old substring filter it also picks up the
+# 会L1(e)/会L2(e) expression-only words (times, ages, ドア, ...), and
+# rows tagged with two lessons only show up once instead of twice.
+# Nothing from L13+ is drilled, same as before.
+our_lessons = range(1, 13)
+
+
+def practice_lessons(df, lesson_index=None):
+    """
+    Cut the full vocab table down to what genki_practice drills on:
+    anything tagged with one of lessons 1-12 in either book.
+    """
+    if lesson_index is None:
+        lesson_index = LessonIndex(df["lesson"])
+    return lesson_index.select(df, lessons=our_lessons)
+
+
+def workbook_hash(path=default_workbook):
+    """
+    sha256 of the raw workbook bytes. This is what the snapshot is
+    keyed on.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def build_snapshot(path=default_workbook):
+    """
+    Everything that goes into a snapshot. This is the slow path.
+    """
+    df = read_workbook(path)
+    lesson_index = LessonIndex(df["lesson"])
+    practice_df = practice_lessons(df, lesson_index)
+    store = VocabStore(df)
+
+    from conjugations import build_conjugation_table
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "all": df,
+        "lessons": lesson_index,
+        "practice": practice_df,
+        "store": store,
+        "practice_ids": tuple(int(i) for i in practice_df.index),
+        "conjugations": build_conjugation_table(store),
+    }
+
+
+def conjugator_version():
+    """
+    The installed japaneseverbconjugator's version. The conjugation
+    table in the snapshot comes from it, so it's part of the key too.
+    """
+    try:
+        return importlib.metadata.version("japaneseverbconjugator")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def snapshot_path(digest, cache_dir=default_cache_dir):
+    name = f"genki-{SNAPSHOT_VERSION}-{digest[:16]}-{conjugator_version()}.pkl"
+    return os.path.join(cache_dir, name)
+
+
+# Snapshots already loaded in this process, by the workbook's path,
+# size and modification time (and cache_dir). Every load_* call hands
+# back the same objects, so there's only ever one copy of the tables in
+# memory, and a warm call doesn't even read the workbook to hash it.
+_loaded_snapshots = dict()
+
+
+def load_snapshot(path=default_workbook, cache_dir=default_cache_dir, rebuild=False):
+    """
+    Load the snapshot for the workbook at `path`, building (and
+    saving) it first if there isn't an up-to-date one on disk. Only
+    done once per process (unless the workbook changes, or `rebuild`);
+    after that it's the same snapshot again.
+
+    Example:
+        >>> snap = load_snapshot()
+        >>> len(snap["practice"])  # cleaned, lessons 1-12
+        953
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, cache_dir)
+    if not rebuild and memo_key in _loaded_snapshots:
+        return _loaded_snapshots[memo_key]
+
+    digest = workbook_hash(path)
+    cache_file = snapshot_path(digest, cache_dir)
+
+    if not rebuild:
+        try:
+            with open(cache_file, "rb") as f:
+                snap = pickle.load(f)
+            if snap.get("version") == SNAPSHOT_VERSION:
+                _loaded_snapshots[memo_key] = snap
+                return snap
+        except (
+            OSError,
+            EOFError,
+            ValueError,
+            TypeError,
+            AttributeError,
+            ImportError,
+            pickle.UnpicklingError,
+        ):
+            # Missing or busted snapshot, or one pickled by a pandas or
+            # numpy that isn't the one installed now. Just make a new
+            # one.
+            pass
+
+    snap = _loaded_snapshots[memo_key] = build_snapshot(path)
+
+    # Write to a temp file and swap it in so two processes starting at
+    # the same time can't read each other's half-written snapshots.
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as f:
+            pickle.dump(snap, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        # Read-only checkout or whatever; we still have the data.
+        pass
+
+    # Clear out snapshots for older versions of the workbook
+    for name in os.listdir(cache_dir) if os.path.isdir(cache_dir) else []:
+        stale = name.startswith("genki-") and name.endswith(".pkl")
+        if stale and name != os.path.basename(cache_file):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+    return snap
+
+
+def load_vocab(path=default_workbook, cache_dir=default_cache_dir):
+    """
+    The full cleaned-up vocab table (every lesson).
+    """
+    return load_snapshot(path, cache_dir)["all"]
+
+
+def load_lesson_index(path=default_workbook, cache_dir=default_cache_dir):
+    """
+    The LessonIndex for the full table from load_vocab().
+    """
+    return load_snapshot(path, cache_dir)["lessons"]
+
+
+def load_store(path=default_workbook, cache_dir=default_cache_dir):
+    """
+    VocabStore for every lesson.
+    """
+    return load_snapshot(path, cache_dir)["store"]
+
+
+def load_practice_store(path=default_workbook, cache_dir=default_cache_dir):
+    """
+    VocabStore for the lessons genki_practice uses. Same records (and
+    ids) as in load_store(), just fewer of them.
+    """
+    snap = load_snapshot(path, cache_dir)
+    return snap["store"].subset(snap["practice_ids"])
+
+
+def load_conjugations(path=default_workbook, cache_dir=default_cache_dir):
+    """
+    Every verb in the workbook conjugated ahead of time; see
+    conjugations.py for the layout.
+    """
+    return load_snapshot(path, cache_dir)["conjugations"]
+
+
+def load_practice_vocab(path=default_workbook, cache_dir=default_cache_dir):
+    """
+    The vocab table restricted to the lessons genki_practice uses.
+    """
+    return load_snapshot(path, cache_dir)["practice"]
+
+
+# ------------------------------------------------------------------ #
+# The canonical vocab store
+#
+# One record per distinct entry in the workbook. The id is the entry's
+# data row in Genki_2.xlsx (i.e. the dataframe index straight out of
+# read_excel), so it stays put across snapshot rebuilds and is the
+# same whether you're looking at the full table or the practice
+# subset. Strings are interned, so e.g. all the "u-verb"s and "会L3"s
+# are one object each.
+VocabEntry = namedtuple("VocabEntry", ["id", "word", "kanji", "pos", "english", "lesson"])
+
+
+def _intern(val):
+    # Empty kanji cells come through as NaN; store those as None
+    return sys.intern(val) if isinstance(val, str) else None
+
+
+class VocabStore:
+    """
+    Deduplicated, id-addressed vocab records.
+
+    Example:
+        >>> store = load_store()
+        >>> entry = store[7]
+        >>> entry.word, entry.english
+        ('あう', 'to meet; to see (a person)')
+    """
+
+    def __init__(self, df):
+        self.entries = dict()
+        seen = set()
+        cols = zip(df.index, df["word"], df["kanji"], df["pos"], df["english"], df["lesson"])
+        for (row_id, *fields) in cols:
+            fields = tuple(_intern(field) for field in fields)
+            # Same row twice (or two identical rows), keep the first one
+            if row_id in self.entries or fields in seen:
+                continue
+            seen.add(fields)
+            self.entries[int(row_id)] = VocabEntry(int(row_id), *fields)
+
+        # Workbook order
+        self.ids = tuple(sorted(self.entries))
+
+    def __getitem__(self, entry_id):
+        return self.entries[entry_id]
+
+    def __contains__(self, entry_id):
+        return entry_id in self.entries
+
+    def __iter__(self):
+        return (self.entries[entry_id] for entry_id in self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def subset(self, ids):
+        """
+        A store with just the given ids, sharing the same records.
+        """
+        new = VocabStore.__new__(VocabStore)
+        new.entries = {i: self.entries[i] for i in ids if i in self.entries}
+        new.ids = tuple(sorted(new.entries))
+        return new
+
+    def to_frame(self):
+        """
+        Back to a dataframe, e.g. for exporting.
+        """
+        return pd.DataFrame(list(self), columns=VocabEntry._fields).set_index("id")
+
+
+class VocabIndex:
+    """
+    Hash lookups into the vocab, so that going from english to
+    japanese (or japanese to a VerbClass) is one dict probe instead of
+    a scan over the whole dataframe.
+
+    When the same key shows up in more than one entry, the first one
+    in workbook order wins, same as indexing into the filtered
+    dataframe with `.values[0]` did.
+
+    Example:
+        >>> index = VocabIndex(load_practice_store())
+        >>> index.japanese("to eat")
+        'たべる'
+        >>> index.j_verb_class("食べる")
+        <VerbClass.ICHIDAN: 2>
+    """
+
+    def __init__(self, store):
+        # Still takes a plain vocab dataframe too
+        if not isinstance(store, VocabStore):
+            store = VocabStore(store)
+        self.store = store
+
+        # Precompute the verb class for every verb entry
+        self.verb_classes = {
+            entry.id: verb_classes[entry.pos]
+            for entry in store
+            if entry.pos in verb_classes
+        }
+
+        self.by_english = self._first_ids("english")
+        self.by_word = self._first_ids("word")
+        self.by_kanji = self._first_ids("kanji")
+
+        # Kana shared by more than one word, e.g. かう (買う, 飼う)
+        seen = dict()
+        for entry in store:
+            seen.setdefault(entry.word, set()).add(entry.kanji)
+        self.homophones = frozenset(word for (word, kanji) in seen.items() if len(kanji) > 1)
+
+    def _first_ids(self, field):
+        ids = dict()
+        for entry in self.store:
+            key = getattr(entry, field)
+            if key is not None and key not in ids:
+                ids[key] = entry.id
+        return ids
+
+    def __len__(self):
+        return len(self.store)
+
+    def _verb_class(self, entry_id):
+        vclass = self.verb_classes.get(entry_id)
+        assert vclass is not None  # Haha what
+        return vclass
+
+    def id_of(self, english):
+        """
+        Stable id of the `english` entry, to refer to it elsewhere.
+        """
+        return self.by_english[english]
+
+    def entry(self, english):
+        return self.store[self.by_english[english]]
+
+    def japanese(self, english):
+        """
+        return the japanese word corresponding to the `english` entry.
+        Must be the exact wording given in the textbook.
+        """
+        return self.store[self.by_english[english]].word
+
+    def english(self, japanese):
+        """
+        return the english entry corresponding to the `japanese` (kana)
+        word.
+        """
+        return self.store[self.by_word[japanese]].english
+
+    def kanji_of(self, english):
+        """
+        kanji spelling for the `english` entry, or None if the workbook
+        doesn't give one.
+        """
+        return self.store[self.by_english[english]].kanji
+
+    def verb_class(self, en_verb):
+        return self._verb_class(self.by_english[en_verb])
+
+    def j_verb_class(self, j_verb):
+        """
+        same as above but the input is japanese, either kana or kanji
+        """
+        if j_verb in self.by_word:
+            return self._verb_class(self.by_word[j_verb])
+        return self._verb_class(self.by_kanji[j_verb])
+
+    def spellings(self, english):
+        """
+        Every way the `english` entry gets written: the kana first,
+        then each kanji spelling the workbook gives.
+        """
+        from conjugations import verb_spellings
+
+        return tuple(verb_spellings(self.entry(english)))
+
+    def j_spellings(self, j_word):
+        """
+        Every way the entry for `j_word` (kana or kanji) gets written,
+        with `j_word` itself first. Words we don't know, and kana that
+        could be more than one word, are just themselves.
+        """
+        from conjugations import verb_spellings
+
+        if j_word in self.by_kanji:
+            entry = self.store[self.by_kanji[j_word]]
+        elif j_word in self.by_word and j_word not in self.homophones:
+            entry = self.store[self.by_word[j_word]]
+        else:
+            return (j_word,)
+        others = [spelling for spelling in verb_spellings(entry) if spelling != j_word]
+        return (j_word, *others)